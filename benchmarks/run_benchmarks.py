@@ -0,0 +1,327 @@
+"""
+run_benchmarks.py
+計算と描画の処理時間を計測し，基準の結果と比較するスクリプト.
+
+    python benchmarks/run_benchmarks.py --output result/benchmark.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 1.25
+
+基準より median の時間が threshold 倍を超えて遅くなった項目があると，終了コード1で終了する．
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import matplotlib as mpl
+
+mpl.use("agg")
+
+# pylint: disable=wrong-import-position
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backend_bases import MouseEvent  # noqa: E402
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from hexareach.calc.adaptive_leg_power import AdaptiveLegPowerSampler  # noqa: E402
+from hexareach.calc.calculator_registry import get_calculator_registry  # noqa: E402
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator  # noqa: E402
+from hexareach.calc.leg_power_calculator import LegPowerCalculator  # noqa: E402
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param  # noqa: E402
+from hexareach.render.approximated_graph_renderer import ApproximatedGraphRenderer  # noqa: E402
+from hexareach.render.blit_manager import BlitManager  # noqa: E402
+from hexareach.render.hexapod_leg_renderer import HexapodLegRenderer  # noqa: E402
+from hexareach.render.hexapod_range_of_motion_renderer import (  # noqa: E402
+    HexapodRangeOfMotionRenderer,
+)
+
+
+class Benchmark(NamedTuple):
+    """
+    計測する処理．setup の戻り値を run に渡し，run は処理した要素数を返す．
+    """
+
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], int]
+
+
+PARAM = PhantomxMk2Param()
+RECT = (-100.0, 300.0, -200.0, 200.0)
+
+
+def _make_targets(num: int) -> Any:
+    rng = np.random.default_rng(0)
+    return rng.uniform(RECT[0], RECT[1], num), rng.uniform(RECT[2], RECT[3], num)
+
+
+def _run_construction(_: Any) -> int:
+    HexapodLegRangeCalculator(PARAM)
+    return 1
+
+
+def _run_scalar_ik(data: Any) -> int:
+    calc, (x, z) = data
+    for xi, zi in zip(x.tolist(), z.tolist()):
+        calc.calc_inverse_kinematics_xz(xi, zi, False)
+    return len(x)
+
+
+def _run_batch_ik(data: Any) -> int:
+    calc, (x, z) = data
+    calc.calc_inverse_kinematics_xz_batch(x, z, False)
+    return len(x)
+
+
+def _setup_leg_power(step: float) -> Callable[[], Any]:
+    def setup() -> Any:
+        x_range = np.arange(RECT[0], RECT[1], step)
+        z_range = np.arange(RECT[2], RECT[3], step)
+        return LegPowerCalculator(HexapodLegRangeCalculator(PARAM), PARAM), x_range, z_range
+
+    return setup
+
+
+def _run_leg_power(data: Any) -> int:
+    calc, x_range, z_range = data
+    calc.calculate(x_range, z_range)
+    return len(x_range) * len(z_range)
+
+
+def _setup_adaptive_leg_power(min_step: float) -> Callable[[], Any]:
+    def setup() -> Any:
+        sampler = AdaptiveLegPowerSampler(
+            PARAM,
+            hexapod_leg_range_calc=HexapodLegRangeCalculator(PARAM),
+            base_step=16.0 * min_step,
+            min_step=min_step,
+        )
+        x_range = np.arange(RECT[0], RECT[1], min_step)
+        z_range = np.arange(RECT[2], RECT[3], min_step)
+        return sampler, x_range, z_range
+
+    return setup
+
+
+def _run_adaptive_leg_power(data: Any) -> int:
+    sampler, x_range, z_range = data
+    sampler.sample(RECT).resample(x_range, z_range)
+    return len(x_range) * len(z_range)
+
+
+def _setup_axes() -> Any:
+    # 描画のたびに計算し直すよう，共有の計算結果を消しておく．
+    get_calculator_registry().clear()
+    plt.close("all")
+    fig = plt.figure()
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_xlim(RECT[0], RECT[1])
+    ax.set_ylim(RECT[2], RECT[3])
+    return fig, ax
+
+
+def _run_range_of_motion(data: Any) -> int:
+    fig, ax = data
+    HexapodRangeOfMotionRenderer(PARAM, fig, ax).render()
+    return 1
+
+
+def _run_approximated_graph(data: Any) -> int:
+    _, ax = data
+    ApproximatedGraphRenderer(PARAM, ax, z_min_max=(RECT[2], RECT[3])).render()
+    return 1
+
+
+def _setup_on_update(use_blit: bool) -> Callable[[], Any]:
+    def setup() -> Any:
+        plt.close("all")
+        fig = plt.figure()
+        ax = fig.add_subplot(1, 2, 1)
+        ax_table = fig.add_subplot(1, 2, 2)
+        ax.set_xlim(RECT[0], RECT[1])
+        ax.set_ylim(RECT[2], RECT[3])
+
+        blit_manager = BlitManager(fig) if use_blit else None
+        renderer = HexapodLegRenderer(PARAM, fig, ax, ax_table, blit_manager=blit_manager)
+        renderer.render()
+        if blit_manager is not None:
+            blit_manager.render()
+        fig.canvas.draw()
+
+        x, z = _make_targets(20)
+        positions = ax.transData.transform(np.stack([x, z], axis=1))
+        events = [
+            MouseEvent("motion_notify_event", fig.canvas, float(px), float(pz))
+            for px, pz in positions
+        ]
+
+        # コールバックは弱参照で登録されるため，計測中は参照を持っておく．
+        return fig, renderer, blit_manager, events
+
+    return setup
+
+
+def _run_on_update(data: Any) -> int:
+    _, _, _, events = data
+    for event in events:
+        event._process()  # pylint: disable=protected-access
+    return len(events)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("calculator_construction", lambda: None, _run_construction),
+    Benchmark(
+        "ik_scalar",
+        lambda: (HexapodLegRangeCalculator(PARAM), _make_targets(2000)),
+        _run_scalar_ik,
+    ),
+    Benchmark(
+        "ik_batch",
+        lambda: (HexapodLegRangeCalculator(PARAM), _make_targets(200000)),
+        _run_batch_ik,
+    ),
+    Benchmark("leg_power_step1", _setup_leg_power(1.0), _run_leg_power),
+    Benchmark("leg_power_step2", _setup_leg_power(2.0), _run_leg_power),
+    Benchmark("leg_power_step5", _setup_leg_power(5.0), _run_leg_power),
+    Benchmark(
+        "leg_power_adaptive_step0.25",
+        _setup_adaptive_leg_power(0.25),
+        _run_adaptive_leg_power,
+    ),
+    Benchmark("render_range_of_motion", _setup_axes, _run_range_of_motion),
+    Benchmark("render_approximated_graph", _setup_axes, _run_approximated_graph),
+    Benchmark("on_update_full_redraw", _setup_on_update(False), _run_on_update),
+    Benchmark("on_update_blit", _setup_on_update(True), _run_on_update),
+]
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Dict[str, float]:
+    """
+    1つの処理を repeat 回計測する．最初に1度実行してから計測し，最後にメモリの最大使用量を計測する．
+    """
+
+    times: List[float] = []
+    items = 0
+
+    benchmark.run(benchmark.setup())
+
+    for _ in range(repeat):
+        data = benchmark.setup()
+        gc.collect()
+        start = time.perf_counter()
+        items = benchmark.run(data)
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc は処理を遅くするため，時間とは別に計測する．
+    data = benchmark.setup()
+    gc.collect()
+    tracemalloc.start()
+    benchmark.run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "median": median,
+        "min": min(times),
+        "items": float(items),
+        "throughput": items / median if median > 0.0 else 0.0,
+        "peak_memory": float(peak),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """
+    基準と比べ，median の時間が threshold 倍を超えた項目の名前を返す．
+    """
+
+    regressions: List[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median"] / baseline[name]["median"]
+        mark = ""
+        if ratio > threshold:
+            regressions.append(name)
+            mark = "  <-- regression"
+        print(f"{name:28s} {ratio:6.2f}x baseline{mark}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    計測を行い，結果を保存して基準と比較する．
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--output", help="結果を保存するJSONファイル")
+    parser.add_argument("--baseline", help="比較する基準のJSONファイル")
+    parser.add_argument("--save-baseline", help="結果を基準として保存するJSONファイル")
+    parser.add_argument("--threshold", type=float, default=1.25, help="遅くなったとみなす倍率")
+    parser.add_argument("--repeat", type=int, default=5, help="計測する回数")
+    parser.add_argument("--filter", default="", help="名前にこの文字列を含む項目だけ計測する")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for benchmark in BENCHMARKS:
+        if args.filter not in benchmark.name:
+            continue
+        results[benchmark.name] = measure(benchmark, args.repeat)
+        r = results[benchmark.name]
+        print(
+            f"{benchmark.name:28s} median {r['median'] * 1e3:9.3f} ms  "
+            f"{r['throughput']:12.1f} items/s  peak {r['peak_memory'] / 1e6:8.2f} MB"
+        )
+
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "matplotlib": mpl.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    for file_name in (args.output, args.save_baseline):
+        if file_name is None:
+            continue
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file_name, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"regressions: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
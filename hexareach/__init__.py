@@ -6,22 +6,56 @@ __init__.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from .render.hexapod_leg_power import HexapodLegPower
-from .graph_dispalyer import GraphDisplayer
 from .calc.phatomx_mk2_param import PhantomxMk2Param
 from .calc.hexapod_param_protocol import HexapodParamProtocol
-from .render.display_flag import DisplayFlag
-from .render.color_param import ColorParam
+
+if TYPE_CHECKING:
+    from .render.hexapod_leg_power import HexapodLegPower
+    from .graph_dispalyer import GraphDisplayer
+    from .headless_exporter import ExportJob, HeadlessExporter
+    from .render.display_flag import DisplayFlag
+    from .render.display_stats import DisplayStats
+    from .render.color_param import ColorParam
 
 # パッケージのバージョンはsetup.pyに記載
 # The package version is specified in setup.py
 
+# 描画に関するものは matplotlib を読み込むため，初めて使われたときに読み込む．
+# 計算だけを行う場合は NumPy だけで動作する．
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "GraphDisplayer": ".graph_dispalyer",
+    "ExportJob": ".headless_exporter",
+    "HeadlessExporter": ".headless_exporter",
+    "HexapodLegPower": ".render.hexapod_leg_power",
+    "DisplayFlag": ".render.display_flag",
+    "DisplayStats": ".render.display_stats",
+    "ColorParam": ".render.color_param",
+}
+
 __all__ = [
     "GraphDisplayer",
+    "ExportJob",
+    "HeadlessExporter",
     "HexapodLegPower",
     "HexapodParamProtocol",
     "PhantomxMk2Param",
     "DisplayFlag",
+    "DisplayStats",
     "ColorParam",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -6,10 +6,40 @@ __main__.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+import types
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-def main():
+import numpy as np
+import numpy.typing as npt
+
+from .calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .calc.leg_power_calculator import make_leg_power_ranges
+from .calc.hexapod_param_protocol import (
+    HexapodParamKey,
+    HexapodParamProtocol,
+    make_hexapod_param_key,
+)
+from .calc.phatomx_mk2_param import PhantomxMk2Param
+from .calc.tiled_leg_power_calculator import TiledLegPowerCalculator
+from .calc.xr_r1_param import XrR1Param
+
+# --robot で指定できるロボットのパラメータ．
+ROBOTS: Dict[str, Any] = {
+    "PhantomxMk2Param": PhantomxMk2Param,
+    "XrR1Param": XrR1Param,
+}
+
+OUTPUT_FORMATS = (".npy", ".npz", ".csv")
+
+
+def print_banner() -> None:
     """
-    Main function to display package information.
+    パッケージの情報を表示する．
     """
 
     print("Hexareach")
@@ -18,5 +48,358 @@ def main():
     print("https://opensource.org/licenses/mit-license.php")
 
 
+def load_param(robot: str, param_file: Optional[str]) -> HexapodParamProtocol:
+    """
+    ロボットの名前と，パラメータのファイルからパラメータを作成する．\n
+    パラメータのファイルはJSONで，{"base": ロボットの名前, フィールド名: 値, ...} の形式．
+    base を省略した場合は robot のパラメータを基準にし，書かれたフィールドだけを置き換える．
+
+    Parameters
+    ----------
+    robot : str
+        ロボットの名前．ROBOTS のいずれか．
+    param_file : Optional[str]
+        パラメータのファイル名．Noneの場合は robot のパラメータをそのまま使う．
+
+    Returns
+    -------
+    param : HexapodParamProtocol
+        パラメータを格納するためのインスタンス．
+    """
+
+    values: Dict[str, Any] = {}
+    if param_file is not None:
+        with open(param_file, encoding="utf-8") as f:
+            values = json.load(f)
+        if not isinstance(values, dict):
+            raise ValueError(f"{__name__}: {param_file} must contain a JSON object")
+        robot = values.pop("base", robot)
+
+    if robot not in ROBOTS:
+        raise ValueError(f"{__name__}: unknown robot {robot}, choose from {', '.join(ROBOTS)}")
+
+    base = ROBOTS[robot]()
+    if not values:
+        return base
+
+    fields = dict(make_hexapod_param_key(base))
+    for name, value in values.items():
+        if name not in fields:
+            raise ValueError(f"{__name__}: unknown parameter {name} in {param_file}")
+        fields[name] = _coerce_param_value(name, value, fields[name])
+
+    param: Any = types.SimpleNamespace(**fields)
+    return param
+
+
+def _coerce_param_value(name: str, value: Any, base_value: Any) -> Any:
+    """
+    パラメータのファイルの値を，基準にするパラメータの値と同じ型に変換する．
+    変換できない場合は ValueError を送出する．
+    """
+
+    if isinstance(base_value, tuple):
+        if not isinstance(value, list) or len(value) != len(base_value):
+            raise ValueError(
+                f"{__name__}: parameter {name} must be a list of {len(base_value)} values"
+            )
+        return tuple(_coerce_param_value(name, v, b) for v, b in zip(value, base_value))
+
+    if isinstance(base_value, bool) or isinstance(value, bool):
+        if isinstance(base_value, bool) and isinstance(value, bool):
+            return value
+    elif isinstance(base_value, int):
+        if isinstance(value, int):
+            return value
+    elif isinstance(base_value, float):
+        if isinstance(value, (int, float)):
+            return float(value)
+    elif isinstance(value, type(base_value)):
+        return value
+
+    raise ValueError(
+        f"{__name__}: parameter {name} must be {type(base_value).__name__}, got {value!r}"
+    )
+
+
+def save_columns(
+    file_name: str,
+    columns: Dict[str, npt.NDArray[Any]],
+    *,
+    array: Optional[npt.NDArray[Any]] = None,
+) -> None:
+    """
+    拡張子に合わせて結果を保存する．\n
+    .npz は名前ごとの配列，.csv は名前を見出しにした列として保存する．
+    .npy は array を指定した場合はそれを，しなければ列を並べた2次元配列を保存する．
+    """
+
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext not in OUTPUT_FORMATS:
+        raise ValueError(f"{__name__}: output must end with {', '.join(OUTPUT_FORMATS)}")
+
+    directory = os.path.dirname(file_name)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if ext == ".npz":
+        np.savez(file_name, **columns)
+    elif ext == ".npy":
+        np.save(file_name, array if array is not None else np.column_stack(list(columns.values())))
+    else:
+        np.savetxt(
+            file_name,
+            np.column_stack([np.ravel(c) for c in columns.values()]),
+            delimiter=",",
+            header=",".join(columns),
+            comments="",
+            fmt="%.10g",
+        )
+
+
+def load_targets(file_name: str) -> npt.NDArray[np.float64]:
+    """
+    逆運動学を計算する目標の座標を読み込む．\n
+    .npy は形状が(N, 2)の配列，.npz は targets という名前の(N, 2)の配列，
+    .csv は x, z の2列(1行目が見出しの場合は読み飛ばす)．
+
+    Returns
+    -------
+    targets : NDArray[np.float64]
+        目標の座標 (x, z) の配列，形状は(N, 2) [mm]
+    """
+
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext == ".npy":
+        targets = np.load(file_name)
+    elif ext == ".npz":
+        with np.load(file_name) as data:
+            targets = data["targets"]
+    elif ext == ".csv":
+        with open(file_name, encoding="utf-8") as f:
+            first = f.readline()
+        skip = 0 if first.strip() and first.strip()[0] in "+-.0123456789" else 1
+        targets = np.loadtxt(file_name, delimiter=",", skiprows=skip, ndmin=2)
+    else:
+        raise ValueError(f"{__name__}: input must end with .npy, .npz or .csv")
+
+    targets = np.asarray(targets, dtype=np.float64)
+    if targets.ndim != 2 or targets.shape[1] != 2:
+        raise ValueError(f"{__name__}: targets must be a (N, 2) array of (x, z)")
+    return targets
+
+
+# ワーカープロセスごとに1度だけ作成する計算機．
+_worker_calc: Optional[HexapodLegRangeCalculator] = None
+
+
+def _init_worker(param_key: HexapodParamKey) -> None:
+    """
+    ワーカープロセスの初期化．パラメータの値から計算機を作成する．
+    """
+    global _worker_calc  # pylint: disable=global-statement
+
+    param: Any = types.SimpleNamespace(**dict(param_key))
+    _worker_calc = HexapodLegRangeCalculator(param)
+
+
+def _solve_chunk(
+    calc: HexapodLegRangeCalculator, targets: npt.NDArray[np.float64], reverse: bool
+) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.float64]]:
+    success, _, angle = calc.calc_inverse_kinematics_xz_batch(
+        targets[:, 0], targets[:, 1], reverse
+    )
+    in_range = calc.is_theta2_in_range_batch(angle[1]) & calc.is_theta3_in_range_batch(angle[2])
+    return success & in_range, angle
+
+
+def _solve_chunk_in_worker(
+    targets: npt.NDArray[np.float64], reverse: bool
+) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.float64]]:
+    assert _worker_calc is not None
+    return _solve_chunk(_worker_calc, targets, reverse)
+
+
+def run_power(args: argparse.Namespace, param: HexapodParamProtocol) -> None:
+    """脚先の力の分布を計算して保存する．"""
+
+    # 描画する場合と同じ格子で計算する．
+    x_range, z_range = make_leg_power_ranges(args.rect, args.step)
+
+    power = TiledLegPowerCalculator(
+        param, tile_size=args.tile_size, workers=args.workers
+    ).calculate(x_range, z_range, power_x=args.power_x, power_z=args.power_z)
+
+    x, z = np.meshgrid(x_range, z_range)
+    if os.path.splitext(args.output)[1].lower() == ".npz":
+        save_columns(args.output, {"x_range": x_range, "z_range": z_range, "power": power})
+    else:
+        save_columns(args.output, {"x": x, "z": z, "power": power}, array=power)
+
+
+def run_approx_table(args: argparse.Namespace, param: HexapodParamProtocol) -> None:
+    """近似された脚の可動範囲の最大半径の表を保存する．"""
+
+    calc = HexapodLegRangeCalculator(param, approx_resolution=args.resolution)
+    z, radius = calc.get_approximate_max_leg_raudus_table()
+    save_columns(args.output, {"z": z + 0.0, "radius": radius})  # -0.0 を 0.0 にする．
+
+
+def run_boundary(args: argparse.Namespace, param: HexapodParamProtocol) -> None:
+    """脚の可動範囲の境界線を保存する．"""
+
+    calc = HexapodLegRangeCalculator(param)
+    lines = calc.calc_range_of_motion_boundary(
+        param.theta2_min,
+        param.theta2_max,
+        param.theta3_min,
+        param.theta3_max,
+        step=args.step,
+        tolerance=args.tolerance,
+    )
+
+    # 4本の線を，線の番号を付けて1つの表にまとめる．
+    index = np.concatenate([np.full(len(x), i, dtype=np.float64) for i, (x, _) in enumerate(lines)])
+    x = np.concatenate([x for x, _ in lines])
+    z = np.concatenate([z for _, z in lines])
+    save_columns(args.output, {"line": index, "x": x, "z": z})
+
+
+def run_ik(args: argparse.Namespace, param: HexapodParamProtocol) -> None:
+    """
+    ファイルから読み込んだ目標について，逆運動学をまとめて計算して保存する．
+    reachable は脚がとどき，関節が可動範囲内に収まる場合に1となる．
+    """
+
+    targets = load_targets(args.input)
+    chunks = [
+        targets[start:start + args.chunk_size]
+        for start in range(0, len(targets), args.chunk_size)
+    ]
+
+    results: List[Tuple[npt.NDArray[np.bool_], npt.NDArray[np.float64]]]
+    if args.workers == 1 or len(chunks) <= 1:
+        calc = HexapodLegRangeCalculator(param)
+        results = [_solve_chunk(calc, chunk, args.reverse) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(args.workers, len(chunks)),
+            initializer=_init_worker,
+            initargs=(make_hexapod_param_key(param),),
+        ) as executor:
+            results = list(
+                executor.map(_solve_chunk_in_worker, chunks, [args.reverse] * len(chunks))
+            )
+
+    success = np.concatenate([r[0] for r in results]) if results else np.zeros(0, np.bool_)
+    angle = np.concatenate([r[1] for r in results], axis=1) if results else np.zeros((3, 0))
+
+    save_columns(
+        args.output,
+        {
+            "x": targets[:, 0],
+            "z": targets[:, 1],
+            "reachable": success.astype(np.float64),
+            "theta1": angle[0],
+            "theta2": angle[1],
+            "theta3": angle[2],
+        },
+    )
+
+
+def make_parser() -> argparse.ArgumentParser:
+    """
+    コマンドライン引数の解析器を作成する．
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="hexareach",
+        description="Compute hexapod leg ranges without a GUI.",
+    )
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--robot", default="PhantomxMk2Param", choices=list(ROBOTS), help="robot parameters"
+    )
+    common.add_argument("--param-file", help="JSON file overriding the robot parameters")
+    common.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    common.add_argument(
+        "--chunk-size", type=int, default=4096, help="targets per worker chunk (ik)"
+    )
+    common.add_argument(
+        "-o", "--output", required=True, help="output file (.npy, .npz or .csv)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+
+    power = subparsers.add_parser("power", parents=[common], help="leg power map")
+    power.add_argument(
+        "--rect", type=float, nargs=4, default=[-100.0, 300.0, -200.0, 200.0],
+        metavar=("X_MIN", "X_MAX", "Z_MIN", "Z_MAX"), help="range [mm]",
+    )
+    power.add_argument("--step", type=float, default=2.0, help="grid step [mm]")
+    power.add_argument(
+        "--tile-size", type=int, default=64,
+        help="tile side length in grid points, split over --workers",
+    )
+    power.add_argument("--power-x", type=float, default=0.0, help="normalized force along x")
+    power.add_argument("--power-z", type=float, default=1.0, help="normalized force along z")
+    power.set_defaults(func=run_power)
+
+    approx = subparsers.add_parser(
+        "approx-table", parents=[common], help="approximated max radius table"
+    )
+    approx.add_argument("--resolution", type=float, default=1.0, help="z step [mm]")
+    approx.set_defaults(func=run_approx_table)
+
+    boundary = subparsers.add_parser(
+        "boundary", parents=[common], help="range of motion boundary"
+    )
+    boundary.add_argument("--step", type=float, default=0.001, help="angle step [rad]")
+    boundary.add_argument(
+        "--tolerance", type=float, default=None, help="adaptive sampling tolerance [mm]"
+    )
+    boundary.set_defaults(func=run_boundary)
+
+    ik = subparsers.add_parser("ik", parents=[common], help="batch inverse kinematics")
+    ik.add_argument("input", help="targets (.npy/.npz (N, 2) or .csv x,z)")
+    ik.add_argument("--reverse", action="store_true", help="choose the upward IK branch")
+    ik.set_defaults(func=run_ik)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Main function. Without a subcommand, display package information.
+    """
+
+    parser = make_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        print_banner()
+        return 0
+
+    if args.workers < 1:
+        parser.error("--workers must be 1 or more")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be 1 or more")
+    # 0 や負の値では，0除算になったり空の結果を書き出したりするため，ここで弾く．
+    for name in ("step", "tolerance", "resolution", "tile_size"):
+        value = getattr(args, name, None)
+        if value is not None and value <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be greater than 0")
+
+    try:
+        param = load_param(args.robot, args.param_file)
+        args.func(args, param)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    print(f"{__name__}: wrote {args.output}")
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
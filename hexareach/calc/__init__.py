@@ -6,12 +6,46 @@ __init__.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
+from .adaptive_leg_power import AdaptiveLegPowerMap, AdaptiveLegPowerSampler
+from .arduino_servo_param import ArduinoServoParam
+from .calculator_registry import (
+    CalculatorRegistry,
+    get_calculator_registry,
+    get_leg_range_calculator,
+)
+from .design_sweep import DesignSweep
+from .hexapod_body_ik_solver import BodyIkResult, HexapodBodyIkSolver
+from .hexapod_body_param_protocol import HexapodBodyParamProtocol
 from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
 from .hexapod_param_protocol import HexapodParamProtocol
+from .ik_lookup_table import IkLookupTable
+from .leg_power_tile_cache import LegPowerTileCache
 from .phatomx_mk2_param import PhantomxMk2Param
+from .servo_packet import pack_servo_ticks, unpack_servo_ticks
+from .trajectory_ik_solver import TrajectoryIkChunk, TrajectoryIkSolver
+from .workspace_distance_field import WorkspaceDistanceField
+from .workspace_occupancy_grid import WorkspaceOccupancyGrid
 
 __all__ = [
+    "AdaptiveLegPowerMap",
+    "AdaptiveLegPowerSampler",
+    "ArduinoServoParam",
+    "BodyIkResult",
+    "CalculatorRegistry",
+    "get_calculator_registry",
+    "get_leg_range_calculator",
+    "DesignSweep",
+    "HexapodBodyIkSolver",
+    "HexapodBodyParamProtocol",
     "HexapodLegRangeCalculator",
     "HexapodParamProtocol",
+    "IkLookupTable",
+    "LegPowerTileCache",
     "PhantomxMk2Param",
+    "pack_servo_ticks",
+    "unpack_servo_ticks",
+    "TrajectoryIkChunk",
+    "TrajectoryIkSolver",
+    "WorkspaceDistanceField",
+    "WorkspaceOccupancyGrid",
 ]
@@ -0,0 +1,358 @@
+"""
+adaptive_leg_power.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .calculator_registry import get_leg_range_calculator
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .hexapod_param_protocol import HexapodParamProtocol
+from .leg_power_calculator import LegPowerCalculator
+from .workspace_occupancy_grid import make_workspace_boundary_lines
+
+
+class AdaptiveLegPowerMap:
+    """
+    AdaptiveLegPowerSampler で求めた，四分木で分割した力の分布を格納するクラス．\n
+    分割しなかったセル(葉)ごとに，4隅の力の値を持つ．
+    """
+
+    def __init__(
+        self,
+        rect: Tuple[float, float, float, float],
+        base_shape: Tuple[int, int],
+        base_step: float,
+        leaves: List[Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]],
+        sample_count: int,
+    ) -> None:
+        """
+        通常は AdaptiveLegPowerSampler.sample で作成する．
+
+        Parameters
+        ----------
+        rect : Tuple[float, float, float, float]
+            分割した範囲 (x_min, x_max, z_min, z_max) [mm]．x_min, z_min がセルの端となる．
+        base_shape : Tuple[int, int]
+            最も粗い段階のセルの数 (nz, nx)
+        base_step : float
+            最も粗い段階のセルの1辺の長さ [mm]
+        leaves : List[Tuple[NDArray[np.int64], NDArray[np.float64]]]
+            段階ごとの葉．段階 l のセルの番号 (iz * nx_l + ix) を昇順に並べた配列と，
+            4隅 (z0x0, z0x1, z1x0, z1x1) の力の配列(形状は(4, n))．
+        sample_count : int
+            力を計算した点の数
+        """
+        self._rect = rect
+        self._base_shape = base_shape
+        self._base_step = base_step
+        self._leaves = leaves
+        self._sample_count = sample_count
+
+    @property
+    def rect(self) -> Tuple[float, float, float, float]:
+        """分割した範囲 (x_min, x_max, z_min, z_max) [mm]"""
+        return self._rect
+
+    @property
+    def depth(self) -> int:
+        """最も粗い段階から何回分割したか"""
+        return len(self._leaves) - 1
+
+    @property
+    def min_step(self) -> float:
+        """最も細かい段階のセルの1辺の長さ [mm]"""
+        return self._base_step / 2 ** self.depth
+
+    @property
+    def sample_count(self) -> int:
+        """力を計算した点の数"""
+        return self._sample_count
+
+    @property
+    def dense_sample_count(self) -> int:
+        """最も細かい段階の格子で全ての点を計算した場合の点の数"""
+        scale = 2 ** self.depth
+        return (self._base_shape[0] * scale + 1) * (self._base_shape[1] * scale + 1)
+
+    def leaf_count(self, level: Optional[int] = None) -> int:
+        """
+        葉の数を返す．level を指定した場合は，その段階の葉の数を返す．
+        """
+        if level is None:
+            return sum(len(keys) for keys, _ in self._leaves)
+        return len(self._leaves[level][0])
+
+    def resample(
+        self, x_range: npt.ArrayLike, z_range: npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """
+        一様な格子の上の力の分布を，点を含む葉の4隅から双線形補間で求める．\n
+        戻り値は LegPowerCalculator.calculate と同じく，x*zの要素数を持つ2次元配列(xが列，zが行)．
+        分割した範囲の外の点は nan とする．
+
+        Parameters
+        ----------
+        x_range : ArrayLike
+            脚先のx座標の配列 [mm]
+        z_range : ArrayLike
+            脚先のz座標の配列 [mm]
+
+        Returns
+        -------
+        power_array : NDArray[np.float64]
+            力の倍率の配列，形状は(len(z_range), len(x_range))．
+        """
+        x, z = np.meshgrid(
+            np.asarray(x_range, dtype=np.float64), np.asarray(z_range, dtype=np.float64)
+        )
+        return self.resample_points(x, z)
+
+    def resample_points(
+        self, x: npt.ArrayLike, z: npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """
+        任意の形状の座標の配列について，resample と同じく力を補間する．
+        """
+        x_arr, z_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        )
+        nz0, nx0 = self._base_shape
+        x_min, z_min = self._rect[0], self._rect[2]
+        x_end = x_min + nx0 * self._base_step
+        z_end = z_min + nz0 * self._base_step
+
+        ans = np.full(x_arr.shape, np.nan)
+        flat_x = x_arr.ravel()
+        flat_z = z_arr.ravel()
+        flat_ans = ans.reshape(-1)
+
+        # 葉は範囲を重なりなく分割するため，粗い段階から順に点を含む葉を探す．
+        remaining = np.flatnonzero(
+            (flat_x >= x_min) & (flat_x <= x_end) & (flat_z >= z_min) & (flat_z <= z_end)
+        )
+        for level, (keys, corners) in enumerate(self._leaves):
+            if remaining.size == 0:
+                break
+            if keys.size == 0:
+                continue
+
+            nx_l = nx0 << level
+            nz_l = nz0 << level
+            step = self._base_step / 2 ** level
+            fx = (flat_x[remaining] - x_min) / step
+            fz = (flat_z[remaining] - z_min) / step
+            ix = np.clip(np.floor(fx), 0, nx_l - 1).astype(np.int64)
+            iz = np.clip(np.floor(fz), 0, nz_l - 1).astype(np.int64)
+
+            index = np.searchsorted(keys, iz * nx_l + ix)
+            index_clip = np.minimum(index, keys.size - 1)
+            found = keys[index_clip] == iz * nx_l + ix
+
+            leaf = index_clip[found]
+            tx = fx[found] - ix[found]
+            tz = fz[found] - iz[found]
+            flat_ans[remaining[found]] = (
+                corners[0, leaf] * (1.0 - tz) * (1.0 - tx)
+                + corners[1, leaf] * (1.0 - tz) * tx
+                + corners[2, leaf] * tz * (1.0 - tx)
+                + corners[3, leaf] * tz * tx
+            )
+            remaining = remaining[~found]
+
+        return ans
+
+
+class AdaptiveLegPowerSampler:
+    """
+    脚先の力の分布を，値が変化するセルだけを四分木で細かく分割して計算するクラス．\n
+    一様な格子で計算すると，脚がとどかない点(力が0)や力がほとんど変化しない点の計算が大半を占める．
+    このクラスは粗い格子から始め，4隅と中央の値の差が大きいセルや，
+    とどく点ととどかない点が混ざったセルだけを min_step まで分割する．
+    標本点の間を通る細い可動範囲を見落とさないよう，可動範囲の境界線が通るセルも必ず分割する．
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+        base_step: float = 4.0,
+        min_step: float = 0.25,
+        tolerance: float = 0.5,
+        max_power: float = 19.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            脚の可動範囲を計算するためのインスタンス．Noneの場合は共有のものを使う．
+        base_step : float
+            最も粗い段階のセルの1辺の長さ [mm]．
+        min_step : float
+            最も細かい段階のセルの1辺の長さ [mm]．base_step を2の累乗で割った値であること．
+        tolerance : float
+            セルの4隅と中央の力の倍率の差がこの値を超えた場合に分割する．
+        max_power : float
+            計算する力の倍率の上限．
+        """
+        if min_step <= 0.0 or base_step < min_step:
+            raise ValueError(f"{__name__}: 0 < min_step <= base_step is required")
+
+        depth = int(round(np.log2(base_step / min_step)))
+        if not np.isclose(base_step / 2 ** depth, min_step):
+            raise ValueError(f"{__name__}: base_step / min_step must be a power of 2")
+
+        if tolerance < 0.0:
+            raise ValueError(f"{__name__}: tolerance is less than 0")
+
+        if hexapod_leg_range_calc is None:
+            hexapod_leg_range_calc = get_leg_range_calculator(hexapod_param)
+
+        self._calc = LegPowerCalculator(
+            hexapod_leg_range_calc, hexapod_param, max_power=max_power
+        )
+        self._boundary_lines = make_workspace_boundary_lines(
+            hexapod_param, hexapod_leg_range_calc, spacing=0.25 * min_step
+        )
+        self._base_step = float(base_step)
+        self._depth = depth
+        self._tolerance = tolerance
+
+    def sample(
+        self,
+        rect: Tuple[float, float, float, float],
+        *,
+        power_x: float = 0.0,
+        power_z: float = 1.0,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Optional[AdaptiveLegPowerMap]:
+        """
+        x_min <= x <= x_max , z_min <= z <= z_max の範囲で力の分布を計算する．
+
+        Parameters
+        ----------
+        rect : Tuple[float, float, float, float]
+            計算する範囲 (x_min, x_max, z_min, z_max) [mm]．
+            最も粗いセルの数は切り上げるため，x_max, z_max より少し広い範囲を計算する．
+        power_x : float
+            x方向にかかる力.正規化されていること [N]
+        power_z : float
+            z方向にかかる力.正規化されていること [N]
+        should_stop : Optional[Callable[[], bool]]
+            分割の段階ごとに呼び出し，True を返した場合は計算を中止する．
+
+        Returns
+        -------
+        power_map : Optional[AdaptiveLegPowerMap]
+            四分木で分割した力の分布．計算を中止した場合は None．
+        """
+        if rect[0] >= rect[1] or rect[2] >= rect[3]:
+            raise ValueError(f"{__name__}: rect must be (x_min, x_max, z_min, z_max)")
+
+        nx0 = max(int(np.ceil((rect[1] - rect[0]) / self._base_step - 1e-9)), 1)
+        nz0 = max(int(np.ceil((rect[3] - rect[2]) / self._base_step - 1e-9)), 1)
+        scale = 2 ** self._depth
+        min_step = self._base_step / scale
+
+        # 最も細かい格子の点の番号 (iz * lattice_nx + ix) と，計算済みの力の値．
+        lattice_nx = nx0 * scale + 1
+        known_keys = np.empty(0, dtype=np.int64)
+        known_values = np.empty(0, dtype=np.float64)
+
+        def evaluate(keys: npt.NDArray[np.int64]) -> npt.NDArray[np.float64]:
+            nonlocal known_keys, known_values
+
+            unique = np.unique(keys)
+            index = np.minimum(np.searchsorted(known_keys, unique), max(known_keys.size - 1, 0))
+            missing = unique if known_keys.size == 0 else unique[known_keys[index] != unique]
+
+            if missing.size > 0:
+                values = self._calc.calculate_points(
+                    rect[0] + (missing % lattice_nx) * min_step,
+                    rect[2] + (missing // lattice_nx) * min_step,
+                    power_x=power_x,
+                    power_z=power_z,
+                )
+                known_keys = np.concatenate([known_keys, missing])
+                known_values = np.concatenate([known_values, values])
+                order = np.argsort(known_keys, kind="stable")
+                known_keys = known_keys[order]
+                known_values = known_values[order]
+
+            return known_values[np.searchsorted(known_keys, keys)]
+
+        leaves: List[Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]] = []
+        iz, ix = (a.ravel().astype(np.int64) for a in np.mgrid[0:nz0, 0:nx0])
+
+        for level in range(self._depth + 1):
+            if should_stop is not None and should_stop():
+                return None
+
+            size = scale >> level
+            z0 = iz * size
+            x0 = ix * size
+            corners = evaluate(
+                np.stack([
+                    z0 * lattice_nx + x0,
+                    z0 * lattice_nx + x0 + size,
+                    (z0 + size) * lattice_nx + x0,
+                    (z0 + size) * lattice_nx + x0 + size,
+                ])
+            )
+
+            if level == self._depth:
+                refine = np.zeros(iz.shape, dtype=np.bool_)
+            else:
+                center = evaluate((z0 + size // 2) * lattice_nx + x0 + size // 2)
+                samples = np.concatenate([corners, center[np.newaxis]])
+                reachable = samples > 0.0
+                refine = (
+                    (reachable.any(axis=0) != reachable.all(axis=0))
+                    | (samples.max(axis=0) - samples.min(axis=0) > self._tolerance)
+                    | np.isin(iz * (nx0 << level) + ix, self._boundary_cells(rect, level, nz0, nx0))
+                )
+
+            # 葉はセルの番号の昇順に並べる．
+            nx_l = nx0 << level
+            leaf_keys = iz[~refine] * nx_l + ix[~refine]
+            order = np.argsort(leaf_keys)
+            leaves.append((leaf_keys[order], corners[:, ~refine][:, order]))
+
+            iz = (2 * iz[refine, np.newaxis] + np.array([0, 0, 1, 1])).ravel()
+            ix = (2 * ix[refine, np.newaxis] + np.array([0, 1, 0, 1])).ravel()
+
+        return AdaptiveLegPowerMap(
+            (rect[0], rect[0] + nx0 * self._base_step, rect[2], rect[2] + nz0 * self._base_step),
+            (nz0, nx0),
+            self._base_step,
+            leaves,
+            int(known_keys.size),
+        )
+
+    def _boundary_cells(
+        self, rect: Tuple[float, float, float, float], level: int, nz0: int, nx0: int
+    ) -> npt.NDArray[np.int64]:
+        """
+        段階 level で，可動範囲の境界線が通るセルの番号 (iz * nx_l + ix) を返す．
+        """
+        nx_l = nx0 << level
+        nz_l = nz0 << level
+        step = self._base_step / 2 ** level
+
+        keys = []
+        for line_x, line_z in self._boundary_lines:
+            ix = np.floor((line_x - rect[0]) / step).astype(np.int64)
+            iz = np.floor((line_z - rect[2]) / step).astype(np.int64)
+            inside = (ix >= 0) & (ix < nx_l) & (iz >= 0) & (iz < nz_l)
+            keys.append(iz[inside] * nx_l + ix[inside])
+
+        return np.unique(np.concatenate(keys))
@@ -0,0 +1,23 @@
+"""
+arduino_servo_param.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import Tuple
+
+
+class ArduinoServoParam:
+    """
+    Arduinoのプログラムで，関節の角度をサーボ角に変換するためのパラメータを持つクラス.\n
+    サーボ角は angle * tick_scale / tick_divisor * tick_scale で求める．
+    1目盛りは tick_divisor / tick_scale^2 = 0.0051 [rad]．
+    """
+    tick_scale: float = 100.0
+    tick_divisor: float = 51.0
+    # 左足のサーボ角は left_offset - サーボ角，coxa,femur,tibiaの順 [0~1023]
+    left_offset: Tuple[int, int, int] = (512, 500, 670)
+    # 右足のサーボ角は right_offset + サーボ角，coxa,femur,tibiaの順 [0~1023]
+    right_offset: Tuple[int, int, int] = (512, 524, 354)
@@ -0,0 +1,184 @@
+"""
+calculator_registry.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from collections import OrderedDict
+import threading
+import types
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .hexapod_param_protocol import (
+    HexapodParamKey,
+    HexapodParamProtocol,
+    make_hexapod_param_key,
+)
+
+T = TypeVar("T")
+
+
+class _RegistryEntry:
+    """
+    キャッシュされた計算機と，そこから計算した表を保持するクラス．
+    """
+
+    def __init__(self, calc: HexapodLegRangeCalculator) -> None:
+        self.calc = calc
+        self.tables: Dict[str, Any] = {}
+
+
+class CalculatorRegistry:
+    """
+    パラメータの値ごとに HexapodLegRangeCalculator を共有するためのキャッシュ.\n
+    最大 max_size 個まで保持し，それを超えると最も長く使われていないものから削除する．
+    """
+
+    def __init__(self, max_size: int = 16) -> None:
+        """
+        Parameters
+        ----------
+        max_size : int
+            保持する計算機の最大数．
+        """
+        if max_size < 1:
+            raise ValueError(f"{__name__}: max_size must be 1 or more")
+
+        self._max_size = max_size
+        self._entries: "OrderedDict[Tuple[HexapodParamKey, float], _RegistryEntry]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self, hexapod_param: HexapodParamProtocol, *, approx_resolution: float = 1.0
+    ) -> HexapodLegRangeCalculator:
+        """
+        パラメータに対応する計算機を返す．なければ作成して登録する．
+
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        approx_resolution : float
+            脚の可動範囲の最大半径を何mmごとに計算するか [mm]
+
+        Returns
+        -------
+        calc : HexapodLegRangeCalculator
+            共有される計算機．
+        """
+
+        return self._get_entry(hexapod_param, approx_resolution).calc
+
+    def get_table(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        name: str,
+        factory: Callable[[HexapodLegRangeCalculator], T],
+        *,
+        approx_resolution: float = 1.0,
+    ) -> T:
+        """
+        計算機から求められる表を返す．まだ計算していなければ factory で計算して保存する．
+        計算機と同じく，パラメータの値ごとに共有される．
+
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        name : str
+            表の名前．同じ名前の表は1度だけ計算される．
+        factory : Callable[[HexapodLegRangeCalculator], T]
+            表を計算する関数．
+        approx_resolution : float
+            脚の可動範囲の最大半径を何mmごとに計算するか [mm]
+
+        Returns
+        -------
+        table : T
+            共有される表．
+        """
+
+        entry = self._get_entry(hexapod_param, approx_resolution)
+
+        with self._lock:
+            if name in entry.tables:
+                return entry.tables[name]
+
+        table = factory(entry.calc)
+
+        with self._lock:
+            return entry.tables.setdefault(name, table)
+
+    def clear(self) -> None:
+        """
+        保持している計算機をすべて削除する．
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_entry(
+        self, hexapod_param: HexapodParamProtocol, approx_resolution: float
+    ) -> _RegistryEntry:
+        param_key = make_hexapod_param_key(hexapod_param)
+        key = (param_key, approx_resolution)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        # 元のインスタンスが後から書き換えられても影響しないよう，値を写した物を渡す．
+        snapshot: Any = types.SimpleNamespace(**dict(param_key))
+        entry = _RegistryEntry(
+            HexapodLegRangeCalculator(snapshot, approx_resolution=approx_resolution)
+        )
+
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+            return entry
+
+
+_default_registry = CalculatorRegistry()
+
+
+def get_calculator_registry() -> CalculatorRegistry:
+    """
+    パッケージ全体で共有されるレジストリを返す．
+    """
+
+    return _default_registry
+
+
+def get_leg_range_calculator(
+    hexapod_param: HexapodParamProtocol, *, approx_resolution: float = 1.0
+) -> HexapodLegRangeCalculator:
+    """
+    パッケージ全体で共有されるレジストリから計算機を取得する．
+
+    Parameters
+    ----------
+    hexapod_param : HexapodParamProtocol
+        パラメータを格納するためのインスタンス．
+    approx_resolution : float
+        脚の可動範囲の最大半径を何mmごとに計算するか [mm]
+
+    Returns
+    -------
+    calc : HexapodLegRangeCalculator
+        共有される計算機．
+    """
+
+    return _default_registry.get(hexapod_param, approx_resolution=approx_resolution)
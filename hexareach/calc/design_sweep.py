@@ -0,0 +1,269 @@
+"""
+design_sweep.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+import types
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .hexapod_param_protocol import (
+    HexapodParamKey,
+    HexapodParamProtocol,
+    make_hexapod_param_key,
+)
+from .leg_power_calculator import LegPowerCalculator, make_leg_power_ranges
+
+# 1つのパラメータについて求める指標の名前．
+METRIC_NAMES: Tuple[str, ...] = (
+    "reachable_area",  # 関節の可動範囲内で脚がとどく領域の面積 [mm^2]
+    "radius_min",  # 地面の高さでの近似された可動範囲の最小半径 [mm]
+    "radius_max",  # 地面の高さでの近似された可動範囲の最大半径 [mm]
+    "radius_band",  # radius_max - radius_min [mm]
+    "power_mean",  # 脚がとどく領域での脚先の力の倍率の平均
+    "power_min",  # 脚がとどく領域での脚先の力の倍率の最小値
+)
+
+# 変化させることができるパラメータの名前．
+SWEEPABLE_NAMES: Tuple[str, ...] = tuple(
+    name
+    for name, annotation in HexapodParamProtocol.__annotations__.items()
+    if annotation is float
+)
+
+# ワーカープロセスごとに1度だけ設定する計算条件．
+_worker_options: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    """
+    ワーカープロセスの初期化．計算条件を保存する．
+    """
+    global _worker_options  # pylint: disable=global-statement
+    _worker_options = options
+
+
+def _evaluate_in_worker(param_key: HexapodParamKey) -> Tuple[float, ...]:
+    assert _worker_options is not None
+    return _evaluate(param_key, **_worker_options)
+
+
+def _evaluate(
+    param_key: HexapodParamKey,
+    *,
+    x_range: npt.NDArray[np.float64],
+    z_range: npt.NDArray[np.float64],
+    resolution: float,
+    ground_z: float,
+    power_x: float,
+    power_z: float,
+    max_power: float,
+) -> Tuple[float, ...]:
+    """
+    1つのパラメータについて，METRIC_NAMES の順に指標を求める．
+    """
+
+    param: Any = types.SimpleNamespace(**dict(param_key))
+    calc = HexapodLegRangeCalculator(param)
+
+    x, z = np.meshgrid(x_range, z_range)
+    is_reachable, _ = calc.calc_reachable_inverse_kinematics_xz_batch(x, z)
+
+    # 力は脚がとどく点だけで計算する．
+    power = LegPowerCalculator(calc, param, max_power=max_power).calculate_points(
+        x[is_reachable], z[is_reachable], power_x=power_x, power_z=power_z
+    )
+
+    # 格子点1つ分の面積で，領域の面積を近似する．
+    cell_area = resolution * resolution
+    reachable_num = int(np.count_nonzero(is_reachable))
+
+    radius_min = calc.get_approximate_min_leg_raudus()
+    radius_max = calc.get_approximate_max_leg_raudus(ground_z)
+
+    return (
+        reachable_num * cell_area,
+        radius_min,
+        radius_max,
+        radius_max - radius_min,
+        float(power.mean()) if reachable_num > 0 else 0.0,
+        float(power.min()) if reachable_num > 0 else 0.0,
+    )
+
+
+class DesignSweep:
+    """
+    パラメータを変化させた多数のロボットについて，脚の可動範囲と力の指標をまとめて求めるクラス.\n
+    基準のパラメータから指定した値を組み合わせたパラメータを作り，複数のプロセスで評価する．
+    結果はパラメータと指標の名前ごとの配列(列)として返す．
+    """
+
+    def __init__(
+        self,
+        base_param: HexapodParamProtocol,
+        *,
+        rect: Tuple[float, float, float, float] = (-100.0, 300.0, -200.0, 200.0),
+        resolution: float = 2.0,
+        ground_z: float = -25.0,
+        power_x: float = 0.0,
+        power_z: float = 1.0,
+        max_power: float = 19.0,
+        workers: Optional[int] = None,
+        chunk_size: int = 16,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        base_param : HexapodParamProtocol
+            基準のパラメータ．変化させない値はこのパラメータの値を使う．
+        rect : Tuple[float, float, float, float]
+            面積と力を求める範囲 (x_min, x_max, z_min, z_max) [mm]．
+            力の分布と同じく make_leg_power_ranges で格子点を作るため，x_max, z_max も含む．
+        resolution : float
+            面積と力を求める格子点の間隔 [mm]
+        ground_z : float
+            近似された可動範囲の半径を求める地面のz座標 [mm]
+        power_x : float
+            x方向にかかる力.正規化されていること [N]
+        power_z : float
+            z方向にかかる力.正規化されていること [N]
+        max_power : float
+            計算する力の倍率の上限．
+        workers : Optional[int]
+            ワーカープロセスの数．Noneの場合はCPUの数．1の場合はプロセスを作らずに計算する．
+        chunk_size : int
+            1度にワーカープロセスへ渡すパラメータの数．
+        """
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+        if rect[0] >= rect[1] or rect[2] >= rect[3]:
+            raise ValueError(f"{__name__}: rect must be (x_min, x_max, z_min, z_max)")
+        if workers is not None and workers < 1:
+            raise ValueError(f"{__name__}: workers must be 1 or more")
+        if chunk_size < 1:
+            raise ValueError(f"{__name__}: chunk_size must be 1 or more")
+
+        self._base_key = make_hexapod_param_key(base_param)
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._chunk_size = chunk_size
+        x_range, z_range = make_leg_power_ranges(rect, resolution)
+        self._options: Dict[str, Any] = {
+            "x_range": x_range,
+            "z_range": z_range,
+            "resolution": resolution,
+            "ground_z": ground_z,
+            "power_x": power_x,
+            "power_z": power_z,
+            "max_power": max_power,
+        }
+
+    def make_variants(self, ranges: Mapping[str, Sequence[float]]) -> List[HexapodParamKey]:
+        """
+        指定した値のすべての組み合わせについて，パラメータを作成する．
+        関節の角度の最小値が最大値を超える組み合わせは除く．
+
+        Parameters
+        ----------
+        ranges : Mapping[str, Sequence[float]]
+            パラメータの名前と，その値の候補．名前は SWEEPABLE_NAMES のいずれか．
+
+        Returns
+        -------
+        variants : List[HexapodParamKey]
+            パラメータの値を表すキーのリスト．
+        """
+
+        for name in ranges:
+            if name not in SWEEPABLE_NAMES:
+                raise ValueError(f"{__name__}: {name} is not a sweepable parameter")
+
+        base = dict(self._base_key)
+        names = list(ranges)
+        variants: List[HexapodParamKey] = []
+
+        for values in itertools.product(*(ranges[name] for name in names)):
+            param = dict(base)
+            param.update(zip(names, (float(v) for v in values)))
+
+            if any(param[f"theta{i}_min"] > param[f"theta{i}_max"] for i in (1, 2, 3)):
+                continue
+
+            variants.append(tuple(sorted(param.items())))
+
+        return variants
+
+    def run(
+        self,
+        ranges: Mapping[str, Sequence[float]],
+        file_name: Optional[str] = None,
+    ) -> Dict[str, npt.NDArray[np.float64]]:
+        """
+        パラメータを作成して評価する．
+
+        Parameters
+        ----------
+        ranges : Mapping[str, Sequence[float]]
+            パラメータの名前と，その値の候補．
+        file_name : Optional[str]
+            結果を .npz ファイルとして保存する場合のファイル名．
+
+        Returns
+        -------
+        result : Dict[str, NDArray[np.float64]]
+            SWEEPABLE_NAMES と METRIC_NAMES の名前ごとの配列．要素数はパラメータの数．
+        """
+
+        variants = self.make_variants(ranges)
+        metrics = self.evaluate(variants)
+
+        result: Dict[str, npt.NDArray[np.float64]] = {}
+        for name in SWEEPABLE_NAMES:
+            result[name] = np.array([dict(key)[name] for key in variants], dtype=np.float64)
+        for i, name in enumerate(METRIC_NAMES):
+            result[name] = metrics[:, i].copy()
+
+        if file_name is not None:
+            directory = os.path.dirname(file_name)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            np.savez(file_name, **result)
+
+        return result
+
+    def evaluate(self, variants: Sequence[HexapodParamKey]) -> npt.NDArray[np.float64]:
+        """
+        パラメータごとに指標を求める．
+
+        Parameters
+        ----------
+        variants : Sequence[HexapodParamKey]
+            パラメータの値を表すキーのリスト．
+
+        Returns
+        -------
+        metrics : NDArray[np.float64]
+            指標の配列，形状は(パラメータの数, len(METRIC_NAMES))．
+        """
+
+        if self._workers == 1 or len(variants) <= 1:
+            rows = [_evaluate(key, **self._options) for key in variants]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self._workers, len(variants)),
+                initializer=_init_worker,
+                initargs=(self._options,),
+            ) as executor:
+                rows = list(
+                    executor.map(_evaluate_in_worker, variants, chunksize=self._chunk_size)
+                )
+
+        return np.array(rows, dtype=np.float64).reshape(len(variants), len(METRIC_NAMES))
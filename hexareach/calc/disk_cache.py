@@ -0,0 +1,279 @@
+"""
+disk_cache.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import hashlib
+from importlib import metadata
+import json
+import os
+import re
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .hexapod_param_protocol import HexapodParamProtocol, make_hexapod_param_key
+
+
+# キャッシュする値の形式と計算方法のバージョン．
+# パッケージとしてインストールされていない場合はライブラリのバージョンで区別できないため，
+# 保存する値の形式や計算方法(力の分布，最大半径の表など)を変更したときは必ず1増やすこと．
+# 2: 力の分布をグリッド全体のベクトル計算に変更．
+CACHE_FORMAT_VERSION = 2
+
+# キャッシュのキーの形式 "{kind}-{sha256}"．このキーのファイル以外は読み書き・削除しない．
+_KIND_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+_KEY_PATTERN = re.compile(r"[A-Za-z0-9_]+-[0-9a-f]{64}")
+
+
+def get_library_version() -> str:
+    """
+    インストールされている hexareach のバージョンを返す．
+    パッケージとしてインストールされていない場合は "unknown" を返す．
+    """
+
+    try:
+        return metadata.version("hexareach")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def hash_array(array: npt.ArrayLike) -> str:
+    """
+    配列の形状，型，値から安定したハッシュ値を計算する．
+    """
+
+    arr = np.ascontiguousarray(array)
+    digest = hashlib.sha256()
+    digest.update(str(arr.dtype.str).encode())
+    digest.update(str(arr.shape).encode())
+    digest.update(arr.tobytes())
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    計算結果の配列をディスクに保存するキャッシュ.\n
+    パラメータの値，計算条件，ライブラリとキャッシュの形式のバージョンから作ったキーごとに
+    .npy ファイルとして保存し，
+    読み込みはメモリマップで行う．合計サイズが max_bytes を超えると，最も長く使われていないものから削除する．
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        *,
+        max_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        directory : Optional[str]
+            キャッシュを保存するディレクトリ．
+            Noneの場合は環境変数 HEXAREACH_CACHE_DIR，なければ ~/.cache/hexareach を使う．
+        max_bytes : int
+            キャッシュの合計サイズの上限 [byte]
+        """
+        if directory is None:
+            directory = os.environ.get(
+                "HEXAREACH_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "hexareach"),
+            )
+
+        if max_bytes < 0:
+            raise ValueError(f"{__name__}: max_bytes is less than 0")
+
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._version = get_library_version()
+
+    @property
+    def directory(self) -> str:
+        """
+        キャッシュを保存するディレクトリ．
+        """
+        return self._directory
+
+    def make_key(
+        self, kind: str, hexapod_param: HexapodParamProtocol, items: Dict[str, Any]
+    ) -> str:
+        """
+        キャッシュのキーを作成する．
+
+        Parameters
+        ----------
+        kind : str
+            保存する値の種類．英数字と "_" のみ使用できる．
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        items : Dict[str, Any]
+            計算条件．JSONに変換できる値であること．
+
+        Returns
+        -------
+        key : str
+            キー．ファイル名に使用できる文字列．
+        """
+
+        if not _KIND_PATTERN.fullmatch(kind):
+            raise ValueError(f"{__name__}: kind must consist of letters, digits and '_'")
+
+        source = json.dumps(
+            {
+                "kind": kind,
+                "version": self._version,
+                "format": CACHE_FORMAT_VERSION,
+                "param": make_hexapod_param_key(hexapod_param),
+                "items": items,
+            },
+            sort_keys=True,
+        )
+        return f"{kind}-{hashlib.sha256(source.encode()).hexdigest()}"
+
+    def load(self, key: str) -> Optional[npt.NDArray[Any]]:
+        """
+        キーに対応する配列を読み込む．読み込んだ配列は読み取り専用のメモリマップ．
+        存在しない場合はNoneを返す．
+        """
+
+        path = self._make_path(key)
+
+        try:
+            array = np.load(path, mmap_mode="r", allow_pickle=False)
+            os.utime(path)  # 最後に使った時刻を更新する．
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        return array
+
+    def save(self, key: str, array: npt.ArrayLike) -> None:
+        """
+        キーに対応する配列を保存し，上限を超えた分を削除する．
+        キーは make_key で作成したものであること．
+        """
+
+        os.makedirs(self._directory, exist_ok=True)
+
+        # 書き込み途中のファイルを読まないよう，一時ファイルに書いてから置き換える．
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(array), allow_pickle=False)
+            os.replace(tmp_path, self._make_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._evict(keep=key)
+
+    def load_or_compute(
+        self,
+        kind: str,
+        hexapod_param: HexapodParamProtocol,
+        items: Dict[str, Any],
+        compute: Callable[[], npt.NDArray[Any]],
+    ) -> npt.NDArray[Any]:
+        """
+        キャッシュがあれば読み込み，なければ compute で計算して保存する．
+
+        Parameters
+        ----------
+        kind : str
+            保存する値の種類．
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        items : Dict[str, Any]
+            計算条件．JSONに変換できる値であること．
+        compute : Callable[[], NDArray]
+            値を計算する関数．
+
+        Returns
+        -------
+        array : NDArray
+            キャッシュから読み込んだ場合は読み取り専用のメモリマップ．
+        """
+
+        key = self.make_key(kind, hexapod_param, items)
+        array = self.load(key)
+        if array is not None:
+            return array
+
+        array = compute()
+        self.save(key, array)
+        return array
+
+    def clear(self) -> None:
+        """
+        キャッシュをすべて削除する．キーの形式に一致しないファイルは削除しない．
+        """
+
+        for path, _, _ in self._list_entries():
+            self._remove(path)
+
+    def total_bytes(self) -> int:
+        """
+        キャッシュの合計サイズ [byte]
+        """
+
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _make_path(self, key: str) -> str:
+        if not _KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"{__name__}: {key} is not a key made by make_key")
+        return os.path.join(self._directory, f"{key}.npy")
+
+    def _list_entries(self) -> List[Tuple[str, int, float]]:
+        """
+        (パス, サイズ, 最後に使った時刻) のリストを返す．
+        ディレクトリはユーザーの結果の保存先と共有されることがあるため，キーの形式のファイルだけを返す．
+        """
+
+        entries: List[Tuple[str, int, float]] = []
+
+        try:
+            names = os.listdir(self._directory)
+        except FileNotFoundError:
+            return entries
+
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext != ".npy" or not _KEY_PATTERN.fullmatch(stem):
+                continue
+            path = os.path.join(self._directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        """
+        合計サイズが上限を超えている間，最も長く使われていないものから削除する．
+        """
+
+        entries = sorted(self._list_entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        keep_path = self._make_path(keep)
+
+        for path, size, _ in entries:
+            if total <= self._max_bytes:
+                break
+            if path == keep_path:
+                continue
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,166 @@
+"""
+hexapod_body_ik_solver.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from ..math.clamp_angle import clamp_angle_array
+from ..math.rotation import rotation_matrix_rpy
+from .calculator_registry import get_leg_range_calculator
+from .hexapod_body_param_protocol import HexapodBodyParamProtocol
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+
+LEG_NUM = 6
+
+
+class BodyIkResult(NamedTuple):
+    """
+    胴体の姿勢に対する，6本の脚の逆運動学の計算結果．
+    姿勢の配列の形状を P とする．
+    """
+
+    # 脚がとどかず計算できなければFalseとなる配列，形状は(*P, 6)
+    success: npt.NDArray[np.bool_]
+    # 脚の関節の角度の配列，形状は(*P, 6, 3)．coxa,femur,tibiaの順 [rad]
+    angle: npt.NDArray[np.float64]
+    # 関節が可動範囲内かどうかの配列，形状は(*P, 6, 3)．coxa,femur,tibiaの順
+    in_range: npt.NDArray[np.bool_]
+    # 脚の付け根から見た脚先の座標，形状は(*P, 6, 3)．coxaの向きをx軸とする [mm]
+    leg_position: npt.NDArray[np.float64]
+
+
+class HexapodBodyIkSolver:
+    """
+    胴体の姿勢と6本の脚先の座標から，すべての脚の関節の角度を求めるクラス.\n
+    脚先の座標を各脚の付け根から見た座標に変換し，coxa 関節の角度を求めた後，
+    HexapodLegRangeCalculator で femur と tibia の角度を求める．
+    複数の姿勢についてまとめて計算できる．
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodBodyParamProtocol,
+        *,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodBodyParamProtocol
+            脚の付け根の位置を含むパラメータを格納するためのインスタンス．
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            脚の可動範囲を計算するためのインスタンス．Noneの場合は共有のものを使う．
+        """
+        mount_position = np.asarray(hexapod_param.leg_mount_position, dtype=np.float64)
+        mount_angle = np.asarray(hexapod_param.leg_mount_angle, dtype=np.float64)
+
+        if mount_position.shape != (LEG_NUM, 3):
+            raise ValueError(f"{__name__}: leg_mount_position must have 6 (x, y, z) entries")
+        if mount_angle.shape != (LEG_NUM,):
+            raise ValueError(f"{__name__}: leg_mount_angle must have 6 entries")
+
+        if hexapod_leg_range_calc is None:
+            hexapod_leg_range_calc = get_leg_range_calculator(hexapod_param)
+
+        self._calc = hexapod_leg_range_calc
+        self._mount_position = mount_position
+
+        # 胴体座標系から各脚の座標系への回転(z軸周り)，形状は(6, 2, 2)．
+        cos, sin = np.cos(mount_angle), np.sin(mount_angle)
+        self._mount_rotation = np.stack(
+            [np.stack([cos, sin], axis=-1), np.stack([-sin, cos], axis=-1)], axis=-2
+        )
+
+    def solve(
+        self,
+        translation: npt.ArrayLike,
+        rotation: npt.ArrayLike,
+        foot_position: npt.ArrayLike,
+        reverse_flag: npt.ArrayLike = False,
+    ) -> BodyIkResult:
+        """
+        胴体の姿勢と脚先の座標から，6本の脚の関節の角度をまとめて求める．
+
+        Parameters
+        ----------
+        translation : ArrayLike
+            胴体の中心の座標 (x, y, z)，形状は(*P, 3) [mm]
+        rotation : ArrayLike
+            胴体の回転 (roll, pitch, yaw)，形状は(*P, 3) [rad]
+        foot_position : ArrayLike
+            脚先の座標 (x, y, z)，形状は(*P, 6, 3) [mm]．
+            translation と同じ座標系で表す．姿勢の数によらず同じ場合は(6, 3)でよい．
+        reverse_flag : ArrayLike
+            逆運動学解は2つあるが、どちらを選択するかを決めるフラグ.Trueにすると脚先が上を向く.\n
+            (*P, 6) とブロードキャスト可能な配列を渡すと，脚ごとに選択できる．
+
+        Returns
+        -------
+        res : BodyIkResult
+            計算結果．P は translation, rotation, foot_position の姿勢の形状をブロードキャストしたもの．
+        """
+        translation_arr = np.asarray(translation, dtype=np.float64)
+        rotation_arr = np.asarray(rotation, dtype=np.float64)
+        foot_arr = np.asarray(foot_position, dtype=np.float64)
+
+        if translation_arr.shape[-1:] != (3,) or rotation_arr.shape[-1:] != (3,):
+            raise ValueError(f"{__name__}: translation and rotation must be (..., 3) arrays")
+        if foot_arr.shape[-2:] != (LEG_NUM, 3):
+            raise ValueError(f"{__name__}: foot_position must be a (..., 6, 3) array")
+
+        pose_shape = np.broadcast_shapes(
+            translation_arr.shape[:-1], rotation_arr.shape[:-1], foot_arr.shape[:-2]
+        )
+
+        # 脚先を胴体座標系に変換する．p_body = R^T (p - t)
+        matrix = rotation_matrix_rpy(
+            rotation_arr[..., 0], rotation_arr[..., 1], rotation_arr[..., 2]
+        )
+        relative = foot_arr - translation_arr[..., np.newaxis, :]
+        body = np.einsum("...ji,...lj->...li", matrix, relative)
+        body = np.broadcast_to(body, pose_shape + (LEG_NUM, 3))
+
+        # 各脚の付け根から見た座標に変換する．
+        from_mount = body - self._mount_position
+        leg_position = np.empty_like(from_mount)
+        leg_position[..., :2] = np.einsum(
+            "lij,...lj->...li", self._mount_rotation, from_mount[..., :2]
+        )
+        leg_position[..., 2] = from_mount[..., 2]
+
+        # coxa 関節の角度と，脚を含む平面での脚先の座標．
+        theta1 = np.arctan2(leg_position[..., 1], leg_position[..., 0])
+        planar_x = np.hypot(leg_position[..., 0], leg_position[..., 1])
+        planar_z = leg_position[..., 2]
+
+        success, _, planar_angle = self._calc.calc_inverse_kinematics_xz_batch(
+            planar_x, planar_z, reverse_flag
+        )
+
+        angle = np.empty(pose_shape + (LEG_NUM, 3), dtype=np.float64)
+        angle[..., 0] = clamp_angle_array(theta1)
+        angle[..., 1] = planar_angle[1]
+        angle[..., 2] = planar_angle[2]
+
+        in_range = np.stack(
+            [
+                self._calc.is_theta1_in_range_batch(angle[..., 0]),
+                self._calc.is_theta2_in_range_batch(angle[..., 1]),
+                self._calc.is_theta3_in_range_batch(angle[..., 2]),
+            ],
+            axis=-1,
+        )
+
+        return BodyIkResult(
+            success=success,
+            angle=angle,
+            in_range=in_range,
+            leg_position=leg_position,
+        )
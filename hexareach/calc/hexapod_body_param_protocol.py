@@ -0,0 +1,22 @@
+"""
+hexapod_body_param_protocol.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import Protocol, Tuple
+
+from .hexapod_param_protocol import HexapodParamProtocol
+
+
+class HexapodBodyParamProtocol(HexapodParamProtocol, Protocol):
+    """
+    Protocol for storing Hexapod parameters including the leg mounts on the body.
+    The body frame has x forward, y left and z up, with the origin at the body center.
+    """
+    # Position (x, y, z) of each of the 6 coxa joints in the body frame [mm]
+    leg_mount_position: Tuple[Tuple[float, float, float], ...]
+    # Direction of each coxa at theta1 = 0, measured from the body x axis around z [rad]
+    leg_mount_angle: Tuple[float, ...]
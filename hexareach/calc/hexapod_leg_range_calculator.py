@@ -8,30 +8,51 @@ hexapod_leg_range_calculator.py
 
 import math
 
-from typing import Tuple, List
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
 
 from ..math.triangle_checker import TriangleChecker
-from ..math.clamp_angle import clamp_angle
+from ..math.clamp_angle import clamp_angle, clamp_angle_array
+from .arduino_servo_param import ArduinoServoParam
 from .hexapod_param_protocol import HexapodParamProtocol
 
+if TYPE_CHECKING:
+    from .disk_cache import DiskCache
+
 
 class HexapodLegRangeCalculator:
     """
     脚の可動範囲を計算するクラス．
     """
 
-    def __init__(self, hexapod_param: HexapodParamProtocol) -> None:
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        approx_resolution: float = 1.0,
+        cache: Optional["DiskCache"] = None,
+    ) -> None:
         """
         Parameters
         ----------
         hexapod_param : HexapodParamProtocol
             パラメータを格納するためのインスタンス．
+        approx_resolution : float
+            脚の可動範囲の最大半径を何mmごとに計算するか [mm]
+        cache : Optional[DiskCache]
+            脚の可動範囲の最大半径の表を保存するキャッシュ．Noneの場合は保存しない．
         """
+        if approx_resolution <= 0:
+            raise ValueError(f"{__name__}: approx_resolution must be positive")
+
         self._debug_flag = False
         self._param = hexapod_param
+        self._approx_resolution = approx_resolution
 
         # 脚の可動範囲の最大半径を計算する．
-        self._init_approximate_max_leg_raudus()
+        self._init_approximate_max_leg_raudus(cache)
 
     def get_approximate_min_leg_raudus(self) -> float:
         """
@@ -61,11 +82,15 @@ class HexapodLegRangeCalculator:
         """
 
         # z座標が負の値の場合は、脚の可動範囲外なので最小半径を返す．
-        if -z < 0 or len(self._approximate_max_leg_raudus) < -z:
+        if -z < 0:
+            return self._param.approx_min_radius
+
+        index = (int)(-z / self._approx_resolution)
+        if len(self._approximate_max_leg_raudus) <= index:
             return self._param.approx_min_radius
 
         # z座標が正の値の場合は、脚の可動範囲内なので最大半径を返す．
-        r = self._approximate_max_leg_raudus[(int)(-z)]
+        r = float(self._approximate_max_leg_raudus[index])
 
         if r < self._param.approx_min_radius :
             return self._param.approx_min_radius
@@ -75,6 +100,51 @@ class HexapodLegRangeCalculator:
 
         return r
 
+    def get_approximate_max_leg_raudus_batch(
+        self, z: npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """
+        get_approximate_max_leg_raudus を配列に対してまとめて計算する．
+
+        Parameters
+        ----------
+        z : ArrayLike
+            z座標 [mm]．任意の形状の配列．
+
+        Returns
+        -------
+        res : NDArray[np.float64]
+            脚がx方向に脚を伸ばせる最大半径 [mm]．zと同じ形状．
+        """
+
+        z_arr = np.asarray(z, dtype=np.float64)
+        table = self._approximate_max_leg_raudus
+
+        # 範囲外の添字は表の外を指すようにしておき，最小半径に置き換える．
+        in_table = (-z_arr >= 0) & (-z_arr / self._approx_resolution < len(table))
+        index = np.where(in_table, -z_arr / self._approx_resolution, 0).astype(np.intp)
+        r = np.where(in_table, table[index], self._param.approx_min_radius)
+
+        r = np.where(self._param.approx_max_radius < r, self._param.approx_max_radius, r)
+        return np.where(r < self._param.approx_min_radius, self._param.approx_min_radius, r)
+
+    def get_approximate_max_leg_raudus_table(
+        self,
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        脚の最大半径の表を返す．範囲外の値の置き換えや，最小・最大半径による制限は行わない．
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.float64], NDArray[np.float64]]
+            z座標の配列 [mm]，0から approx_resolution 刻みで負の方向に並ぶ．\n
+            脚がx方向に脚を伸ばせる最大半径の配列 [mm]，脚がとどかないzでは0．
+        """
+
+        table = self._approximate_max_leg_raudus
+        z = -np.arange(len(table), dtype=np.float64) * self._approx_resolution
+        return z, table.copy()
+
     def get_leg_position_xz(
         self, theta2: float, theta3: float
     ) -> Tuple[bool, float, float]:
@@ -113,6 +183,134 @@ class HexapodLegRangeCalculator:
         ) + self._param.tibia_length * math.sin(theta2 + theta3)
         return (True, x, z)
 
+    def get_leg_position_xz_batch(
+        self, theta2: npt.ArrayLike, theta3: npt.ArrayLike
+    ) -> Tuple[
+        npt.NDArray[np.bool_], npt.NDArray[np.float64], npt.NDArray[np.float64]
+    ]:
+        """
+        get_leg_position_xz の配列版．関節の角度の配列から脚先の位置をまとめて計算する.
+
+        Parameters
+        ----------
+        theta2 : ArrayLike
+            第2関節の角度 [rad]
+        theta3 : ArrayLike
+            第3関節の角度 [rad]
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.bool_], NDArray[np.float64], NDArray[np.float64]]
+            間接の可動範囲外の要素がfalseとなる配列,形状はtheta2,theta3をブロードキャストしたもの.\n
+            脚先のx座標[mm],z座標[mm]の配列.可動範囲外の要素は0.
+        """
+
+        theta2_arr, theta3_arr = np.broadcast_arrays(
+            np.asarray(theta2, dtype=np.float64), np.asarray(theta3, dtype=np.float64)
+        )
+        is_in_range = self.is_theta2_in_range_batch(theta2_arr) & self.is_theta3_in_range_batch(
+            theta3_arr
+        )
+
+        # 脚の位置を計算する
+        x = (
+            self._param.coxa_length
+            + self._param.femur_length * np.cos(theta2_arr)
+            + self._param.tibia_length * np.cos(theta2_arr + theta3_arr)
+        )
+        z = self._param.femur_length * np.sin(
+            theta2_arr
+        ) + self._param.tibia_length * np.sin(theta2_arr + theta3_arr)
+
+        return is_in_range, np.where(is_in_range, x, 0.0), np.where(is_in_range, z, 0.0)
+
+    def calc_range_of_motion_boundary(
+        self,
+        theta2_min: float,
+        theta2_max: float,
+        theta3_min: float,
+        theta3_max: float,
+        *,
+        step: float = 0.001,
+        tolerance: Optional[float] = None,
+    ) -> List[Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]:
+        """
+        関節の角度の範囲から，脚先の可動範囲の境界線を計算する．\n
+        1つの間接を最小値・最大値に固定して，もう一つの間接を最小値から最大値まで動かした4本の線を返す．\n
+        4本の線は1度の順運動学の計算でまとめて求める．
+
+        Parameters
+        ----------
+        theta2_min : float
+            theta2の最小値 [rad]
+        theta2_max : float
+            theta2の最大値 [rad]
+        theta3_min : float
+            theta3の最小値 [rad]
+        theta3_max : float
+            theta3の最大値 [rad]
+        step : float
+            tolerance が None の場合の，角度の刻み幅 [rad]
+        tolerance : Optional[float]
+            境界線を折れ線で近似したときに許す誤差 [mm]．
+            指定した場合は，各線の曲率半径から誤差が tolerance 以下になる最小の点数で標本化する．
+
+        Returns
+        -------
+        res : List[Tuple[NDArray[np.float64], NDArray[np.float64]]]
+            (x座標の配列[mm], z座標の配列[mm]) のリスト．
+            femur(min~max)・tibia(min), femur(min~max)・tibia(max),
+            femur(min)・tibia(min~max), femur(max)・tibia(min~max) の順．
+            関節の可動範囲外の点は含まれない．
+        """
+
+        if step <= 0:
+            raise ValueError(f"{__name__}: step must be greater than 0")
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError(f"{__name__}: tolerance must be greater than 0")
+
+        lf = self._param.femur_length
+        lt = self._param.tibia_length
+
+        # femur を回すときの曲率半径は femur の付け根から脚先まで，tibia を回すときは tibia の長さ．
+        radius_min = math.hypot(lf + lt * math.cos(theta3_min), lt * math.sin(theta3_min))
+        radius_max = math.hypot(lf + lt * math.cos(theta3_max), lt * math.sin(theta3_max))
+
+        femur_range_min = self._make_sample_angles(
+            theta2_min, theta2_max, radius_min, step, tolerance
+        )
+        femur_range_max = self._make_sample_angles(
+            theta2_min, theta2_max, radius_max, step, tolerance
+        )
+        tibia_range = self._make_sample_angles(theta3_min, theta3_max, lt, step, tolerance)
+
+        theta2_list = [
+            femur_range_min,
+            femur_range_max,
+            np.full_like(tibia_range, theta2_min),
+            np.full_like(tibia_range, theta2_max),
+        ]
+        theta3_list = [
+            np.full_like(femur_range_min, theta3_min),
+            np.full_like(femur_range_max, theta3_max),
+            tibia_range,
+            tibia_range,
+        ]
+
+        is_in_range, x, z = self.get_leg_position_xz_batch(
+            np.concatenate(theta2_list), np.concatenate(theta3_list)
+        )
+
+        # 4本の線に分割する．
+        boundary: List[Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]] = []
+        sections = np.cumsum([len(t) for t in theta2_list])[:-1]
+        for mask, line_x, line_z in zip(
+            np.split(is_in_range, sections), np.split(x, sections), np.split(z, sections)
+        ):
+            boundary.append((line_x[mask], line_z[mask]))
+
+        return boundary
+
     def calc_inverse_kinematics_xz(
         self, x: float, z: float, reverse_flag: bool = False
     ) -> Tuple[bool, List[List[float]], List[float]]:
@@ -253,8 +451,188 @@ class HexapodLegRangeCalculator:
         angle[2] = clamp_angle(angle[2])  # -180度～180度に収める．
         return True, joint_pos, angle
 
+    def calc_inverse_kinematics_xz_batch(
+        self,
+        x: npt.ArrayLike,
+        z: npt.ArrayLike,
+        reverse_flag: npt.ArrayLike = False,
+    ) -> Tuple[
+        npt.NDArray[np.bool_], npt.NDArray[np.float64], npt.NDArray[np.float64]
+    ]:
+        """
+        calc_inverse_kinematics_xz の配列版．任意の形状の配列について逆運動学をまとめて計算する．\n
+        脚がとどかない点では calc_inverse_kinematics_xz と同様に，
+        脚をまっすぐ伸ばした2つの候補のうち近い方を選ぶ．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+        reverse_flag : ArrayLike
+            逆運動学解は2つあるが、どちらを選択するかを決めるフラグ.Trueにすると脚先が上を向く.\n
+            x, z とブロードキャスト可能な配列を渡すと，要素ごとに選択できる．
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.bool_], NDArray[np.float64], NDArray[np.float64]]
+            脚がとどかず計算できなければfalseとなる配列,形状はx,zをブロードキャストしたもの(以下S)．\n
+            脚の関節の座標の配列,形状は(2, 4, *S).
+            [0]がx[mm],[1]がz[mm]で,coxa(付け根),femur,tibia,脚先の順．\n
+            脚の関節の角度の配列,形状は(3, *S).coxa(今回は0で固定),femur,tibiaの順 [rad]\n
+        """
+        x_arr, z_arr, reverse_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64),
+            np.asarray(z, dtype=np.float64),
+            np.asarray(reverse_flag, dtype=np.bool_),
+        )
+        shape = x_arr.shape
+
+        coxa = self._param.coxa_length
+        femur = self._param.femur_length
+        tibia = self._param.tibia_length
+
+        joint_pos = np.empty((2, 4) + shape, dtype=np.float64)
+        angle = np.empty((3,) + shape, dtype=np.float64)
+
+        # 脚の付け根と第1関節．
+        joint_pos[0][0] = 0.0
+        joint_pos[1][0] = 0.0
+        joint_pos[0][1] = coxa
+        joint_pos[1][1] = 0.0
+        angle[0] = 0.0
+
+        true_x = x_arr - coxa
+        coxa_to_leg_end = np.sqrt(np.square(true_x) + np.square(z_arr))
+        q1 = np.arctan2(z_arr, true_x)
+
+        # 長さが足りない点を判定する．
+        is_success = TriangleChecker().check_batch(tibia, femur, coxa_to_leg_end)
+
+        # 第2関節．計算できない点の値は後で上書きするので，警告は抑制する．
+        with np.errstate(divide="ignore", invalid="ignore"):
+            q2_upper = (
+                np.square(femur) + np.square(coxa_to_leg_end) - np.square(tibia)
+            )
+            q2_lower = 2.0 * femur * coxa_to_leg_end
+            q2 = np.arccos(np.clip(q2_upper / q2_lower, -1.0, 1.0))
+        q2 = np.where(reverse_arr, -q2, q2)
+        angle_f = clamp_angle_array(np.where(is_success, q1 + q2, 0.0))
+
+        femur_x = femur * np.cos(angle_f) + coxa
+        femur_z = femur * np.sin(angle_f)
+
+        # 第3関節．
+        angle_t = clamp_angle_array(
+            np.where(
+                is_success,
+                np.arctan2(z_arr - femur_z, x_arr - femur_x) - angle_f,
+                0.0,
+            )
+        )
+
+        # 脚がとどかない点は，脚を伸ばした2つの候補のうち近い方を選ぶ．
+        if not is_success.all():
+            angle_ft = q1
+            angle_ft_phase = angle_ft + math.pi  # 180度位相をずらす．
+            angle_ft_phase = np.where(
+                angle_ft_phase > math.pi * 2.0,
+                angle_ft_phase - math.pi * 2.0,
+                angle_ft_phase,
+            )
+
+            # 候補点を計算．
+            candidate_x = coxa + (femur + tibia) * np.cos(angle_ft)
+            candidate_z = (femur + tibia) * np.sin(angle_ft)
+            candidate_x_phase = (
+                coxa + femur * np.cos(angle_ft_phase) + tibia * np.cos(angle_ft)
+            )
+            candidate_z_phase = (
+                femur * np.sin(angle_ft_phase) + tibia * np.sin(angle_ft)
+            )
+
+            # 候補点との距離を計算し，近い方を選択．
+            distance = np.sqrt(
+                np.square(candidate_x - x_arr) + np.square(candidate_z - z_arr)
+            )
+            distance_phase = np.sqrt(
+                np.square(candidate_x_phase - x_arr)
+                + np.square(candidate_z_phase - z_arr)
+            )
+            use_phase = distance > distance_phase
+            fallback_f = np.where(use_phase, angle_ft_phase, angle_ft)
+            fallback_t = np.where(use_phase, -math.pi, 0.0)
+
+            fail = ~is_success
+            angle_f = np.where(fail, fallback_f, angle_f)
+            angle_t = np.where(fail, fallback_t, angle_t)
+            femur_x = np.where(fail, coxa + femur * np.cos(angle_f), femur_x)
+            femur_z = np.where(fail, femur * np.sin(angle_f), femur_z)
+            leg_end_x = np.where(
+                fail, femur_x + tibia * np.cos(angle_f + angle_t), x_arr
+            )
+            leg_end_z = np.where(
+                fail, femur_z + tibia * np.sin(angle_f + angle_t), z_arr
+            )
+        else:
+            leg_end_x = x_arr
+            leg_end_z = z_arr
+
+        joint_pos[0][2] = femur_x
+        joint_pos[1][2] = femur_z
+        joint_pos[0][3] = leg_end_x
+        joint_pos[1][3] = leg_end_z
+        angle[1] = angle_f
+        angle[2] = angle_t
+
+        return is_success, joint_pos, angle
+
+    def calc_reachable_inverse_kinematics_xz_batch(
+        self, x: npt.ArrayLike, z: npt.ArrayLike
+    ) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.float64]]:
+        """
+        関節の可動範囲内に収まる逆運動学解を配列でまとめて求める．\n
+        まず通常の解を求め，計算できないか可動範囲外であれば，もう一つの解を求める．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.bool_], NDArray[np.float64]]
+            どちらかの解が可動範囲内に収まる要素がTrueの配列,形状はx,zをブロードキャストしたもの(以下S)．\n
+            脚の関節の角度の配列,形状は(3, *S).coxa(今回は0で固定),femur,tibiaの順 [rad]\n
+            どちらの解も可動範囲外の要素には，通常の解の角度が入る．
+        """
+
+        is_success, _, angle = self.calc_inverse_kinematics_xz_batch(x, z)
+        is_reachable = (
+            is_success
+            & self.is_theta2_in_range_batch(angle[1])
+            & self.is_theta3_in_range_batch(angle[2])
+        )
+
+        # もう一つの逆運動学解は，必要な場合にだけ使う．
+        if not is_reachable.all():
+            is_success_rev, _, angle_rev = self.calc_inverse_kinematics_xz_batch(x, z, True)
+            is_reachable_rev = (
+                ~is_reachable
+                & is_success_rev
+                & self.is_theta2_in_range_batch(angle_rev[1])
+                & self.is_theta3_in_range_batch(angle_rev[2])
+            )
+            angle = np.where(is_reachable_rev, angle_rev, angle)
+            is_reachable = is_reachable | is_reachable_rev
+
+        return is_reachable, angle
+
     def calc_inverse_kinematics_xz_arduino(
-        self, x: float, z: float
+        self, x: float, z: float, *, servo_param: ArduinoServoParam = ArduinoServoParam()
     ) -> Tuple[List[float], List[int], List[int], List[int]]:
         """
         coxa jointが回転していない場合の逆運動学を計算する.
@@ -267,6 +645,8 @@ class HexapodLegRangeCalculator:
             脚の付け根から見た脚先のx座標 [mm]
         z : float
             脚の付け根から見た脚先のz座標 [mm]
+        servo_param : ArduinoServoParam
+            関節の角度をサーボ角に変換するためのパラメータ．
 
         Returns
         -------
@@ -309,23 +689,93 @@ class HexapodLegRangeCalculator:
             angle.append(0.0)
 
         # サーボの角度に変換.
+        scale = servo_param.tick_scale
+        divisor = servo_param.tick_divisor
         servo_angle: List[int] = []
-        servo_angle.append((int)(angle[0] * 100.0 / 51.0 * 100.0))
-        servo_angle.append((int)(angle[1] * 100.0 / 51.0 * 100.0))
-        servo_angle.append((int)(angle[2] * 100.0 / 51.0 * 100.0))
+        servo_angle.append((int)(angle[0] * scale / divisor * scale))
+        servo_angle.append((int)(angle[1] * scale / divisor * scale))
+        servo_angle.append((int)(angle[2] * scale / divisor * scale))
 
         left_servo_angle: List[int] = []
-        left_servo_angle.append(512 - servo_angle[0])
-        left_servo_angle.append(500 - servo_angle[1])
-        left_servo_angle.append(670 - servo_angle[2])
+        left_servo_angle.append(servo_param.left_offset[0] - servo_angle[0])
+        left_servo_angle.append(servo_param.left_offset[1] - servo_angle[1])
+        left_servo_angle.append(servo_param.left_offset[2] - servo_angle[2])
 
         right_servo_angle: List[int] = []
-        right_servo_angle.append(512 + servo_angle[0])
-        right_servo_angle.append(524 + servo_angle[1])
-        right_servo_angle.append(354 + servo_angle[2])
+        right_servo_angle.append(servo_param.right_offset[0] + servo_angle[0])
+        right_servo_angle.append(servo_param.right_offset[1] + servo_angle[1])
+        right_servo_angle.append(servo_param.right_offset[2] + servo_angle[2])
 
         return angle, servo_angle, left_servo_angle, right_servo_angle
 
+    def calc_inverse_kinematics_xz_arduino_batch(
+        self,
+        x: npt.ArrayLike,
+        z: npt.ArrayLike,
+        *,
+        servo_param: ArduinoServoParam = ArduinoServoParam(),
+    ) -> Tuple[
+        npt.NDArray[np.float64],
+        npt.NDArray[np.int16],
+        npt.NDArray[np.int16],
+        npt.NDArray[np.int16],
+    ]:
+        """
+        calc_inverse_kinematics_xz_arduino の配列版．任意の形状の配列についてまとめて計算する．\n
+        計算できない点や，脚の付け根と脚先が重なる点の角度は0とする．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+        servo_param : ArduinoServoParam
+            関節の角度をサーボ角に変換するためのパラメータ．
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.float64], NDArray[np.int16], NDArray[np.int16], NDArray[np.int16]]
+            関節の角度の配列,形状は(3, *S).coxa,femur,tibiaの順 [rad]．Sはx,zをブロードキャストした形状．\n
+            サーボ角の配列,形状は(3, *S)\n
+            左足のサーボ角の配列,形状は(3, *S)\n
+            右足のサーボ角の配列,形状は(3, *S)\n
+        """
+        x_arr, z_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        )
+        lf = self._param.femur_length
+        lt = self._param.tibia_length
+
+        true_x = x_arr - self._param.coxa_length
+        im = np.sqrt(true_x ** 2 + z_arr ** 2)  # im = imaginary leg.
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # femur 間接の角度の計算.
+            q1 = -np.arctan2(z_arr, true_x)
+            ratio = (lf ** 2 - lt ** 2 + im ** 2) / (2 * lf * im)
+            q2 = np.where(np.abs(ratio) <= 1.0, np.arccos(np.clip(ratio, -1.0, 1.0)), 0.0)
+
+            # tibia 間接の角度を計算.
+            ratio = (lf ** 2 - im ** 2 + lt ** 2) / (2 * lt * lf)
+            q3 = np.where(
+                np.abs(ratio) <= 1.0, np.arccos(np.clip(ratio, -1.0, 1.0)) - math.pi / 2, 0.0
+            )
+
+        angle = np.stack([np.zeros_like(x_arr), q1 + q2, q3])
+
+        # サーボの角度に変換．int と同じく0に向かって切り捨てる．
+        scale = servo_param.tick_scale
+        servo = np.trunc(angle * scale / servo_param.tick_divisor * scale).astype(np.int16)
+
+        offset_shape = (3,) + (1,) * x_arr.ndim
+        left_offset = np.reshape(np.asarray(servo_param.left_offset, dtype=np.int16), offset_shape)
+        right_offset = np.reshape(
+            np.asarray(servo_param.right_offset, dtype=np.int16), offset_shape
+        )
+
+        return angle, servo, left_offset - servo, right_offset + servo
+
     def is_theta1_in_range(self, theta1: float) -> bool:
         """
         第1関節の角度が範囲内かを判定する.
@@ -353,59 +803,138 @@ class HexapodLegRangeCalculator:
             return False
         return True
 
-    def _init_approximate_max_leg_raudus(self) -> None:
+    def is_theta1_in_range_batch(self, theta1: npt.ArrayLike) -> npt.NDArray[np.bool_]:
         """
-        脚の最大半径を計算する.
+        is_theta1_in_range の配列版．第1関節の角度が範囲内かを要素ごとに判定する.
         """
 
-        # 近似された脚の可動範囲の最大半径のリスト，z軸の座標軸の取り方が逆なので，zを反転させる．
-        self._approximate_max_leg_raudus: List[float] = []
+        theta1_arr = np.asarray(theta1, dtype=np.float64)
+        return ~((theta1_arr < self._param.theta1_min) | (theta1_arr > self._param.theta1_max))
 
-        z_min = 0
-        z_max = int(self._param.femur_length + self._param.tibia_length)
-        x_min = int(self._param.coxa_length)
-        x_max = int(
-            self._param.coxa_length
-            + self._param.femur_length
-            + self._param.tibia_length
+    def is_theta2_in_range_batch(self, theta2: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+        """
+        is_theta2_in_range の配列版．第2関節の角度が範囲内かを要素ごとに判定する.
+        """
+
+        theta2_arr = np.asarray(theta2, dtype=np.float64)
+        return ~((theta2_arr < self._param.theta2_min) | (theta2_arr > self._param.theta2_max))
+
+    def is_theta3_in_range_batch(self, theta3: npt.ArrayLike) -> npt.NDArray[np.bool_]:
+        """
+        is_theta3_in_range の配列版．第3関節の角度が範囲内かを要素ごとに判定する.
+        """
+
+        theta3_arr = np.asarray(theta3, dtype=np.float64)
+        return ~((theta3_arr < self._param.theta3_min) | (theta3_arr > self._param.theta3_max))
+
+    @staticmethod
+    def _make_sample_angles(
+        angle_min: float,
+        angle_max: float,
+        radius: float,
+        step: float,
+        tolerance: Optional[float],
+    ) -> npt.NDArray[np.float64]:
+        """
+        境界線を描くための角度の配列を作成する．\n
+        tolerance が None の場合は step 刻み(最大値を含まない)．
+        指定した場合は，半径 radius の円弧を折れ線で近似した誤差が tolerance 以下になるよう等分する(両端を含む)．
+        """
+
+        if tolerance is None:
+            return np.arange(angle_min, angle_max, step)
+
+        if angle_max <= angle_min:
+            return np.empty(0, dtype=np.float64)
+
+        # 弦と円弧の距離 radius * (1 - cos(d/2)) が tolerance 以下となる角度の刻み幅 d．
+        if radius <= tolerance:
+            max_step = angle_max - angle_min
+        else:
+            max_step = 2.0 * math.acos(1.0 - tolerance / radius)
+
+        num = max(int(math.ceil((angle_max - angle_min) / max_step)), 1)
+        return np.linspace(angle_min, angle_max, num + 1)
+
+    def _init_approximate_max_leg_raudus(self, cache: Optional["DiskCache"]) -> None:
+        """
+        脚の最大半径を計算する．キャッシュがあれば読み込む.
+        """
+
+        # 近似された脚の可動範囲の最大半径の配列，z軸の座標軸の取り方が逆なので，zを反転させる．
+        self._approximate_max_leg_raudus: npt.NDArray[np.float64]
+
+        if cache is None:
+            self._approximate_max_leg_raudus = self._calc_approximate_max_leg_raudus()
+            return
+
+        self._approximate_max_leg_raudus = np.array(
+            cache.load_or_compute(
+                "approx_max_leg_radius",
+                self._param,
+                {"approx_resolution": self._approx_resolution},
+                self._calc_approximate_max_leg_raudus,
+            ),
+            dtype=np.float64,
         )
 
-        # 全て0で初期化．
-        for z in range(z_min, z_max):
-            self._approximate_max_leg_raudus.append(0.0)
-
-        # 脚の最大半径を計算する．
-        for z in range(z_min, z_max):
-            for x in range(x_min, x_max):
-                line_end_x = (float)(x)
-                line_end_y = 0
-                line_end_z = (float)(z)
-
-                ik_true_x = (
-                    math.sqrt(math.pow(line_end_x, 2.0) + math.pow(line_end_y, 2.0))
-                    - self._param.coxa_length
-                )
-                im = math.sqrt(math.pow(ik_true_x, 2.0) + math.pow(line_end_z, 2.0))
-                if im == 0:
-                    im += 0.0000001  # 少しだけ値を大きくし，0除算を避ける.
-
-                # q1 = -math.atan2(line_end_z, ik_true_x)
-                q2_upper = (
-                    math.pow(self._param.femur_length, 2.0)
-                    + math.pow(im, 2.0)
-                    - math.pow(self._param.tibia_length, 2.0)
-                )
-                q2_lower = 2.0 * self._param.femur_length * im
-                q2_theta = q2_upper / q2_lower
-
-                if (q2_theta < -1.0) or (q2_theta > 1.0):
-                    if self._debug_flag:
-                        print(f"[error] :{__name__}, {q2_theta =}, {x =}, {z =}")
-                    continue
-
-                # q2 = math.acos(q2_theta)
-
-                r_margin = 1.0
-                self._approximate_max_leg_raudus[z] = (float)(x) - r_margin
-
-        return
+    def _calc_approximate_max_leg_raudus(self) -> npt.NDArray[np.float64]:
+        """
+        脚の最大半径の表を計算する.
+
+        各z座標について，approx_resolution 刻みで並べたxのうち逆運動学解が存在する最大のものを求める．
+        ただし全探索は行わず，到達できる最大の円 (x - coxa)^2 + z^2 = (femur + tibia)^2 から
+        境界付近の候補を解析的に求め，その候補のみを全探索と同じ式で判定する．
+        """
+
+        res = self._approx_resolution
+        coxa = self._param.coxa_length
+        femur = self._param.femur_length
+        tibia = self._param.tibia_length
+
+        z_num = int((femur + tibia) / res)
+        x_index_min = int(coxa / res)
+        x_index_max = int((coxa + femur + tibia) / res)
+
+        # 脚がとどかないzは0とする．
+        if z_num <= 0 or x_index_max <= x_index_min:
+            return np.zeros(max(z_num, 0), dtype=np.float64)
+
+        z = np.arange(z_num, dtype=np.float64)[:, np.newaxis] * res
+
+        # 脚を伸ばしきったときの円とz座標の交点から，境界付近のxの添字を求める．
+        x_edge = coxa + np.sqrt(np.maximum((femur + tibia) ** 2 - np.square(z), 0.0))
+        index_edge = np.floor(x_edge / res).astype(np.int64)
+
+        # 境界の前後と，付け根側の端(coxaが刻み幅の倍数でない場合に特殊になる)を候補とする．
+        candidate = np.clip(
+            np.concatenate(
+                [
+                    np.full_like(index_edge, x_index_min),
+                    index_edge - 1,
+                    index_edge,
+                    index_edge + 1,
+                ],
+                axis=1,
+            ),
+            x_index_min,
+            x_index_max - 1,
+        )
+
+        # 全探索と同じ式で，候補点に逆運動学解が存在するかを判定する．
+        x = candidate * res
+        ik_true_x = np.sqrt(np.square(x)) - coxa
+        im = np.sqrt(np.square(ik_true_x) + np.square(z))
+        im = np.where(im == 0, im + 0.0000001, im)  # 少しだけ値を大きくし，0除算を避ける.
+
+        q2_upper = femur**2 + np.square(im) - tibia**2
+        q2_lower = 2.0 * femur * im
+        q2_theta = q2_upper / q2_lower
+        is_valid = (q2_theta >= -1.0) & (q2_theta <= 1.0)
+
+        if self._debug_flag:
+            print(f"[debug] :{__name__}, unreachable z count = {(~is_valid.any(axis=1)).sum()}")
+
+        r_margin = 1.0
+        index_max = np.where(is_valid, candidate, -1).max(axis=1)
+        return np.where(index_max >= 0, index_max * res - r_margin, 0.0)
@@ -6,7 +6,7 @@ hexapod_param_protocol.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
-from typing import Protocol
+from typing import Hashable, Protocol, Tuple
 
 
 class HexapodParamProtocol(Protocol):
@@ -26,3 +26,39 @@ class HexapodParamProtocol(Protocol):
     torque_max: float
     approx_min_radius: float
     approx_max_radius: float
+
+
+HexapodParamKey = Tuple[Tuple[str, Hashable], ...]
+
+
+def make_hexapod_param_key(hexapod_param: HexapodParamProtocol) -> HexapodParamKey:
+    """
+    パラメータの値からキャッシュのキーを作成する．
+    インスタンスの同一性ではなく値で比較するため，値が同じなら別のインスタンスでも同じキーになる．
+
+    Parameters
+    ----------
+    hexapod_param : HexapodParamProtocol
+        パラメータを格納するためのインスタンス．
+
+    Returns
+    -------
+    key : Tuple[Tuple[str, Hashable], ...]
+        (フィールド名, 値) のタプル．フィールド名の順に並ぶ．
+    """
+
+    # プロトコルを拡張したクラスのフィールドも含める．
+    names = set(HexapodParamProtocol.__annotations__)
+    for cls in type(hexapod_param).__mro__:
+        names.update(getattr(cls, "__annotations__", {}))
+
+    items = []
+    for name in sorted(names):
+        if not hasattr(hexapod_param, name):
+            continue
+        value = getattr(hexapod_param, name)
+        if isinstance(value, list):
+            value = tuple(value)  # type: ignore
+        items.append((name, value))
+
+    return tuple(items)
@@ -0,0 +1,445 @@
+"""
+ik_lookup_table.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ..math.clamp_angle import clamp_angle_array
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+
+
+def _format_c_float(value: float) -> str:
+    """
+    値を C言語の float のリテラルとして書く．\n
+    整数の値でも "0f" のような不正なリテラルにならないように，小数点か指数を必ず付ける．
+    """
+    text = f"{float(value):.9g}"
+    if "." not in text and "e" not in text:
+        text += ".0"
+    return f"{text}f"
+
+
+class IkLookupTable:
+    """
+    逆運動学の計算結果を格子点ごとに保存し，双線形補間で求めるクラス.\n
+    2つの逆運動学解の角度と，脚がとどくかどうか(逆運動学解が得られ，関節が可動範囲内に収まるか)を格子点ごとに持つ．
+    問い合わせでは acos や atan2 を使わず，周りの4つの格子点から O(1) で角度を求める．
+    4つの格子点のどれかに脚がとどかない場合は，計算できないものとして扱う．\n
+    脚を伸ばし切る点や折りたたみ切る点の近くでは角度が急に変化するため，補間の誤差は可動範囲の境界付近で大きくなる．
+    """
+
+    def __init__(
+        self,
+        angle: npt.NDArray[np.float64],
+        success: npt.NDArray[np.bool_],
+        *,
+        origin: Tuple[float, float],
+        resolution: float,
+    ) -> None:
+        """
+        通常は build か load で作成する．
+
+        Parameters
+        ----------
+        angle : NDArray[np.float64]
+            格子点ごとの関節の角度，形状は(2, 2, nz, nx)．[解, 関節(femur, tibia), z, x] [rad]
+        success : NDArray[np.bool_]
+            格子点ごとに脚がとどくかどうか，形状は(2, nz, nx)．[解, z, x]．
+            逆運動学解が得られ，femur と tibia の関節が可動範囲内に収まる点を True とする．
+        origin : Tuple[float, float]
+            格子点 [z=0, x=0] の座標 (x, z) [mm]
+        resolution : float
+            格子点の間隔 [mm]
+        """
+        angle = np.asarray(angle, dtype=np.float64)
+        success = np.asarray(success, dtype=np.bool_)
+
+        if angle.ndim != 4 or angle.shape[:2] != (2, 2) or angle.shape[2] < 2 or angle.shape[3] < 2:
+            raise ValueError(f"{__name__}: angle must be a (2, 2, nz, nx) array, nz, nx >= 2")
+        if success.shape != (2,) + angle.shape[2:]:
+            raise ValueError(f"{__name__}: success must be a (2, nz, nx) array")
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+
+        self._angle = angle
+        self._success = success
+        self._origin = (float(origin[0]), float(origin[1]))
+        self._resolution = float(resolution)
+
+        # 補間の誤差の推定値．初めて使われたときに計算する．
+        self._max_error: Optional[float] = None
+        self._calc: Optional[HexapodLegRangeCalculator] = None
+
+    @classmethod
+    def build(
+        cls,
+        hexapod_leg_range_calc: HexapodLegRangeCalculator,
+        *,
+        rect: Tuple[float, float, float, float] = (-100.0, 300.0, -200.0, 200.0),
+        resolution: float = 1.0,
+    ) -> "IkLookupTable":
+        """
+        範囲内の格子点について逆運動学を計算し，テーブルを作成する．
+
+        Parameters
+        ----------
+        hexapod_leg_range_calc : HexapodLegRangeCalculator
+            脚の可動範囲を計算するためのインスタンス．
+        rect : Tuple[float, float, float, float]
+            テーブルの範囲 (x_min, x_max, z_min, z_max) [mm]．
+            最大値は格子点の間隔に合わせて切り上げる．
+        resolution : float
+            格子点の間隔 [mm]
+
+        Returns
+        -------
+        table : IkLookupTable
+            作成したテーブル．
+        """
+
+        x_min, x_max, z_min, z_max = rect
+        if x_min >= x_max or z_min >= z_max:
+            raise ValueError(f"{__name__}: rect must be (x_min, x_max, z_min, z_max)")
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+
+        nx = int(np.ceil((x_max - x_min) / resolution - 1e-9)) + 1
+        nz = int(np.ceil((z_max - z_min) / resolution - 1e-9)) + 1
+        x = x_min + resolution * np.arange(nx)
+        z = z_min + resolution * np.arange(nz)
+        x_grid, z_grid = np.meshgrid(x, z)
+
+        angle = np.empty((2, 2, nz, nx), dtype=np.float64)
+        success = np.empty((2, nz, nx), dtype=np.bool_)
+
+        # calc_reachable_inverse_kinematics_xz_batch と同じく，関節が可動範囲内に収まる点だけをとどく点とする．
+        for branch, reverse in enumerate((False, True)):
+            ok, _, branch_angle = hexapod_leg_range_calc.calc_inverse_kinematics_xz_batch(
+                x_grid, z_grid, reverse
+            )
+            angle[branch] = branch_angle[1:]
+            success[branch] = (
+                ok
+                & hexapod_leg_range_calc.is_theta2_in_range_batch(branch_angle[1])
+                & hexapod_leg_range_calc.is_theta3_in_range_batch(branch_angle[2])
+            )
+
+        table = cls(angle, success, origin=(x_min, z_min), resolution=resolution)
+        table._calc = hexapod_leg_range_calc
+        return table
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """格子点の数 (nz, nx)"""
+        return (self._angle.shape[2], self._angle.shape[3])
+
+    @property
+    def resolution(self) -> float:
+        """格子点の間隔 [mm]"""
+        return self._resolution
+
+    @property
+    def rect(self) -> Tuple[float, float, float, float]:
+        """テーブルの範囲 (x_min, x_max, z_min, z_max) [mm]"""
+        nz, nx = self.shape
+        x_min, z_min = self._origin
+        return (
+            x_min,
+            x_min + self._resolution * (nx - 1),
+            z_min,
+            z_min + self._resolution * (nz - 1),
+        )
+
+    def query(
+        self, x: npt.ArrayLike, z: npt.ArrayLike, reverse_flag: npt.ArrayLike = False
+    ) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.float64]]:
+        """
+        脚先の座標から，関節の角度を双線形補間で求める．
+        calc_inverse_kinematics_xz_batch の代わりに使える．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+        reverse_flag : ArrayLike
+            逆運動学解は2つあるが、どちらを選択するかを決めるフラグ.Trueにすると脚先が上を向く.\n
+            x, z とブロードキャスト可能な配列を渡すと，要素ごとに選択できる．
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.bool_], NDArray[np.float64]]
+            テーブルの範囲外か，周りの格子点に脚がとどかない(関節が可動範囲外となる場合を含む)点が
+            Falseとなる配列，
+            形状はx,zをブロードキャストしたもの(以下S)．\n
+            脚の関節の角度の配列,形状は(3, *S).coxa(0で固定),femur,tibiaの順 [rad]．
+            Falseとなる点の角度は0．
+        """
+        x_arr, z_arr, reverse_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64),
+            np.asarray(z, dtype=np.float64),
+            np.asarray(reverse_flag, dtype=np.bool_),
+        )
+        nz, nx = self.shape
+
+        # 格子点の番号と，格子内での位置 [0, 1]．
+        fx = (x_arr - self._origin[0]) / self._resolution
+        fz = (z_arr - self._origin[1]) / self._resolution
+        inside = (fx >= 0.0) & (fx <= nx - 1) & (fz >= 0.0) & (fz <= nz - 1)
+
+        ix = np.clip(np.floor(np.nan_to_num(fx)), 0, nx - 2).astype(np.intp)
+        iz = np.clip(np.floor(np.nan_to_num(fz)), 0, nz - 2).astype(np.intp)
+        tx = np.clip(fx - ix, 0.0, 1.0)
+        tz = np.clip(fz - iz, 0.0, 1.0)
+        branch = reverse_arr.astype(np.intp)
+
+        success = inside.copy()
+        for dz in (0, 1):
+            for dx in (0, 1):
+                success &= self._success[branch, iz + dz, ix + dx]
+
+        # 角度が -π と π の境目をまたぐ場合に備えて，左下の格子点からの差を補間する．
+        base = self._angle[branch, :, iz, ix]
+        diff_x = clamp_angle_array(self._angle[branch, :, iz, ix + 1] - base)
+        diff_z = clamp_angle_array(self._angle[branch, :, iz + 1, ix] - base)
+        diff_xz = clamp_angle_array(self._angle[branch, :, iz + 1, ix + 1] - base)
+
+        # base などの形状は(*S, 2)なので，関節の軸を先頭に移す．
+        tx = tx[..., np.newaxis]
+        tz = tz[..., np.newaxis]
+        value = base + (1.0 - tz) * tx * diff_x + tz * (1.0 - tx) * diff_z + tz * tx * diff_xz
+        value = clamp_angle_array(np.moveaxis(value, -1, 0))
+
+        angle = np.zeros((3,) + x_arr.shape, dtype=np.float64)
+        angle[1:] = np.where(success, value, 0.0)
+
+        return success, angle
+
+    def estimate_max_error(
+        self,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+        *,
+        samples_per_cell: int = 16,
+    ) -> float:
+        """
+        補間した角度と，逆運動学で計算した角度の差の最大値を，標本点で比べて推定する．\n
+        誤差は脚を伸ばし切る点や折りたたみ切る点の近く，つまり脚がとどかない格子点の近くで大きく，
+        格子の中で急に変化する．そこで，とどかない格子点から2格子以内の格子は
+        1辺を samples_per_cell 等分した点で，それ以外の格子は中央と辺の中点で比べる．
+        標本点の間で誤差がさらに大きくなる可能性はあるため，真の最大値の上限ではない．
+        build で使ったインスタンスで計算した値は保存しておく．
+
+        Parameters
+        ----------
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            比べる逆運動学の計算に使うインスタンス．build で作ったテーブルの場合は省略できる．
+        samples_per_cell : int
+            境界付近の格子の1辺を何等分した点で比べるか．
+
+        Returns
+        -------
+        max_error : float
+            角度の差の最大値の推定値 [rad]．脚がとどく点がない場合は0．
+        """
+
+        if samples_per_cell < 2:
+            raise ValueError(f"{__name__}: samples_per_cell must be 2 or more")
+
+        calc = hexapod_leg_range_calc if hexapod_leg_range_calc is not None else self._calc
+        if calc is None:
+            raise ValueError(f"{__name__}: hexapod_leg_range_calc is required for a loaded table")
+
+        # build で使ったインスタンスの結果だけを保存する．
+        use_cache = calc is self._calc and samples_per_cell == 16
+        if use_cache and self._max_error is not None:
+            return self._max_error
+
+        nz, nx = self.shape
+        x_min, z_min = self._origin
+        max_error = 0.0
+
+        def compare(x: npt.NDArray[np.float64], z: npt.NDArray[np.float64], reverse: bool) -> None:
+            nonlocal max_error
+            success, angle = self.query(x, z, reverse)
+            ok, _, exact = calc.calc_inverse_kinematics_xz_batch(x, z, reverse)
+            valid = success & ok
+            if valid.any():
+                error = np.abs(clamp_angle_array(angle[1:] - exact[1:]))[:, valid]
+                max_error = max(max_error, float(error.max()))
+
+        # すべての格子の中央と辺の中点．
+        x_half = x_min + self._resolution * np.arange(0.0, nx - 0.5, 0.5)
+        z_half = z_min + self._resolution * np.arange(0.0, nz - 0.5, 0.5)
+        for offset_z, offset_x in ((1, 1), (0, 1), (1, 0)):
+            x_grid, z_grid = np.meshgrid(x_half[offset_x::2], z_half[offset_z::2])
+            for reverse in (False, True):
+                compare(x_grid, z_grid, reverse)
+
+        # とどかない格子点から2格子以内の格子は，細かく分けた点で比べる．
+        sub = np.arange(samples_per_cell + 1) / samples_per_cell
+        for branch, reverse in enumerate((False, True)):
+            near = np.pad(~self._success[branch], 2)
+            band = np.zeros((nz - 1, nx - 1), dtype=np.bool_)
+            for dz in range(6):
+                for dx in range(6):
+                    band |= near[dz:dz + nz - 1, dx:dx + nx - 1]
+
+            # 4隅のどれかにとどかない格子は，問い合わせても False になるので比べない．
+            success = self._success[branch]
+            band &= success[:-1, :-1] & success[:-1, 1:] & success[1:, :-1] & success[1:, 1:]
+            iz, ix = np.nonzero(band)
+
+            for start in range(0, iz.size, 4096):
+                cell_z = iz[start:start + 4096, np.newaxis, np.newaxis] + sub[:, np.newaxis]
+                cell_x = ix[start:start + 4096, np.newaxis, np.newaxis] + sub[np.newaxis, :]
+                compare(
+                    x_min + self._resolution * cell_x,
+                    z_min + self._resolution * cell_z,
+                    reverse,
+                )
+
+        if use_cache:
+            self._max_error = max_error
+        return max_error
+
+    def save(self, file_name: str) -> None:
+        """
+        テーブルを .npz ファイルとして保存する．
+
+        Parameters
+        ----------
+        file_name : str
+            保存するファイル名．
+        """
+
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        np.savez(
+            file_name,
+            angle=self._angle,
+            success=self._success,
+            origin=np.asarray(self._origin, dtype=np.float64),
+            resolution=np.asarray(self._resolution, dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, file_name: str) -> "IkLookupTable":
+        """
+        save で保存したテーブルを読み込む．
+
+        Parameters
+        ----------
+        file_name : str
+            読み込むファイル名．
+
+        Returns
+        -------
+        table : IkLookupTable
+            読み込んだテーブル．
+        """
+
+        with np.load(file_name) as data:
+            origin = data["origin"]
+            return cls(
+                data["angle"],
+                data["success"],
+                origin=(float(origin[0]), float(origin[1])),
+                resolution=float(data["resolution"]),
+            )
+
+    def to_c_header(self, name: str = "hexareach_ik_table") -> str:
+        """
+        ファームウェアに組み込むための，C言語のヘッダファイルの内容を返す．\n
+        角度は float の配列 name_angle[解][関節(femur, tibia)][z][x] [rad]，
+        脚がとどくかどうか(関節が可動範囲内に収まるか)は uint8_t の配列 name_success[解][z][x] として出力する．
+
+        Parameters
+        ----------
+        name : str
+            マクロと配列の名前の接頭辞．C言語の識別子として使える文字列であること．
+
+        Returns
+        -------
+        header : str
+            ヘッダファイルの内容．
+        """
+
+        if not name.isidentifier():
+            raise ValueError(f"{__name__}: name must be a valid C identifier")
+
+        if not np.all(np.isfinite(self._angle)):
+            raise ValueError(f"{__name__}: angle must be finite to write a C header")
+
+        nz, nx = self.shape
+        macro = name.upper()
+        guard = f"{macro}_H_"
+
+        lines: List[str] = [
+            f"// {name}: generated by hexareach.",
+            f"#ifndef {guard}",
+            f"#define {guard}",
+            "",
+            "#include <stdint.h>",
+            "",
+            f"#define {macro}_NX {nx}",
+            f"#define {macro}_NZ {nz}",
+            f"#define {macro}_X_MIN ({_format_c_float(self._origin[0])})  // [mm]",
+            f"#define {macro}_Z_MIN ({_format_c_float(self._origin[1])})  // [mm]",
+            f"#define {macro}_RESOLUTION ({_format_c_float(self._resolution)})  // [mm]",
+            "",
+            f"static const float {name}_angle[2][2][{macro}_NZ][{macro}_NX] = {{",
+        ]
+
+        for branch in range(2):
+            lines.append("  {")
+            for joint in range(2):
+                lines.append("    {")
+                for row in self._angle[branch, joint]:
+                    lines.append("      {" + ", ".join(_format_c_float(v) for v in row) + "},")
+                lines.append("    },")
+            lines.append("  },")
+        lines.append("};")
+        lines.append("")
+
+        lines.append(f"static const uint8_t {name}_success[2][{macro}_NZ][{macro}_NX] = {{")
+        for branch in range(2):
+            lines.append("  {")
+            for row in self._success[branch]:
+                lines.append("    {" + ", ".join(str(int(v)) for v in row) + "},")
+            lines.append("  },")
+        lines.append("};")
+        lines.append("")
+        lines.append(f"#endif  // {guard}")
+        lines.append("")
+
+        return "\n".join(lines)
+
+    def save_c_header(self, file_name: str, name: str = "hexareach_ik_table") -> None:
+        """
+        to_c_header の内容をファイルに保存する．
+
+        Parameters
+        ----------
+        file_name : str
+            保存するファイル名．
+        name : str
+            マクロと配列の名前の接頭辞．
+        """
+
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(file_name, "w", encoding="utf-8") as f:
+            f.write(self.to_c_header(name))
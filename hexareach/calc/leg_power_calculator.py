@@ -6,16 +6,61 @@ leg_power_calculator.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
-import math
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
-import tqdm
 
+from ..calc.calculator_registry import get_leg_range_calculator
+from ..calc.disk_cache import DiskCache, hash_array
 from ..calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
 from ..calc.hexapod_param_protocol import HexapodParamProtocol
 
+def make_leg_power_ranges(
+    rect: Tuple[float, float, float, float], step: float
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    力の分布を計算する x と z の座標の配列を作成する．\n
+    x_min から x_max + 1 の手前まで step ごとに並べるため，x_max, z_max も含む．
+    描画とコマンドラインで同じ格子を使うために，この関数で作成する．
+
+    Parameters
+    ----------
+    rect : Tuple[float, float, float, float]
+        範囲 (x_min, x_max, z_min, z_max) [mm]
+    step : float
+        格子の間隔 [mm]
+
+    Returns
+    -------
+    res : Tuple[NDArray[np.float64], NDArray[np.float64]]
+        x座標の配列と，z座標の配列 [mm]
+    """
+    x_range: npt.NDArray[np.float64] = np.arange(rect[0], rect[1] + 1, step)
+    z_range: npt.NDArray[np.float64] = np.arange(rect[2], rect[3] + 1, step)
+    return x_range, z_range
+
+
+def make_leg_power_cache_items(
+    x_range: npt.NDArray[np.float64],
+    z_range: npt.NDArray[np.float64],
+    power_x: float,
+    power_z: float,
+    quantize: bool,
+    max_power: float) -> Dict[str, Any]:
+    """
+    脚先の力の計算結果をキャッシュする際の，計算条件を表す辞書を作成する．
+    """
+    return {
+        "x_range": hash_array(x_range),
+        "z_range": hash_array(z_range),
+        "power_x": power_x,
+        "power_z": power_z,
+        "quantize": quantize,
+        "max_power": max_power,
+    }
+
+
 class LegPowerCalculator:
     """
     脚先が出すことができる力を計算するクラス.
@@ -23,138 +68,211 @@ class LegPowerCalculator:
 
     def __init__(
         self,
-        hexapod_leg_range_calc: HexapodLegRangeCalculator,
-        hexapod_param: HexapodParamProtocol):
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator],
+        hexapod_param: HexapodParamProtocol,
+        *,
+        max_power: float = 19.0,
+        cache: Optional[DiskCache] = None):
+        """
+        Parameters
+        ----------
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            脚の可動範囲を計算するためのインスタンス．
+            Noneの場合はパラメータの値ごとに共有されるものを使用する．
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        max_power : float
+            計算する力の倍率の上限．1刻みで探索していた従来の計算の上限(19倍)に合わせている．
+        cache : Optional[DiskCache]
+            計算結果を保存するキャッシュ．Noneの場合は保存しない．
+        """
+        if hexapod_leg_range_calc is None:
+            hexapod_leg_range_calc = get_leg_range_calculator(hexapod_param)
+
+        if max_power < 1:
+            raise ValueError(f"{__name__}: max_power is less than 1")
+
         self._calc = hexapod_leg_range_calc
         self._param = hexapod_param
+        self._max_power = max_power
+        self._cache = cache
+
 
+    @property
+    def max_power(self) -> float:
+        """計算する力の倍率の上限"""
+        return self._max_power
 
     def calculate(
         self,
-        x_range: npt.NDArray[np.float_],
-        z_range:npt.NDArray[np.float_]):
+        x_range: npt.NDArray[np.float64],
+        z_range: npt.NDArray[np.float64],
+        *,
+        power_x: float = 0.0,
+        power_z: float = 1.0,
+        quantize: bool = False) -> npt.NDArray[np.float64]:
         """
-        xとzの範囲内でロボットが出すことができる脚先の力を計算する.
+        xとzの範囲内でロボットが出すことができる脚先の力を計算する.\n
+        戻り値はx*zの要素数を持つ2次元配列(xが列，zが行)．
+
+        Parameters
+        ----------
+        x_range : NDArray[np.float64]
+            脚先のx座標の配列 [mm]
+        z_range : NDArray[np.float64]
+            脚先のz座標の配列 [mm]
+        power_x : float
+            x方向にかかる力.正規化されていること [N]
+        power_z : float
+            z方向にかかる力.正規化されていること [N]
+        quantize : bool
+            Trueの場合は，従来の計算と同じく1倍刻みの整数倍に切り捨てた値を返す．
         """
-        # x*zの要素数を持つ2次元配列power_arrayを作成する(xが列，zが行)
-        power_array = np.zeros((len(z_range), len(x_range)))
-        # power_arrayの各要素に,x,zの座標における脚がだせる最大の力を計算して代入する，
-        # 進捗表示のためにtqdmを使用する.必要なければ普通にrangeを使っても良い．
-        for i in tqdm.tqdm(range(len(x_range))):
-            for j in tqdm.tqdm(range(len(z_range)), leave=False):
+        x_range = np.asarray(x_range, dtype=np.float64)
+        z_range = np.asarray(z_range, dtype=np.float64)
+
+        def compute() -> npt.NDArray[np.float64]:
+            # j→i (z→x) の順で配列を参照することに注意．
+            x, z = np.meshgrid(x_range, z_range)
+            return self.calculate_points(
+                x, z, power_x=power_x, power_z=power_z, quantize=quantize
+            )
 
-                # j→i (z→x) の順で配列を参照することに注意．
-                power_array[j][i] = self._get_max_power(x_range[i], z_range[j], 0, 1)
+        if self._cache is None:
+            return compute()
 
-        return power_array
+        return self._cache.load_or_compute(
+            "leg_power",
+            self._param,
+            make_leg_power_cache_items(
+                x_range, z_range, power_x, power_z, quantize, self._max_power
+            ),
+            compute,
+        )
 
-    def _get_max_power(
-        self, x: float, z: float, power_x: float, power_z: float
-    ) -> float:
+    def calculate_points(
+        self,
+        x: npt.ArrayLike,
+        z: npt.ArrayLike,
+        *,
+        power_x: float = 0.0,
+        power_z: float = 1.0,
+        quantize: bool = False) -> npt.NDArray[np.float64]:
         """
-        x,zの座標における脚の力の最大値を返す
+        任意の形状の座標の配列について，脚先の力の最大値をまとめて計算する．\n
+        トルクは力に比例するため，倍率の最大値は torque_max / max(|J^T f|) で求まる．
 
         Parameters
         ----------
-        x : float
+        x : ArrayLike
             脚先のx座標 [mm]
-        z : float
+        z : ArrayLike
             脚先のz座標 [mm]
         power_x : float
             x方向にかかる力.正規化されていること [N]
         power_z : float
             z方向にかかる力.正規化されていること [N]
+        quantize : bool
+            Trueの場合は，従来の計算と同じく1倍刻みの整数倍に切り捨てた値を返す．
 
         Returns
         -------
-        ans : float
+        ans : NDArray[np.float64]
             引数で受け取った力を何倍したら，トルクが最大値を超えるか．\n倍率を返す．
+            逆運動学解が得られない点は0となる．
         """
 
         # 逆運動学解．間接の角度を求める
-        is_sucess, _, angle = self._calc.calc_inverse_kinematics_xz(x, z)
-
-        # 逆運動学解が得られなかった場合は終了する
-        if not is_sucess or (
-            is_sucess
-            and (
-                not self._calc.is_theta2_in_range(angle[1])
-                or not self._calc.is_theta3_in_range(angle[2])
+        is_reachable, angle = self._calc.calc_reachable_inverse_kinematics_xz_batch(x, z)
+
+        # ヤコビ行列を作成
+        jacobian = self._make_jacobian(angle[1], angle[2])
+
+        if quantize:
+            return self._calc_quantized_power(jacobian, is_reachable, power_x, power_z)
+
+        # 単位の力に対するトルクを計算する [tauqe_femur, tauqe_tibia]^T = J^T * F
+        femur_tauqe = np.abs(jacobian[0][0] * power_x + jacobian[1][0] * power_z)
+        tibia_tauqe = np.abs(jacobian[0][1] * power_x + jacobian[1][1] * power_z)
+        max_tauqe = np.maximum(femur_tauqe, tibia_tauqe)
+
+        # トルクが0の点はいくらでも力を出せるので上限値とする．
+        with np.errstate(divide="ignore"):
+            ans = np.where(
+                max_tauqe > 0.0, self._param.torque_max / max_tauqe, self._max_power
             )
-        ):
-
-            # もう一つの逆運動学解を求める
-            is_sucess, _, angle = self._calc.calc_inverse_kinematics_xz(x, z, True)
-
-            if not is_sucess or (
-                is_sucess
-                and (
-                    not self._calc.is_theta2_in_range(angle[1])
-                    or not self._calc.is_theta3_in_range(angle[2])
-                )
-            ):
-                return 0.0
-
-        ans = 0
-
-        # 逆運動学解が得られた場合は，トルクの計算をする
-        power_list = np.arange(1, 20, 1)  # 6から12までの0.5刻みのリスト
-        for p in power_list:
-
-            # ヤコビ行列を作成
-            jacobian = self._make_jacobian(angle[1], angle[2])
-
-            # 力のベクトルを作成 [F_x, F_z]^T
-            power = np.array([[float(power_x * p)], [float(power_z * p)]])
-
-            # トルクを計算する [tauqe_femur, tauqe_tibia]^T
-            tauqe = jacobian.T @ power  # t = J^T * F
-
-            # トルクの絶対値を計算する
-            femur_tauqe = math.fabs(tauqe[0][0])
-            tibia_tauqe = math.fabs(tauqe[1][0])
-
-            # トルクの最大値を超えていないか判定する．超えたら終了，超えていなければ記録して次のループへ．
-            if (
-                femur_tauqe < self._param.torque_max
-                and tibia_tauqe < self._param.torque_max
-            ):
-                ans = p
-            else:
+
+        return np.where(is_reachable, np.minimum(ans, self._max_power), 0.0)
+
+    def _calc_quantized_power(
+        self,
+        jacobian: npt.NDArray[np.float64],
+        is_reachable: npt.NDArray[np.bool_],
+        power_x: float,
+        power_z: float) -> npt.NDArray[np.float64]:
+        """
+        従来の計算と同じく，力の倍率を1から順に増やしてトルクの最大値を超えない最大の倍率を求める．
+        """
+
+        ans = np.zeros(is_reachable.shape, dtype=np.float64)
+        in_limit = is_reachable.copy()
+
+        for p in np.arange(1, int(self._max_power) + 1, 1):
+
+            # トルクを計算する [tauqe_femur, tauqe_tibia]^T = J^T * F
+            femur_tauqe = np.abs(
+                jacobian[0][0] * float(power_x * p) + jacobian[1][0] * float(power_z * p)
+            )
+            tibia_tauqe = np.abs(
+                jacobian[0][1] * float(power_x * p) + jacobian[1][1] * float(power_z * p)
+            )
+
+            # トルクの最大値を超えていないか判定する．一度超えた点はそれ以上記録しない．
+            in_limit &= (femur_tauqe < self._param.torque_max) & (
+                tibia_tauqe < self._param.torque_max
+            )
+            ans[in_limit] = p
+
+            if not in_limit.any():
                 break
 
-        return (float)(ans)
+        return ans
 
-    def _make_jacobian(self, theta2: float, theta3: float) -> np.ndarray[Any, Any]:
+    def _make_jacobian(
+        self, theta2: npt.ArrayLike, theta3: npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
         """
         ヤコビ行列を計算する．
 
         Parameters
         ----------
-        theta2 : float
+        theta2 : ArrayLike
             第2間接の角度 [rad]
-        theta3 : float
+        theta3 : ArrayLike
             第3間接の角度 [rad]
 
         Returns
         -------
         jacobian : np.ndarray
-            2*2のヤコビ行列．
+            2*2のヤコビ行列．角度に配列を渡した場合の形状は(2, 2, *S)．
         """
 
         lf = self._param.femur_length
         lt = self._param.tibia_length
 
+        theta2_arr = np.asarray(theta2, dtype=np.float64)
+        theta23 = theta2_arr + np.asarray(theta3, dtype=np.float64)
+
         # 2*2のヤコビ行列を作成
         jacobian = np.array(
             [
                 [
-                    -lf * math.sin(theta2) - lt * math.sin(theta2 + theta3),
-                    -lt * math.sin(theta2 + theta3),
+                    -lf * np.sin(theta2_arr) - lt * np.sin(theta23),
+                    -lt * np.sin(theta23),
                 ],
                 [
-                    lf * math.cos(theta2) + lt * math.cos(theta2 + theta3),
-                    lt * math.cos(theta2 + theta3),
+                    lf * np.cos(theta2_arr) + lt * np.cos(theta23),
+                    lt * np.cos(theta23),
                 ],
             ]
         )
@@ -0,0 +1,208 @@
+"""
+leg_power_tile_cache.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .hexapod_param_protocol import HexapodParamProtocol
+from .leg_power_calculator import LegPowerCalculator
+
+TileKey = Tuple[int, int, int]
+
+
+class LegPowerTileCache:
+    """
+    脚先の力の分布を，段階ごとの正方形のタイルに分けて計算し，保持するクラス．\n
+    段階 level の格子の間隔は base_step / 2**level で，タイルは座標の原点を基準に並ぶ．
+    そのため表示範囲が変わっても，既に計算したタイルはそのまま使える．
+    最大 max_tiles 個まで保持し，それを超えると最も長く使われていないものから削除する．
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+        base_step: float = 1.0,
+        tile_size: int = 64,
+        max_tiles: int = 512,
+        max_power: float = 19.0,
+        power_x: float = 0.0,
+        power_z: float = 1.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            脚の可動範囲を計算するためのインスタンス．Noneの場合は共有のものを使う．
+        base_step : float
+            段階 0 の格子の間隔 [mm]
+        tile_size : int
+            1つのタイルの1辺の要素数．
+        max_tiles : int
+            保持するタイルの最大数．
+        max_power : float
+            計算する力の倍率の上限．
+        power_x : float
+            x方向にかかる力.正規化されていること [N]
+        power_z : float
+            z方向にかかる力.正規化されていること [N]
+        """
+        if base_step <= 0.0:
+            raise ValueError(f"{__name__}: base_step must be greater than 0")
+
+        if tile_size < 1:
+            raise ValueError(f"{__name__}: tile_size must be 1 or more")
+
+        if max_tiles < 1:
+            raise ValueError(f"{__name__}: max_tiles must be 1 or more")
+
+        self._calc = LegPowerCalculator(
+            hexapod_leg_range_calc, hexapod_param, max_power=max_power
+        )
+        self._base_step = float(base_step)
+        self._tile_size = tile_size
+        self._max_tiles = max_tiles
+        self._power_x = power_x
+        self._power_z = power_z
+        self._tiles: "OrderedDict[TileKey, npt.NDArray[np.float64]]" = OrderedDict()
+
+        # タイルを取り出した回数と，計算した回数．
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def tile_size(self) -> int:
+        """1つのタイルの1辺の要素数"""
+        return self._tile_size
+
+    def step(self, level: int) -> float:
+        """段階 level の格子の間隔 [mm]"""
+        return self._base_step * 2.0 ** -level
+
+    def choose_level(
+        self, width: float, samples: int, *, max_level: Optional[int] = None
+    ) -> int:
+        """
+        幅 width [mm] の範囲に，samples 個以上の格子点が並ぶ最も粗い段階を返す．
+
+        Parameters
+        ----------
+        width : float
+            表示する範囲の幅 [mm]
+        samples : int
+            幅の中に並べたい格子点の数．
+        max_level : Optional[int]
+            段階の上限．これより細かい格子は使わない．
+        """
+        if width <= 0.0 or samples < 1:
+            raise ValueError(f"{__name__}: width and samples must be greater than 0")
+
+        level = int(np.ceil(np.log2(self._base_step * samples / width)))
+        if max_level is not None:
+            level = min(level, max_level)
+        return level
+
+    def tile_keys(
+        self, level: int, rect: Tuple[float, float, float, float]
+    ) -> List[TileKey]:
+        """
+        rect (x_min, x_max, z_min, z_max) [mm] を覆う，段階 level のタイルの (level, iz, ix) を返す．
+        """
+        span = self._tile_size * self.step(level)
+        ix0, ix1 = int(np.floor(rect[0] / span)), int(np.floor(rect[1] / span))
+        iz0, iz1 = int(np.floor(rect[2] / span)), int(np.floor(rect[3] / span))
+        return [
+            (level, iz, ix) for iz in range(iz0, iz1 + 1) for ix in range(ix0, ix1 + 1)
+        ]
+
+    def get_tiles(self, keys: List[TileKey]) -> List[npt.NDArray[np.float64]]:
+        """
+        タイルごとの力の分布を返す．保持していないタイルはまとめて計算する．\n
+        各タイルの形状は(tile_size, tile_size)で，xが列，zが行．
+        """
+
+        missing = [key for key in dict.fromkeys(keys) if key not in self._tiles]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            # 全てのタイルの点を1度に計算する．
+            index = np.arange(self._tile_size)
+            keys_arr = np.asarray(missing, dtype=np.int64)
+            step = np.asarray([self.step(int(level)) for level in keys_arr[:, 0]])
+            x = ((keys_arr[:, 2, np.newaxis] * self._tile_size + index) * step[:, np.newaxis])
+            z = ((keys_arr[:, 1, np.newaxis] * self._tile_size + index) * step[:, np.newaxis])
+            power = self._calc.calculate_points(
+                x[:, np.newaxis, :], z[:, :, np.newaxis],
+                power_x=self._power_x, power_z=self._power_z,
+            )
+            for key, tile in zip(missing, power):
+                self._tiles[key] = tile
+
+        tiles = []
+        for key in keys:
+            self._tiles.move_to_end(key)
+            tiles.append(self._tiles[key])
+
+        while len(self._tiles) > max(self._max_tiles, len(set(keys))):
+            self._tiles.popitem(last=False)
+
+        return tiles
+
+    def compose(
+        self, level: int, rect: Tuple[float, float, float, float]
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        rect を覆うタイルを並べ，1つの力の分布にまとめる．
+
+        Parameters
+        ----------
+        level : int
+            使うタイルの段階．
+        rect : Tuple[float, float, float, float]
+            覆う範囲 (x_min, x_max, z_min, z_max) [mm]
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]
+            x座標の配列，z座標の配列と，x*zの要素数を持つ2次元配列(xが列，zが行)．
+        """
+        keys = self.tile_keys(level, rect)
+        tiles = self.get_tiles(keys)
+
+        iz0, ix0 = keys[0][1], keys[0][2]
+        nz = keys[-1][1] - iz0 + 1
+        nx = keys[-1][2] - ix0 + 1
+        size = self._tile_size
+
+        power_array = np.empty((nz * size, nx * size), dtype=np.float64)
+        for (_, iz, ix), tile in zip(keys, tiles):
+            z0 = (iz - iz0) * size
+            x0 = (ix - ix0) * size
+            power_array[z0:z0 + size, x0:x0 + size] = tile
+
+        step = self.step(level)
+        x_range = (ix0 * size + np.arange(nx * size)) * step
+        z_range = (iz0 * size + np.arange(nz * size)) * step
+        return x_range, z_range, power_array
+
+    def clear(self) -> None:
+        """
+        保持しているタイルをすべて削除する．
+        """
+        self._tiles.clear()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
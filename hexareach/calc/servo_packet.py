@@ -0,0 +1,76 @@
+"""
+servo_packet.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+# 1つのサーボ角を表すデータ型．リトルエンディアンの符号付き16bit整数．
+SERVO_TICK_DTYPE = np.dtype("<i2")
+
+
+def pack_servo_ticks(*ticks: npt.ArrayLike) -> bytes:
+    """
+    サーボ角の配列を，コントローラに送るためのバイト列にまとめる．\n
+    バイト列は要素ごとに [配列0のcoxa,femur,tibia, 配列1のcoxa,femur,tibia, ...] の順に並ぶ．
+    各値はリトルエンディアンの符号付き16bit整数．
+
+    Parameters
+    ----------
+    *ticks : ArrayLike
+        サーボ角の配列，形状は(3, N)．すべて同じ形状であること．
+        例えば calc_inverse_kinematics_xz_arduino_batch で求めた左足と右足のサーボ角．
+
+    Returns
+    -------
+    data : bytes
+        まとめたバイト列．長さは 2 * 3 * N * len(ticks) [byte]
+    """
+
+    if len(ticks) == 0:
+        raise ValueError(f"{__name__}: at least one array of ticks is required")
+
+    arrays = [np.asarray(t) for t in ticks]
+    for arr in arrays:
+        if arr.ndim != 2 or arr.shape[0] != 3 or arr.shape != arrays[0].shape:
+            raise ValueError(f"{__name__}: ticks must be (3, N) arrays of the same shape")
+        if arr.size > 0 and (arr.min() < -32768 or arr.max() > 32767):
+            raise ValueError(f"{__name__}: ticks must fit in int16")
+
+    # 形状を(N, 配列, 3)にして，要素ごとに連続して並ぶようにする．
+    stacked = np.stack(arrays).transpose(2, 0, 1)
+    return np.ascontiguousarray(stacked, dtype=SERVO_TICK_DTYPE).tobytes()
+
+
+def unpack_servo_ticks(data: bytes, channels: int = 1) -> Tuple[npt.NDArray[np.int16], ...]:
+    """
+    pack_servo_ticks でまとめたバイト列を，サーボ角の配列に戻す．
+
+    Parameters
+    ----------
+    data : bytes
+        pack_servo_ticks でまとめたバイト列．
+    channels : int
+        まとめた配列の数．
+
+    Returns
+    -------
+    ticks : Tuple[NDArray[np.int16], ...]
+        サーボ角の配列，形状は(3, N)．まとめた順に channels 個返す．
+    """
+
+    if channels < 1:
+        raise ValueError(f"{__name__}: channels must be 1 or more")
+
+    values = np.frombuffer(data, dtype=SERVO_TICK_DTYPE)
+    if values.size % (3 * channels) != 0:
+        raise ValueError(f"{__name__}: data length does not match the number of channels")
+
+    stacked = values.reshape(-1, channels, 3).astype(np.int16)
+    return tuple(np.ascontiguousarray(stacked[:, i, :].T) for i in range(channels))
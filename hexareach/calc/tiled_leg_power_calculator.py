@@ -0,0 +1,253 @@
+"""
+tiled_leg_power_calculator.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import types
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .hexapod_param_protocol import (
+    HexapodParamKey,
+    HexapodParamProtocol,
+    make_hexapod_param_key,
+)
+from .disk_cache import DiskCache
+from .leg_power_calculator import LegPowerCalculator, make_leg_power_cache_items
+
+# (z の開始, z の終了, x の開始, x の終了) の添字．
+Tile = Tuple[int, int, int, int]
+
+# ワーカープロセスごとに1度だけ作成する計算機．
+_worker_calc: Optional[LegPowerCalculator] = None
+
+
+def _init_worker(param_key: HexapodParamKey, max_power: float) -> None:
+    """
+    ワーカープロセスの初期化．パラメータの値から計算機を作成する．
+    """
+    global _worker_calc  # pylint: disable=global-statement
+
+    param: Any = types.SimpleNamespace(**dict(param_key))
+    _worker_calc = LegPowerCalculator(None, param, max_power=max_power)
+
+
+def _calc_tile(
+    tile: Tile,
+    x_range: npt.NDArray[np.float64],
+    z_range: npt.NDArray[np.float64],
+    options: Dict[str, Any],
+    shared_name: Optional[str],
+    shape: Tuple[int, int],
+) -> Optional[npt.NDArray[np.float64]]:
+    """
+    1つのタイルを計算する．共有メモリを使う場合は直接書き込み，使わない場合は結果を返す．
+    """
+    assert _worker_calc is not None
+
+    power = _worker_calc.calculate(x_range, z_range, **options)
+
+    if shared_name is None:
+        return power
+
+    shm = shared_memory.SharedMemory(name=shared_name)
+    try:
+        result: npt.NDArray[np.float64] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        result[tile[0]:tile[1], tile[2]:tile[3]] = power
+        del result
+    finally:
+        shm.close()
+
+    return None
+
+
+class TiledLegPowerCalculator:
+    """
+    脚先が出すことができる力を，タイルに分割して複数のプロセスで計算するクラス.\n
+    各タイルは LegPowerCalculator と同じ計算を行うため，結果は1度に計算した場合と完全に一致する．
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        tile_size: int = 256,
+        workers: Optional[int] = None,
+        use_shared_memory: bool = False,
+        max_power: float = 19.0,
+        cache: Optional[DiskCache] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        tile_size : int
+            1つのタイルの1辺の要素数．
+        workers : Optional[int]
+            ワーカープロセスの数．Noneの場合はCPUの数．1の場合はプロセスを作らずに計算する．
+        use_shared_memory : bool
+            Trueの場合，ワーカーは共有メモリ上の配列に直接書き込む．
+        max_power : float
+            計算する力の倍率の上限．
+        cache : Optional[DiskCache]
+            計算結果を保存するキャッシュ．LegPowerCalculator と同じキーを使うため，結果を共有できる．
+        """
+        if tile_size < 1:
+            raise ValueError(f"{__name__}: tile_size must be 1 or more")
+
+        if workers is not None and workers < 1:
+            raise ValueError(f"{__name__}: workers must be 1 or more")
+
+        self._param_key = make_hexapod_param_key(hexapod_param)
+        self._param = hexapod_param
+        self._tile_size = tile_size
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._use_shared_memory = use_shared_memory
+        self._max_power = max_power
+        self._cache = cache
+
+    @property
+    def max_power(self) -> float:
+        """計算する力の倍率の上限"""
+        return self._max_power
+
+    def calculate(
+        self,
+        x_range: npt.NDArray[np.float64],
+        z_range: npt.NDArray[np.float64],
+        *,
+        power_x: float = 0.0,
+        power_z: float = 1.0,
+        quantize: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        """
+        xとzの範囲内でロボットが出すことができる脚先の力を計算する.\n
+        引数と戻り値は LegPowerCalculator.calculate と同じ．
+        """
+        x_range = np.asarray(x_range, dtype=np.float64)
+        z_range = np.asarray(z_range, dtype=np.float64)
+        options: Dict[str, Any] = {
+            "power_x": power_x,
+            "power_z": power_z,
+            "quantize": quantize,
+        }
+
+        if self._cache is None:
+            return self._calculate_tiles(x_range, z_range, options)
+
+        return self._cache.load_or_compute(
+            "leg_power",
+            self._param,
+            make_leg_power_cache_items(
+                x_range, z_range, power_x, power_z, quantize, self._max_power
+            ),
+            lambda: self._calculate_tiles(x_range, z_range, options),
+        )
+
+    def _calculate_tiles(
+        self,
+        x_range: npt.NDArray[np.float64],
+        z_range: npt.NDArray[np.float64],
+        options: Dict[str, Any],
+    ) -> npt.NDArray[np.float64]:
+        """
+        タイルに分割して計算する．
+        """
+        shape = (len(z_range), len(x_range))
+        tiles = self._make_tiles(shape)
+
+        # タイルが1つしかない場合や，ワーカーが1つの場合はこのプロセスで計算する．
+        if self._workers == 1 or len(tiles) <= 1:
+            calc = LegPowerCalculator(None, self._param, max_power=self._max_power)
+            power_array = np.empty(shape, dtype=np.float64)
+            for z0, z1, x0, x1 in tiles:
+                power_array[z0:z1, x0:x1] = calc.calculate(
+                    x_range[x0:x1], z_range[z0:z1], **options
+                )
+            return power_array
+
+        if self._use_shared_memory:
+            return self._calculate_shared(tiles, x_range, z_range, options, shape)
+
+        power_array = np.empty(shape, dtype=np.float64)
+        with self._make_executor(len(tiles)) as executor:
+            futures = {
+                executor.submit(
+                    _calc_tile, tile, x_range[tile[2]:tile[3]], z_range[tile[0]:tile[1]],
+                    options, None, shape,
+                ): tile
+                for tile in tiles
+            }
+            for future, (z0, z1, x0, x1) in futures.items():
+                power_array[z0:z1, x0:x1] = future.result()
+
+        return power_array
+
+    def _calculate_shared(
+        self,
+        tiles: List[Tile],
+        x_range: npt.NDArray[np.float64],
+        z_range: npt.NDArray[np.float64],
+        options: Dict[str, Any],
+        shape: Tuple[int, int],
+    ) -> npt.NDArray[np.float64]:
+        """
+        共有メモリ上に確保した配列に，各ワーカーが直接タイルを書き込む．
+        """
+        nbytes = max(shape[0] * shape[1] * np.dtype(np.float64).itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        try:
+            with self._make_executor(len(tiles)) as executor:
+                futures = [
+                    executor.submit(
+                        _calc_tile, tile, x_range[tile[2]:tile[3]], z_range[tile[0]:tile[1]],
+                        options, shm.name, shape,
+                    )
+                    for tile in tiles
+                ]
+                for future in futures:
+                    future.result()
+
+            shared: npt.NDArray[np.float64] = np.ndarray(
+                shape, dtype=np.float64, buffer=shm.buf
+            )
+            power_array = shared.copy()
+            del shared
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return power_array
+
+    def _make_executor(self, tile_num: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=min(self._workers, tile_num),
+            initializer=_init_worker,
+            initargs=(self._param_key, self._max_power),
+        )
+
+    def _make_tiles(self, shape: Tuple[int, int]) -> List[Tile]:
+        """
+        配列をタイルに分割する．
+        """
+        tiles: List[Tile] = []
+        for z0 in range(0, shape[0], self._tile_size):
+            for x0 in range(0, shape[1], self._tile_size):
+                tiles.append(
+                    (
+                        z0,
+                        min(z0 + self._tile_size, shape[0]),
+                        x0,
+                        min(x0 + self._tile_size, shape[1]),
+                    )
+                )
+        return tiles
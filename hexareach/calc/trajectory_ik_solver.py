@@ -0,0 +1,204 @@
+"""
+trajectory_ik_solver.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from ..math.clamp_angle import clamp_angle_array
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+
+
+class TrajectoryIkChunk(NamedTuple):
+    """
+    連続した脚先の目標座標に対する，逆運動学の計算結果の1区切り．
+    要素数をNとする．
+    """
+
+    # 脚がとどかず計算できなければFalseとなる配列，形状は(N,)
+    success: npt.NDArray[np.bool_]
+    # 脚の関節の角度の配列，形状は(3, N)．coxa(0で固定),femur,tibiaの順 [rad]
+    angle: npt.NDArray[np.float64]
+    # 選んだ逆運動学解の配列，脚先が上を向く解を選んだ要素がTrue，形状は(N,)
+    reverse: npt.NDArray[np.bool_]
+    # femur 関節が可動範囲内かどうかの配列，形状は(N,)
+    theta2_in_range: npt.NDArray[np.bool_]
+    # tibia 関節が可動範囲内かどうかの配列，形状は(N,)
+    theta3_in_range: npt.NDArray[np.bool_]
+
+
+class TrajectoryIkSolver:
+    """
+    連続した脚先の目標座標について，逆運動学を区切りごとに計算するクラス.\n
+    2つある逆運動学解のうち，直前の解に関節の角度が近い方を選ぶため，
+    連続した目標の間で脚の向きが急に反転しない．
+    直前の解は solve を呼び出しても引き継がれる．
+    """
+
+    def __init__(
+        self,
+        hexapod_leg_range_calc: HexapodLegRangeCalculator,
+        *,
+        chunk_size: int = 4096,
+        initial_reverse: bool = False,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_leg_range_calc : HexapodLegRangeCalculator
+            脚の可動範囲を計算するためのインスタンス．
+        chunk_size : int
+            1度に計算する目標の最大数．メモリの使用量はこの値に比例する．
+        initial_reverse : bool
+            最初の目標で選ぶ逆運動学解．Trueにすると脚先が上を向く解を選ぶ．
+        """
+        if chunk_size < 1:
+            raise ValueError(f"{__name__}: chunk_size must be 1 or more")
+
+        self._calc = hexapod_leg_range_calc
+        self._chunk_size = chunk_size
+        self._initial_reverse = initial_reverse
+
+        # 直前の目標で選んだ解と，その関節の角度 [theta2, theta3]
+        self._prev_reverse = initial_reverse
+        self._prev_angle: Optional[npt.NDArray[np.float64]] = None
+
+    def reset(self) -> None:
+        """
+        直前の解を忘れ，新しい軌道として計算し直す．
+        """
+        self._prev_reverse = self._initial_reverse
+        self._prev_angle = None
+
+    def solve(self, targets: Iterable[npt.ArrayLike]) -> Iterator[TrajectoryIkChunk]:
+        """
+        脚先の目標座標を順に受け取り，逆運動学の計算結果を区切りごとに返す．
+
+        Parameters
+        ----------
+        targets : Iterable[ArrayLike]
+            (x, z) の組 [mm] を順に返すもの，または形状が (N, 2) の配列を順に返すもの．
+            形状が (N, 2) の配列をそのまま渡してもよい．
+
+        Returns
+        -------
+        chunks : Iterator[TrajectoryIkChunk]
+            計算結果．1つの区切りは最大で chunk_size 個の要素を持つ．
+        """
+
+        if isinstance(targets, np.ndarray):
+            targets = [targets]
+
+        points: List[npt.NDArray[np.float64]] = []
+
+        for item in targets:
+            arr = np.asarray(item, dtype=np.float64)
+
+            if arr.shape == (2,):
+                points.append(arr)
+                if len(points) == self._chunk_size:
+                    yield self._solve_chunk(np.stack(points))
+                    points = []
+                continue
+
+            if arr.ndim != 2 or arr.shape[1] != 2:
+                raise ValueError(f"{__name__}: targets must be (x, z) or (N, 2) arrays")
+
+            # 先に受け取っていた座標を計算してから，配列を chunk_size ごとに計算する．
+            if points:
+                yield self._solve_chunk(np.stack(points))
+                points = []
+
+            for start in range(0, len(arr), self._chunk_size):
+                yield self._solve_chunk(arr[start:start + self._chunk_size])
+
+        if points:
+            yield self._solve_chunk(np.stack(points))
+
+    def _solve_chunk(self, xz: npt.NDArray[np.float64]) -> TrajectoryIkChunk:
+        """
+        1つの区切りについて，2つの解を計算してから直前の解に近い方を選ぶ．
+        """
+
+        x = xz[:, 0]
+        z = xz[:, 1]
+        success_0, _, angle_0 = self._calc.calc_inverse_kinematics_xz_batch(x, z, False)
+        success_1, _, angle_1 = self._calc.calc_inverse_kinematics_xz_batch(x, z, True)
+
+        # 解の候補，形状は(2, 2, N)．[解, 関節(theta2, theta3), 要素]
+        candidate = np.stack([angle_0[1:], angle_1[1:]])
+
+        reverse = self._choose_branch(candidate)
+
+        success = np.where(reverse, success_1, success_0)
+        angle = np.where(reverse, angle_1, angle_0)
+
+        if len(reverse) > 0:
+            self._prev_reverse = bool(reverse[-1])
+            self._prev_angle = angle[1:, -1].copy()
+
+        return TrajectoryIkChunk(
+            success=success,
+            angle=angle,
+            reverse=reverse,
+            theta2_in_range=self._calc.is_theta2_in_range_batch(angle[1]),
+            theta3_in_range=self._calc.is_theta3_in_range_batch(angle[2]),
+        )
+
+    def _choose_branch(self, candidate: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+        """
+        各要素で，直前の要素で選んだ解に近い方の解を選ぶ．
+
+        i 番目の要素の選択は i-1 番目の選択 b で決まるので，b を受け取って選択を返す写像 f_i で表せる．
+        写像は {0, 1} から {0, 1} へのものなので [f_i(0), f_i(1)] の配列で表し，
+        先頭からの合成 f_i ∘ ... ∘ f_0 を要素全体についてまとめて求める．
+
+        Parameters
+        ----------
+        candidate : NDArray[np.float64]
+            解の候補，形状は(2, 2, N)．
+
+        Returns
+        -------
+        reverse : NDArray[np.bool_]
+            脚先が上を向く解を選んだ要素がTrueの配列，形状は(N,)．
+        """
+
+        n = candidate.shape[2]
+        if n == 0:
+            return np.zeros(0, dtype=np.bool_)
+
+        # 1つ前の要素の候補．先頭は前の区切りの最後の解と比べる．
+        if self._prev_angle is None:
+            prev = np.concatenate([candidate[:, :, :1], candidate[:, :, :-1]], axis=2)
+        else:
+            prev_angle = np.broadcast_to(self._prev_angle[:, np.newaxis], (2, 2, 1))
+            prev = np.concatenate([prev_angle, candidate[:, :, :-1]], axis=2)
+
+        # distance[b, c] : 1つ前に解 b を選んでいたときの，解 c までの関節空間の距離．
+        diff = clamp_angle_array(candidate[np.newaxis, :, :, :] - prev[:, np.newaxis, :, :])
+        distance = np.sum(diff * diff, axis=2)
+
+        # 同じ距離なら1つ前と同じ解を選ぶ．
+        switch = distance[[0, 1], [1, 0]] < distance[[0, 1], [0, 1]]
+        mapping = np.where(switch, 1 - np.arange(2)[:, np.newaxis], np.arange(2)[:, np.newaxis])
+        mapping = np.ascontiguousarray(mapping.T)  # 形状は(N, 2)
+
+        # 最初の軌道の先頭は，前の解がないので initial_reverse に固定する．
+        if self._prev_angle is None:
+            mapping[0] = int(self._prev_reverse)
+
+        # Hillis-Steele のスキャンで，写像の合成を先頭から順にまとめて求める．
+        offset = 1
+        while offset < n:
+            composed = np.take_along_axis(mapping[offset:], mapping[:-offset], axis=1)
+            mapping[offset:] = composed
+            offset *= 2
+
+        return mapping[:, int(self._prev_reverse)].astype(np.bool_)
@@ -0,0 +1,315 @@
+"""
+workspace_distance_field.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .calculator_registry import get_leg_range_calculator
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .hexapod_param_protocol import HexapodParamProtocol
+from .workspace_occupancy_grid import make_workspace_boundary_lines
+
+
+def _make_boundary_segments(
+    hexapod_param: HexapodParamProtocol,
+    hexapod_leg_range_calc: HexapodLegRangeCalculator,
+    *,
+    spacing: float,
+) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    脚がとどく領域の境界になる線分を返す．\n
+    make_workspace_boundary_lines の線分のうち，中点の両側で脚がとどくかが変わるものだけを残す．
+    もう一方の逆運動学解でとどく領域の中を通る部分などは境界ではないため除く．
+
+    Returns
+    -------
+    res : Tuple[NDArray[np.float64], NDArray[np.float64]]
+        線分の始点の配列と終点の配列，形状は(n, 2) [mm]
+    """
+    starts = []
+    ends = []
+    for line_x, line_z in make_workspace_boundary_lines(
+        hexapod_param, hexapod_leg_range_calc, spacing=spacing
+    ):
+        line = np.stack([line_x, line_z], axis=-1)
+        starts.append(line[:-1])
+        ends.append(line[1:])
+    start = np.concatenate(starts)
+    end = np.concatenate(ends)
+
+    direction = end - start
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    start, end, direction, length = (
+        v[length > 0.0] for v in (start, end, direction, length)
+    )
+
+    # 中点から法線方向に少しずらした2点で，脚がとどくかを比べる．
+    offset = 0.01 * spacing * np.stack([-direction[:, 1], direction[:, 0]], axis=-1)
+    offset /= length[:, np.newaxis]
+    middle = 0.5 * (start + end)
+    side_a, _ = hexapod_leg_range_calc.calc_reachable_inverse_kinematics_xz_batch(
+        middle[:, 0] + offset[:, 0], middle[:, 1] + offset[:, 1]
+    )
+    side_b, _ = hexapod_leg_range_calc.calc_reachable_inverse_kinematics_xz_batch(
+        middle[:, 0] - offset[:, 0], middle[:, 1] - offset[:, 1]
+    )
+    boundary = side_a != side_b
+    return start[boundary], end[boundary]
+
+
+class WorkspaceDistanceField:
+    """
+    脚先の座標から，脚の可動範囲の境界までの符号付き距離を求めるクラス.\n
+    可動範囲は HexapodRangeOfMotionRenderer が描画する境界線で囲まれた領域
+    (どちらかの逆運動学解で脚がとどき，関節が可動範囲内に収まる領域)．
+    距離は可動範囲の内側で負，外側で正となり，格子の中央ごとに float32 で保存する．
+    格子の中央から境界線までの距離を直接求めるため，格子より細い領域の近くでも正確．
+    問い合わせでは双線形補間で距離と勾配を求める．
+    """
+
+    def __init__(
+        self,
+        distance: npt.NDArray[np.float32],
+        *,
+        origin: Tuple[float, float],
+        resolution: float,
+    ) -> None:
+        """
+        通常は build か load で作成する．
+
+        Parameters
+        ----------
+        distance : NDArray[np.float32]
+            格子の中央ごとの符号付き距離，形状は(nz, nx) [mm]
+        origin : Tuple[float, float]
+            格子 [z=0, x=0] の中央の座標 (x, z) [mm]
+        resolution : float
+            格子の1辺の長さ [mm]
+        """
+        distance = np.asarray(distance, dtype=np.float32)
+        if distance.ndim != 2 or distance.shape[0] < 2 or distance.shape[1] < 2:
+            raise ValueError(f"{__name__}: distance must be a (nz, nx) array, nz, nx >= 2")
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+
+        self._distance = distance
+        self._origin = (float(origin[0]), float(origin[1]))
+        self._resolution = float(resolution)
+
+    @classmethod
+    def build(
+        cls,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        rect: Optional[Tuple[float, float, float, float]] = None,
+        resolution: float = 1.0,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+    ) -> "WorkspaceDistanceField":
+        """
+        格子の中央ごとに脚がとどくかを判定して符号を決め，境界線までの距離を求める．\n
+        境界線は make_workspace_boundary_lines の線のうち，両側で脚がとどくかが変わる部分．
+        距離は境界線の折れ線(点の間隔は resolution / 4)までの距離とする．
+
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        rect : Optional[Tuple[float, float, float, float]]
+            格子の範囲 (x_min, x_max, z_min, z_max) [mm]．
+            Noneの場合は脚がとどく範囲に，周りの余白を加えた範囲とする．
+        resolution : float
+            格子の1辺の長さ [mm]
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            脚の可動範囲を計算するためのインスタンス．Noneの場合は共有のものを使う．
+
+        Returns
+        -------
+        field : WorkspaceDistanceField
+            作成したインスタンス．
+        """
+
+        # 計算の中心部分は NumPy だけで動作させるため，SciPy は使うときに読み込む．
+        from scipy.spatial import cKDTree  # pylint: disable=import-outside-toplevel
+
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+
+        if hexapod_leg_range_calc is None:
+            hexapod_leg_range_calc = get_leg_range_calculator(hexapod_param)
+
+        if rect is None:
+            coxa = hexapod_param.coxa_length
+            reach = hexapod_param.femur_length + hexapod_param.tibia_length
+            margin = 0.25 * reach
+            rect = (coxa - reach - margin, coxa + reach + margin, -reach - margin, reach + margin)
+        if rect[0] >= rect[1] or rect[2] >= rect[3]:
+            raise ValueError(f"{__name__}: rect must be (x_min, x_max, z_min, z_max)")
+
+        nx = max(int(np.ceil((rect[1] - rect[0]) / resolution)), 2)
+        nz = max(int(np.ceil((rect[3] - rect[2]) / resolution)), 2)
+        x = rect[0] + resolution * (np.arange(nx) + 0.5)
+        z = rect[2] + resolution * (np.arange(nz) + 0.5)
+
+        inside, _ = hexapod_leg_range_calc.calc_reachable_inverse_kinematics_xz_batch(
+            x[np.newaxis, :], z[:, np.newaxis]
+        )
+
+        start, end = _make_boundary_segments(
+            hexapod_param, hexapod_leg_range_calc, spacing=0.25 * resolution
+        )
+
+        # 領域がない場合は，すべて範囲外とする．
+        if len(start) == 0:
+            distance = np.where(inside, -np.inf, np.inf)
+        else:
+            # 線分は spacing より短いので，中点が近い線分の中に最も近い線分がある．
+            points = np.stack(np.broadcast_arrays(x[np.newaxis, :], z[:, np.newaxis]), axis=-1)
+            points = points.reshape(-1, 2)
+            k = min(4, len(start))
+            _, index = cKDTree(0.5 * (start + end)).query(points, k=k)
+            index = index.reshape(-1, k)
+
+            a = start[index]
+            ab = end[index] - a
+            ap = points[:, np.newaxis, :] - a
+            t = np.clip(
+                np.sum(ap * ab, axis=-1) / np.maximum(np.sum(ab * ab, axis=-1), 1e-300), 0.0, 1.0
+            )
+            unsigned = np.min(np.hypot(*np.moveaxis(ap - t[..., np.newaxis] * ab, -1, 0)), axis=1)
+            distance = np.where(inside, -1.0, 1.0) * unsigned.reshape(nz, nx)
+
+        return cls(
+            distance.astype(np.float32),
+            origin=(float(x[0]), float(z[0])),
+            resolution=resolution,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """格子の数 (nz, nx)"""
+        return (self._distance.shape[0], self._distance.shape[1])
+
+    @property
+    def resolution(self) -> float:
+        """格子の1辺の長さ [mm]"""
+        return self._resolution
+
+    @property
+    def x_range(self) -> npt.NDArray[np.float64]:
+        """格子の中央のx座標 [mm]"""
+        return self._origin[0] + self._resolution * np.arange(self.shape[1])
+
+    @property
+    def z_range(self) -> npt.NDArray[np.float64]:
+        """格子の中央のz座標 [mm]"""
+        return self._origin[1] + self._resolution * np.arange(self.shape[0])
+
+    @property
+    def distance(self) -> npt.NDArray[np.float32]:
+        """格子の中央ごとの符号付き距離，形状は(nz, nx) [mm]．書き換えないこと．"""
+        return self._distance
+
+    def query(
+        self, x: npt.ArrayLike, z: npt.ArrayLike
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        脚先の座標について，符号付き距離とその勾配を双線形補間で求める．\n
+        格子の外の点は，最も近い格子の端の値に端からの距離を加え，勾配は端から離れる向きとする．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.float64], NDArray[np.float64]]
+            符号付き距離の配列 [mm]，可動範囲の内側で負．形状はx,zをブロードキャストしたもの(以下S)．\n
+            勾配の配列，形状は(2, *S)．[0]がx方向，[1]がz方向．
+        """
+        x_arr, z_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        )
+        nz, nx = self.shape
+        res = self._resolution
+
+        fx = (x_arr - self._origin[0]) / res
+        fz = (z_arr - self._origin[1]) / res
+        fx_in = np.clip(fx, 0.0, nx - 1)
+        fz_in = np.clip(fz, 0.0, nz - 1)
+
+        ix = np.minimum(np.floor(fx_in), nx - 2).astype(np.intp)
+        iz = np.minimum(np.floor(fz_in), nz - 2).astype(np.intp)
+        tx = fx_in - ix
+        tz = fz_in - iz
+
+        d = self._distance
+        d00 = d[iz, ix].astype(np.float64)
+        d01 = d[iz, ix + 1].astype(np.float64)
+        d10 = d[iz + 1, ix].astype(np.float64)
+        d11 = d[iz + 1, ix + 1].astype(np.float64)
+
+        value = (
+            d00 * (1.0 - tz) * (1.0 - tx)
+            + d01 * (1.0 - tz) * tx
+            + d10 * tz * (1.0 - tx)
+            + d11 * tz * tx
+        )
+        gradient = np.stack(
+            [
+                ((d01 - d00) * (1.0 - tz) + (d11 - d10) * tz) / res,
+                ((d10 - d00) * (1.0 - tx) + (d11 - d01) * tx) / res,
+            ]
+        )
+
+        # 格子の外の点．
+        out_x = (fx - fx_in) * res
+        out_z = (fz - fz_in) * res
+        out = np.hypot(out_x, out_z)
+        outside = out > 0.0
+        if outside.any():
+            value = np.where(outside, value + out, value)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                gradient = np.where(outside, np.stack([out_x, out_z]) / out, gradient)
+
+        return value, gradient
+
+    def save(self, file_name: str) -> None:
+        """
+        .npz ファイルとして保存する．
+        """
+
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        np.savez(
+            file_name,
+            distance=self._distance,
+            origin=np.asarray(self._origin, dtype=np.float64),
+            resolution=np.asarray(self._resolution, dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, file_name: str) -> "WorkspaceDistanceField":
+        """
+        save で保存したファイルを読み込む．
+        """
+
+        with np.load(file_name) as data:
+            origin = data["origin"]
+            return cls(
+                data["distance"],
+                origin=(float(origin[0]), float(origin[1])),
+                resolution=float(data["resolution"]),
+            )
@@ -0,0 +1,375 @@
+"""
+workspace_occupancy_grid.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .calculator_registry import get_leg_range_calculator
+from .hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .hexapod_param_protocol import HexapodParamProtocol
+
+
+def _dilate(mask: npt.NDArray[np.bool_]) -> npt.NDArray[np.bool_]:
+    """
+    True の要素を，周りの8近傍に広げる．
+    """
+    padded = np.pad(mask, 1)
+    res = np.zeros_like(mask)
+    for dz in range(3):
+        for dx in range(3):
+            res |= padded[dz:dz + mask.shape[0], dx:dx + mask.shape[1]]
+    return res
+
+
+def make_workspace_boundary_lines(
+    hexapod_param: HexapodParamProtocol,
+    hexapod_leg_range_calc: HexapodLegRangeCalculator,
+    *,
+    spacing: float,
+) -> List[Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]]:
+    """
+    脚がとどく領域の境界になりうる線を，点の間隔が spacing 以下の折れ線で返す．\n
+    境界線は関節の角度が最大・最小となる4本の線と，脚を伸ばしきる・折りたたみきる円．
+    標本点の間を通る細い領域を見落とさないために，線が通る格子を調べるのに使う．
+
+    Parameters
+    ----------
+    hexapod_param : HexapodParamProtocol
+        パラメータを格納するためのインスタンス．
+    hexapod_leg_range_calc : HexapodLegRangeCalculator
+        脚の可動範囲を計算するためのインスタンス．
+    spacing : float
+        折れ線の点の間隔の上限 [mm]
+
+    Returns
+    -------
+    lines : List[Tuple[NDArray[np.float64], NDArray[np.float64]]]
+        線ごとの (x座標の配列, z座標の配列) [mm]
+    """
+    coxa = hexapod_param.coxa_length
+    reach = hexapod_param.femur_length + hexapod_param.tibia_length
+
+    lines = [
+        (np.asarray(line_x, dtype=np.float64), np.asarray(line_z, dtype=np.float64))
+        for line_x, line_z in hexapod_leg_range_calc.calc_range_of_motion_boundary(
+            hexapod_param.theta2_min,
+            hexapod_param.theta2_max,
+            hexapod_param.theta3_min,
+            hexapod_param.theta3_max,
+            step=spacing / reach,
+        )
+    ]
+    for radius in (reach, abs(hexapod_param.tibia_length - hexapod_param.femur_length)):
+        num = max(int(np.ceil(2.0 * np.pi * radius / spacing)), 1)
+        theta = np.linspace(-np.pi, np.pi, num + 1)
+        lines.append((coxa + radius * np.cos(theta), radius * np.sin(theta)))
+
+    return lines
+
+
+def _get_bits(
+    bits: npt.NDArray[np.uint8], iz: npt.NDArray[np.intp], ix: npt.NDArray[np.intp]
+) -> npt.NDArray[np.bool_]:
+    """
+    x方向に np.packbits(bitorder="little") でまとめた配列から，(iz, ix) のビットを取り出す．
+    """
+    return ((bits[iz, ix >> 3] >> (ix & 7).astype(np.uint8)) & 1).astype(np.bool_)
+
+
+class WorkspaceOccupancyGrid:
+    """
+    脚先がとどくかどうかを，格子ごとに1ビットで保存するクラス.\n
+    2つの逆運動学解のどちらかで脚がとどき，関節が可動範囲内に収まる領域
+    (calc_reachable_inverse_kinematics_xz_batch と同じ判定)を格子に分割して保存する．
+    問い合わせは1点あたり O(1) で行える．\n
+    格子の中で判定が変わる可能性がある境界付近の格子には境界の印を付ける．
+    印の付いた点だけを厳密に計算し直せば，結果は厳密な判定と一致する．
+    """
+
+    def __init__(
+        self,
+        reachable_bits: npt.NDArray[np.uint8],
+        band_bits: npt.NDArray[np.uint8],
+        *,
+        shape: Tuple[int, int],
+        origin: Tuple[float, float],
+        resolution: float,
+        covers_workspace: bool,
+    ) -> None:
+        """
+        通常は build か load で作成する．
+
+        Parameters
+        ----------
+        reachable_bits : NDArray[np.uint8]
+            格子の中央で脚がとどくかどうか．x方向に packbits でまとめた配列，形状は(nz, ceil(nx / 8))．
+        band_bits : NDArray[np.uint8]
+            境界付近の格子かどうか．reachable_bits と同じ形式．
+        shape : Tuple[int, int]
+            格子の数 (nz, nx)
+        origin : Tuple[float, float]
+            格子 [z=0, x=0] の左下の座標 (x, z) [mm]
+        resolution : float
+            格子の1辺の長さ [mm]
+        covers_workspace : bool
+            格子が脚のとどく範囲をすべて含むかどうか．Trueの場合，格子の外は脚がとどかないと判定する．
+        """
+        nz, nx = shape
+        packed_shape = (nz, (nx + 7) // 8)
+
+        reachable_bits = np.asarray(reachable_bits, dtype=np.uint8)
+        band_bits = np.asarray(band_bits, dtype=np.uint8)
+        if reachable_bits.shape != packed_shape or band_bits.shape != packed_shape:
+            raise ValueError(f"{__name__}: bits must be ({nz}, {packed_shape[1]}) arrays")
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+
+        self._reachable_bits = reachable_bits
+        self._band_bits = band_bits
+        self._shape = (int(nz), int(nx))
+        self._origin = (float(origin[0]), float(origin[1]))
+        self._resolution = float(resolution)
+        self._covers_workspace = bool(covers_workspace)
+        self._calc: Optional[HexapodLegRangeCalculator] = None
+
+    @classmethod
+    def build(
+        cls,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        rect: Optional[Tuple[float, float, float, float]] = None,
+        resolution: float = 1.0,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+    ) -> "WorkspaceOccupancyGrid":
+        """
+        格子ごとに脚がとどくかどうかを計算し，作成する．\n
+        格子の4隅と中央の判定がすべて同じでない格子，可動範囲の境界線が通る格子と，
+        それらの8近傍の格子を境界付近とする．
+
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        rect : Optional[Tuple[float, float, float, float]]
+            格子の範囲 (x_min, x_max, z_min, z_max) [mm]．
+            Noneの場合は脚がとどく範囲をすべて含む範囲とする．
+        resolution : float
+            格子の1辺の長さ [mm]
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            脚の可動範囲を計算するためのインスタンス．Noneの場合は共有のものを使う．
+
+        Returns
+        -------
+        grid : WorkspaceOccupancyGrid
+            作成したインスタンス．
+        """
+
+        if resolution <= 0.0:
+            raise ValueError(f"{__name__}: resolution must be greater than 0")
+
+        if hexapod_leg_range_calc is None:
+            hexapod_leg_range_calc = get_leg_range_calculator(hexapod_param)
+
+        # 脚がとどく範囲は，femur と tibia を伸ばしきった円の内側．
+        coxa = hexapod_param.coxa_length
+        reach = hexapod_param.femur_length + hexapod_param.tibia_length
+        full_rect = (coxa - reach, coxa + reach, -reach, reach)
+
+        if rect is None:
+            # 境界上の点も格子の内側に入るよう，1格子分広げる．
+            rect = (
+                full_rect[0] - resolution,
+                full_rect[1] + resolution,
+                full_rect[2] - resolution,
+                full_rect[3] + resolution,
+            )
+        if rect[0] >= rect[1] or rect[2] >= rect[3]:
+            raise ValueError(f"{__name__}: rect must be (x_min, x_max, z_min, z_max)")
+
+        covers_workspace = (
+            rect[0] < full_rect[0] and full_rect[1] < rect[1]
+            and rect[2] < full_rect[2] and full_rect[3] < rect[3]
+        )
+
+        nx = int(np.ceil((rect[1] - rect[0]) / resolution))
+        nz = int(np.ceil((rect[3] - rect[2]) / resolution))
+
+        # 格子の隅と中央で判定する．
+        x_node = rect[0] + resolution * np.arange(nx + 1)
+        z_node = rect[2] + resolution * np.arange(nz + 1)
+        node, _ = hexapod_leg_range_calc.calc_reachable_inverse_kinematics_xz_batch(
+            x_node[np.newaxis, :], z_node[:, np.newaxis]
+        )
+        center, _ = hexapod_leg_range_calc.calc_reachable_inverse_kinematics_xz_batch(
+            (x_node[:-1] + 0.5 * resolution)[np.newaxis, :],
+            (z_node[:-1] + 0.5 * resolution)[:, np.newaxis],
+        )
+
+        uniform = (
+            (node[:-1, :-1] == center)
+            & (node[:-1, 1:] == center)
+            & (node[1:, :-1] == center)
+            & (node[1:, 1:] == center)
+        )
+
+        # 標本点の間を通る細い領域を見落とさないよう，境界線が通る格子も境界付近とする．
+        lines = make_workspace_boundary_lines(
+            hexapod_param, hexapod_leg_range_calc, spacing=0.25 * resolution
+        )
+
+        on_line = np.zeros((nz, nx), dtype=np.bool_)
+        for line_x, line_z in lines:
+            ix = np.floor((np.asarray(line_x) - rect[0]) / resolution).astype(np.intp)
+            iz = np.floor((np.asarray(line_z) - rect[2]) / resolution).astype(np.intp)
+            inside = (ix >= 0) & (ix < nx) & (iz >= 0) & (iz < nz)
+            on_line[iz[inside], ix[inside]] = True
+
+        band = _dilate(~uniform | on_line)
+
+        grid = cls(
+            np.packbits(center, axis=1, bitorder="little"),
+            np.packbits(band, axis=1, bitorder="little"),
+            shape=(nz, nx),
+            origin=(rect[0], rect[2]),
+            resolution=resolution,
+            covers_workspace=covers_workspace,
+        )
+        grid._calc = hexapod_leg_range_calc
+        return grid
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """格子の数 (nz, nx)"""
+        return self._shape
+
+    @property
+    def resolution(self) -> float:
+        """格子の1辺の長さ [mm]"""
+        return self._resolution
+
+    @property
+    def nbytes(self) -> int:
+        """保存している配列の大きさ [byte]"""
+        return int(self._reachable_bits.nbytes + self._band_bits.nbytes)
+
+    def query(
+        self, x: npt.ArrayLike, z: npt.ArrayLike
+    ) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]:
+        """
+        脚先の座標について，脚がとどくかどうかを格子から求める．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+
+        Returns
+        -------
+        res : Tuple[NDArray[np.bool_], NDArray[np.bool_]]
+            脚がとどく点がTrueとなる配列,形状はx,zをブロードキャストしたもの．\n
+            厳密に計算し直す必要がある点がTrueとなる配列．境界付近の格子の点と，
+            格子が脚のとどく範囲をすべて含まない場合の格子の外の点．
+        """
+        x_arr, z_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        )
+        nz, nx = self._shape
+
+        fx = np.floor((x_arr - self._origin[0]) / self._resolution)
+        fz = np.floor((z_arr - self._origin[1]) / self._resolution)
+        inside = (fx >= 0) & (fx < nx) & (fz >= 0) & (fz < nz)
+
+        ix = np.where(inside, fx, 0).astype(np.intp)
+        iz = np.where(inside, fz, 0).astype(np.intp)
+
+        reachable = np.asarray(inside & _get_bits(self._reachable_bits, iz, ix))
+        band = np.where(inside, _get_bits(self._band_bits, iz, ix), not self._covers_workspace)
+
+        return reachable, np.asarray(band)
+
+    def is_reachable(
+        self,
+        x: npt.ArrayLike,
+        z: npt.ArrayLike,
+        hexapod_leg_range_calc: Optional[HexapodLegRangeCalculator] = None,
+    ) -> npt.NDArray[np.bool_]:
+        """
+        脚先の座標について，脚がとどくかどうかを求める．
+        境界付近の点だけを calc_reachable_inverse_kinematics_xz_batch で計算し直す．
+
+        Parameters
+        ----------
+        x : ArrayLike
+            脚の付け根から見た脚先のx座標 [mm]
+        z : ArrayLike
+            脚の付け根から見た脚先のz座標 [mm]
+        hexapod_leg_range_calc : Optional[HexapodLegRangeCalculator]
+            計算し直すためのインスタンス．build で作った場合は省略できる．
+
+        Returns
+        -------
+        reachable : NDArray[np.bool_]
+            脚がとどく点がTrueとなる配列,形状はx,zをブロードキャストしたもの．
+        """
+
+        calc = hexapod_leg_range_calc if hexapod_leg_range_calc is not None else self._calc
+        if calc is None:
+            raise ValueError(f"{__name__}: hexapod_leg_range_calc is required for a loaded grid")
+
+        x_arr, z_arr = np.broadcast_arrays(
+            np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+        )
+        reachable, band = self.query(x_arr, z_arr)
+
+        if band.any():
+            exact, _ = calc.calc_reachable_inverse_kinematics_xz_batch(x_arr[band], z_arr[band])
+            reachable[band] = exact
+
+        return reachable
+
+    def save(self, file_name: str) -> None:
+        """
+        .npz ファイルとして保存する．
+        """
+
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        np.savez(
+            file_name,
+            reachable_bits=self._reachable_bits,
+            band_bits=self._band_bits,
+            shape=np.asarray(self._shape, dtype=np.int64),
+            origin=np.asarray(self._origin, dtype=np.float64),
+            resolution=np.asarray(self._resolution, dtype=np.float64),
+            covers_workspace=np.asarray(self._covers_workspace),
+        )
+
+    @classmethod
+    def load(cls, file_name: str) -> "WorkspaceOccupancyGrid":
+        """
+        save で保存したファイルを読み込む．
+        """
+
+        with np.load(file_name) as data:
+            shape = data["shape"]
+            origin = data["origin"]
+            return cls(
+                data["reachable_bits"],
+                data["band_bits"],
+                shape=(int(shape[0]), int(shape[1])),
+                origin=(float(origin[0]), float(origin[1])),
+                resolution=float(data["resolution"]),
+                covers_workspace=bool(data["covers_workspace"]),
+            )
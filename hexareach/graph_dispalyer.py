@@ -6,6 +6,7 @@ graph_dispalyer.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
+import os
 from typing import Tuple, Optional
 
 import matplotlib as mpl
@@ -14,16 +15,28 @@ from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
 from .render.hexapod_leg_power import HexapodLegPower
-from .calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from .calc.calculator_registry import get_leg_range_calculator
+from .calc.disk_cache import DiskCache
 from .calc.hexapod_param_protocol import HexapodParamProtocol
 from .render.approximated_graph_renderer import ApproximatedGraphRenderer
+from .render.blit_manager import BlitManager
 from .render.color_param import ColorParam
 from .render.display_flag import DisplayFlag
+from .render.display_stats import DisplayStats, make_default_display_stats
 from .render.hexapod_leg_renderer import HexapodLegRenderer
 from .render.hexapod_range_of_motion_renderer import HexapodRangeOfMotionRenderer
+from .render.leg_power_tile_renderer import LegPowerTileRenderer
+from .render.mouse_event_dispatcher import MouseEventDispatcher
 from .render.mouse_grid_renderer import MouseGridRenderer
+from .render.workspace_distance_renderer import WorkspaceDistanceRenderer
 
-mpl.use("tkagg")
+# 環境変数 MPLBACKEND が指定されていればそれに従う．
+# ディスプレイがない環境では tkagg を使えないため，Agg で描画する．
+if "MPLBACKEND" not in os.environ:
+    try:
+        mpl.use("tkagg")
+    except ImportError:
+        mpl.use("agg")
 
 
 class GraphDisplayer:
@@ -39,18 +52,28 @@ class GraphDisplayer:
         display_flag: DisplayFlag = DisplayFlag(),
         color_param: ColorParam = ColorParam(),
         leg_power_step: float =2.0,
+        leg_power_workers: int = 1,
+        leg_power_adaptive_step: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+        max_update_rate: Optional[float] = 60.0,
         image_file_name: str="result/img_main.png",
         ground_z: float =-25.0,
         do_not_show: bool =False,
         figure : Optional[Figure] = None,
         axes: Optional[Axes] = None,
         axes_table: Optional[Axes] = None,
-    ):
+        stats: Optional[DisplayStats] = None,
+    ) -> DisplayStats:
         """
         x_min < x < x_max , z_min < z < z_max の範囲でグラフを描画する．\n
-        変数の値を変更することで処理の内容を変更できる．
+        変数の値を変更することで処理の内容を変更できる．\n
+        stats を省略した場合，ロガー hexareach.stats の DEBUG レベルが有効なときだけ
+        描画の段階ごとの時間などを記録し，ログに出力する．記録した値は戻り値で受け取れる．
         """
 
+        if stats is None:
+            stats = make_default_display_stats()
+
         if display_flag.display_table:
             if figure is None or axes is None or axes_table is None:
                 fig = plt.figure()  # type: ignore
@@ -73,17 +96,31 @@ class GraphDisplayer:
                 ax_table = None
 
         # 以下グラフの作成，描画.
-        hexapod_calc = HexapodLegRangeCalculator(hexapod_pram)
+        # 計算機はパラメータの値ごとに共有され，各描画クラスも同じものを使う．
+        hexapod_calc = get_leg_range_calculator(hexapod_pram)
 
         # 脚が出せる力のグラフを描画.
         hexapod_leg_power = HexapodLegPower(
             hexapod_calc, hexapod_pram, fig, ax,
             rect=rect,
             step=leg_power_step,
+            workers=leg_power_workers,
+            cache=DiskCache(cache_dir) if cache_dir is not None else None,
+            adaptive_step=leg_power_adaptive_step,
         )
 
-        if display_flag.display_leg_power:
-            hexapod_leg_power.render()
+        # 図を表示する場合は，図を表示した後に力の分布をバックグラウンドで計算する.
+        leg_power_in_background = display_flag.leg_power_in_background and not do_not_show
+        leg_power_follow_view = (
+            display_flag.display_leg_power and display_flag.leg_power_follow_view
+        )
+        if (
+            display_flag.display_leg_power
+            and not leg_power_in_background
+            and not leg_power_follow_view
+        ):
+            with stats.stage("leg_power"):
+                hexapod_leg_power.render()
 
         # 脚の可動範囲の近似値を描画.
         app_graph = ApproximatedGraphRenderer(
@@ -95,19 +132,48 @@ class GraphDisplayer:
         )
 
         if display_flag.display_approximated_graph:
-            app_graph.render()
+            with stats.stage("approximated_graph"):
+                app_graph.render()
+
+        # 脚の可動範囲の境界までの距離を描画.
+        if display_flag.display_distance_field:
+            with stats.stage("distance_field"):
+                WorkspaceDistanceRenderer(
+                    hexapod_pram, fig, ax,
+                    color_param= color_param,
+                    rect=rect,
+                ).render()
+
+        # マウスの移動に合わせて動くグラフだけを再描画する.
+        blit_manager = BlitManager(fig) if display_flag.use_blit else None
+
+        # マウスの移動イベントをまとめ，逆運動学を1度だけ計算して各描画クラスに渡す.
+        dispatcher = MouseEventDispatcher(
+            fig, hexapod_pram,
+            max_update_rate=max_update_rate,
+            blit_manager=blit_manager,
+            stats=stats,
+        )
 
         # 脚を描画.
         leg_renderer = HexapodLegRenderer(
             hexapod_pram, fig, ax, ax_table,
             color_param= color_param,
-            display_flag= display_flag
+            display_flag= display_flag,
+            blit_manager= blit_manager,
+            dispatcher= dispatcher,
         )
         leg_renderer.set_img_file_name(image_file_name)
-        leg_renderer.render()
+        with stats.stage("leg_renderer"):
+            leg_renderer.render()
 
         # マウスがグラフのどこをポイントしているかを示す線を描画する.
-        mouse_grid_renderer = MouseGridRenderer(fig, ax, color_param= color_param)
+        mouse_grid_renderer = MouseGridRenderer(
+            fig, ax,
+            color_param= color_param,
+            blit_manager= blit_manager,
+            dispatcher= dispatcher,
+        )
         if display_flag.display_mouse_grid:
             mouse_grid_renderer.render()
 
@@ -118,7 +184,57 @@ class GraphDisplayer:
             ax,
             color_param= color_param
         )
-        hexapod_range_of_motion.render()
+        with stats.stage("range_of_motion"):
+            hexapod_range_of_motion.render()
+
+        # 再描画は dispatcher が全てのグラフを更新した後に1度だけ行う.
+        if blit_manager is not None:
+            blit_manager.render(redraw_on_motion=False)
+        dispatcher.render()
+
+        self.setup_axes(ax, rect=rect, display_flag=display_flag, ground_z=ground_z)
+
+        # 表示範囲に合わせる場合は，軸の範囲を設定した後に描画する.
+        # コールバックは弱参照で登録されるため，図を表示している間は変数で保持する.
+        if leg_power_follow_view:
+            leg_power_tile_renderer = LegPowerTileRenderer(
+                hexapod_pram, fig, ax,
+                samples=max(int((rect[1] - rect[0]) / leg_power_step), 1),
+            )
+            with stats.stage("leg_power"):
+                leg_power_tile_renderer.render()
+        elif display_flag.display_leg_power and leg_power_in_background:
+            with stats.stage("leg_power"):
+                hexapod_leg_power.render_in_background()
+
+        if not do_not_show:
+            with stats.stage("show"):
+                plt.show()  # type: ignore
+
+        return stats
+
+    @staticmethod
+    def setup_axes(
+        ax: Axes,
+        *,
+        rect: Tuple[float, float, float, float],
+        display_flag: DisplayFlag,
+        ground_z: float,
+    ) -> None:
+        """
+        軸の範囲とラベルを設定し，必要であれば地面の線を描画する．
+
+        Parameters
+        ----------
+        ax : matplotlib.axes.Axes
+            描画対象のAxesオブジェクト.
+        rect : Tuple[float, float, float, float]
+            表示する範囲 (x_min, x_max, z_min, z_max) [mm]
+        display_flag : DisplayFlag
+            描画オプションのフラグ.
+        ground_z : float
+            地面のz座標 [mm]
+        """
 
         ax.set_xlim(rect[0], rect[1])  # x 軸の範囲を設定.
         ax.set_ylim(rect[2], rect[3])  # z 軸の範囲を設定.
@@ -130,6 +246,3 @@ class GraphDisplayer:
 
         if display_flag.display_ground_line:
             ax.plot([rect[0], rect[1]], [ground_z, ground_z])  # type: ignore
-
-        if not do_not_show:
-            plt.show()  # type: ignore
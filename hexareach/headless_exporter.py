@@ -0,0 +1,237 @@
+"""
+headless_exporter.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import types
+from typing import Any, List, Optional, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .calc.calculator_registry import get_leg_range_calculator
+from .calc.disk_cache import DiskCache
+from .calc.hexapod_param_protocol import HexapodParamProtocol, make_hexapod_param_key
+from .graph_dispalyer import GraphDisplayer
+from .render.approximated_graph_renderer import ApproximatedGraphRenderer
+from .render.color_param import ColorParam
+from .render.display_flag import DisplayFlag
+from .render.hexapod_leg_power import HexapodLegPower
+from .render.hexapod_range_of_motion_renderer import HexapodRangeOfMotionRenderer
+from .render.workspace_distance_renderer import WorkspaceDistanceRenderer
+
+
+class ExportJob:
+    """
+    画像として書き出すグラフ1枚分の設定を格納するクラス.
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        image_file_name: str,
+        *,
+        rect: Tuple[float, float, float, float] = (-100.0, 300.0, -200.0, 200.0),
+        display_flag: DisplayFlag = DisplayFlag(),
+        color_param: ColorParam = ColorParam(),
+        leg_power_step: float = 2.0,
+        ground_z: float = -25.0,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        image_file_name : str
+            書き出す画像のファイル名．拡張子で形式が決まる．
+        rect : Tuple[float, float, float, float]
+            表示する範囲 (x_min, x_max, z_min, z_max) [mm]
+        display_flag : DisplayFlag
+            描画オプションのフラグ．マウス操作に関するものは無視される．
+        color_param : ColorParam
+            グラフの色や透明度のパラメータ.
+        leg_power_step : float
+            何mmごとに脚先力を計算するか [mm]
+        ground_z : float
+            地面のz座標 [mm]
+        """
+        self.hexapod_param = hexapod_param
+        self.image_file_name = image_file_name
+        self.rect = rect
+        self.display_flag = display_flag
+        self.color_param = color_param
+        self.leg_power_step = leg_power_step
+        self.ground_z = ground_z
+
+
+# ワーカープロセスごとに1度だけ作成する図とキャッシュ．
+_worker_figure: Optional[Figure] = None
+_worker_cache: Optional[DiskCache] = None
+
+
+def _init_worker(
+    figsize: Tuple[float, float], dpi: float, cache_dir: Optional[str]
+) -> None:
+    """
+    ワーカープロセスの初期化．ジョブ間で使い回す図を作成する．
+    """
+    global _worker_figure, _worker_cache  # pylint: disable=global-statement
+
+    _worker_figure = _make_figure(figsize, dpi)
+    _worker_cache = DiskCache(cache_dir) if cache_dir is not None else None
+
+
+def _export_in_worker(job: ExportJob) -> str:
+    assert _worker_figure is not None
+    return _render_job(_worker_figure, job, _worker_cache)
+
+
+def _make_figure(figsize: Tuple[float, float], dpi: float) -> Figure:
+    """
+    pyplot を介さずに，Agg で描画する図を作成する．
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _render_job(fig: Figure, job: ExportJob, cache: Optional[DiskCache]) -> str:
+    """
+    図を空にしてからジョブのグラフを描画し，画像として保存する．
+    """
+
+    fig.clear()
+    ax = fig.add_subplot(1, 1, 1)
+
+    hexapod_param = job.hexapod_param
+    display_flag = job.display_flag
+
+    # 脚が出せる力のグラフを描画.
+    if display_flag.display_leg_power:
+        HexapodLegPower(
+            get_leg_range_calculator(hexapod_param), hexapod_param, fig, ax,
+            rect=job.rect,
+            step=job.leg_power_step,
+            cache=cache,
+        ).render()
+
+    # 脚の可動範囲の近似値を描画.
+    if display_flag.display_approximated_graph:
+        ApproximatedGraphRenderer(
+            hexapod_param,
+            ax,
+            color_param=job.color_param,
+            display_flag=display_flag,
+            z_min_max=(job.rect[2], job.rect[3]),
+        ).render()
+
+    # 脚の可動範囲の境界までの距離を描画.
+    if display_flag.display_distance_field:
+        WorkspaceDistanceRenderer(
+            hexapod_param, fig, ax,
+            color_param=job.color_param,
+            rect=job.rect,
+        ).render()
+
+    # 脚の可動範囲を描画する.
+    HexapodRangeOfMotionRenderer(
+        hexapod_param, fig, ax, color_param=job.color_param
+    ).render()
+
+    GraphDisplayer.setup_axes(
+        ax, rect=job.rect, display_flag=display_flag, ground_z=job.ground_z
+    )
+
+    directory = os.path.dirname(job.image_file_name)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fig.savefig(job.image_file_name)  # type: ignore
+    return job.image_file_name
+
+
+def _snapshot(job: ExportJob) -> ExportJob:
+    """
+    ワーカープロセスに渡せるよう，パラメータを値だけを持つインスタンスに置き換える．
+    """
+    param: Any = types.SimpleNamespace(**dict(make_hexapod_param_key(job.hexapod_param)))
+    return ExportJob(
+        param,
+        job.image_file_name,
+        rect=job.rect,
+        display_flag=job.display_flag,
+        color_param=job.color_param,
+        leg_power_step=job.leg_power_step,
+        ground_z=job.ground_z,
+    )
+
+
+class HeadlessExporter:
+    """
+    ディスプレイのない環境で，グラフを画像として書き出すクラス.\n
+    Tk などの GUI を使わず Agg で描画し，1つの図をジョブ間で使い回す．
+    マウス操作で動く脚や表は描画しない．
+    """
+
+    def __init__(
+        self,
+        *,
+        figsize: Tuple[float, float] = (6.4, 4.8),
+        dpi: float = 100.0,
+        workers: int = 1,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        figsize : Tuple[float, float]
+            図の大きさ [inch]
+        dpi : float
+            図の解像度 [dpi]
+        workers : int
+            ジョブを処理するプロセスの数．1の場合はプロセスを作らずに処理する．
+        cache_dir : Optional[str]
+            脚先力の計算結果を保存するディレクトリ．Noneの場合は保存しない．
+        """
+        if workers < 1:
+            raise ValueError(f"{__name__}: workers must be 1 or more")
+
+        self._figsize = figsize
+        self._dpi = dpi
+        self._workers = workers
+        self._cache_dir = cache_dir
+        self._figure: Optional[Figure] = None
+
+    def export(self, jobs: Sequence[ExportJob]) -> List[str]:
+        """
+        ジョブを順に描画し，画像として保存する．
+
+        Parameters
+        ----------
+        jobs : Sequence[ExportJob]
+            書き出すグラフの設定のリスト．
+
+        Returns
+        -------
+        image_file_names : List[str]
+            保存した画像のファイル名のリスト．ジョブと同じ順．
+        """
+
+        if self._workers == 1 or len(jobs) <= 1:
+            if self._figure is None:
+                self._figure = _make_figure(self._figsize, self._dpi)
+            cache = DiskCache(self._cache_dir) if self._cache_dir is not None else None
+            return [_render_job(self._figure, job, cache) for job in jobs]
+
+        with ProcessPoolExecutor(
+            max_workers=min(self._workers, len(jobs)),
+            initializer=_init_worker,
+            initargs=(self._figsize, self._dpi, self._cache_dir),
+        ) as executor:
+            return list(executor.map(_export_in_worker, [_snapshot(job) for job in jobs]))
+
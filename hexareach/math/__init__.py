@@ -8,9 +8,12 @@ __init__.py
 
 
 from .triangle_checker import TriangleChecker
-from .clamp_angle import clamp_angle
+from .clamp_angle import clamp_angle, clamp_angle_array
+from .rotation import rotation_matrix_rpy
 
 __all__ = [
     "TriangleChecker",
-    "clamp_angle"
+    "clamp_angle",
+    "clamp_angle_array",
+    "rotation_matrix_rpy",
 ]
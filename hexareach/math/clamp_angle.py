@@ -8,6 +8,10 @@ clamp_angle.py
 
 import math
 
+import numpy as np
+import numpy.typing as npt
+
+
 def clamp_angle(angle: float) -> float:
     """
     角度を-180 ~ 180の範囲にする.
@@ -28,3 +32,30 @@ def clamp_angle(angle: float) -> float:
         elif angle < -math.pi:
             angle += math.pi * 2.0
     return angle
+
+
+def clamp_angle_array(angle: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    """
+    clamp_angle の配列版．各要素の角度を-180 ~ 180の範囲にする.\n
+    clamp_angle と同じ手順で 2π を加減するため，結果は要素ごとに一致する．
+
+    Parameters
+    ----------
+    angle : ArrayLike
+        角度の配列 [rad]
+
+    Returns
+    -------
+    res : NDArray[np.float64]
+        角度の配列 [rad]
+    """
+    res = np.array(angle, dtype=np.float64)
+
+    # 範囲外の要素が残っている間だけ 2π を加減する．
+    while True:
+        over = res > math.pi
+        under = res < -math.pi
+        if not (over.any() or under.any()):
+            return res
+        res[over] -= math.pi * 2.0
+        res[under] += math.pi * 2.0
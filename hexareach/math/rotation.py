@@ -0,0 +1,54 @@
+"""
+rotation.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import numpy as np
+import numpy.typing as npt
+
+
+def rotation_matrix_rpy(
+    roll: npt.ArrayLike, pitch: npt.ArrayLike, yaw: npt.ArrayLike
+) -> npt.NDArray[np.float64]:
+    """
+    ロール，ピッチ，ヨー角から回転行列を求める．
+    x軸周りにロール，y軸周りにピッチ，z軸周りにヨーの順に回転する(R = Rz(yaw) Ry(pitch) Rx(roll))．
+
+    Parameters
+    ----------
+    roll : ArrayLike
+        x軸周りの回転角 [rad]
+    pitch : ArrayLike
+        y軸周りの回転角 [rad]
+    yaw : ArrayLike
+        z軸周りの回転角 [rad]
+
+    Returns
+    -------
+    res : NDArray[np.float64]
+        回転行列の配列，形状は(*S, 3, 3)．Sは roll, pitch, yaw をブロードキャストした形状．
+    """
+    roll_arr, pitch_arr, yaw_arr = np.broadcast_arrays(
+        np.asarray(roll, dtype=np.float64),
+        np.asarray(pitch, dtype=np.float64),
+        np.asarray(yaw, dtype=np.float64),
+    )
+
+    cr, sr = np.cos(roll_arr), np.sin(roll_arr)
+    cp, sp = np.cos(pitch_arr), np.sin(pitch_arr)
+    cy, sy = np.cos(yaw_arr), np.sin(yaw_arr)
+
+    res = np.empty(roll_arr.shape + (3, 3), dtype=np.float64)
+    res[..., 0, 0] = cy * cp
+    res[..., 0, 1] = cy * sp * sr - sy * cr
+    res[..., 0, 2] = cy * sp * cr + sy * sr
+    res[..., 1, 0] = sy * cp
+    res[..., 1, 1] = sy * sp * sr + cy * cr
+    res[..., 1, 2] = sy * sp * cr - cy * sr
+    res[..., 2, 0] = -sp
+    res[..., 2, 1] = cp * sr
+    res[..., 2, 2] = cp * cr
+    return res
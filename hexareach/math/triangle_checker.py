@@ -7,6 +7,7 @@ triangle_checker.py
 # https://opensource.org/licenses/mit-license.php
 
 import numpy as np
+import numpy.typing as npt
 
 
 class TriangleChecker:
@@ -44,3 +45,31 @@ class TriangleChecker:
         if np.abs(len3) + np.abs(len1) <= np.abs(len2):
             return False
         return True
+
+    def check_batch(
+        self, len1: npt.ArrayLike, len2: npt.ArrayLike, len3: npt.ArrayLike
+    ) -> npt.NDArray[np.bool_]:
+        """
+        check の配列版．要素ごとに三角形が成立するかどうかを判定する.
+        引数はブロードキャスト可能な形状であること.
+
+        パラメータ
+        ----------
+        len1 : ArrayLike
+            辺1の長さ
+        len2 : ArrayLike
+            辺2の長さ
+        len3 : ArrayLike
+            辺3の長さ
+
+        Returns
+        -------
+        res : NDArray[np.bool_]
+            三角形が成立する要素がTrueの配列.
+        """
+        abs1 = np.abs(np.asarray(len1, dtype=np.float64))
+        abs2 = np.abs(np.asarray(len2, dtype=np.float64))
+        abs3 = np.abs(np.asarray(len3, dtype=np.float64))
+
+        # check と同じ順序で和をとり，結果を一致させる.
+        return (abs1 + abs2 > abs3) & (abs2 + abs3 > abs1) & (abs3 + abs1 > abs2)
@@ -8,19 +8,31 @@ __init__.py
 
 
 from .approximated_graph_renderer import ApproximatedGraphRenderer
+from .blit_manager import BlitManager
 from .color_param import ColorParam
 from .display_flag import DisplayFlag
+from .display_stats import DisplayStats
 from .hexapod_leg_renderer import HexapodLegRenderer
 from .hexapod_range_of_motion_renderer import HexapodRangeOfMotionRenderer
 from .leg_param_table import LegParamTable
+from .leg_power_tile_renderer import LegPowerTileRenderer
+from .mouse_event_dispatcher import LegState, MouseEventDispatcher, calc_leg_state
 from .mouse_grid_renderer import MouseGridRenderer
+from .workspace_distance_renderer import WorkspaceDistanceRenderer
 
 __all__ = [
     "ApproximatedGraphRenderer",
+    "BlitManager",
     "ColorParam",
     "DisplayFlag",
+    "DisplayStats",
     "HexapodLegRenderer",
     "HexapodRangeOfMotionRenderer",
     "LegParamTable",
+    "LegPowerTileRenderer",
+    "LegState",
+    "MouseEventDispatcher",
+    "calc_leg_state",
     "MouseGridRenderer",
+    "WorkspaceDistanceRenderer",
 ]
@@ -13,7 +13,7 @@ import numpy as np
 
 from .color_param import ColorParam
 from .display_flag import DisplayFlag
-from ..calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from ..calc.calculator_registry import get_leg_range_calculator
 from ..calc.hexapod_param_protocol import HexapodParamProtocol
 
 
@@ -49,7 +49,7 @@ class ApproximatedGraphRenderer:
         z_min_max : Tuple[float, float], optional
             z軸方向の描画範囲（最小値, 最大値）
         """
-        self._calc = HexapodLegRangeCalculator(hexapod_param)
+        self._calc = get_leg_range_calculator(hexapod_param)
         self._ax = ax
         self._color_param = color_param
         self._display_flag = display_flag
@@ -82,14 +82,8 @@ class ApproximatedGraphRenderer:
             z, self._calc.get_approximate_min_leg_raudus()
         )
 
-        # 空の配列を作成。
-        approximated_x_max = np.empty([0])
-
-        for _, z_value in enumerate(z):
-            approximated_x_max = np.append(
-                approximated_x_max,
-                self._calc.get_approximate_max_leg_raudus(z_value),
-            )
+        # z の配列に対する最大半径をまとめて求める。
+        approximated_x_max = self._calc.get_approximate_max_leg_raudus_batch(z)
 
         # x, z で囲まれた領域を塗りつぶす。
         if draw_fill:
@@ -0,0 +1,153 @@
+"""
+blit_manager.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from matplotlib.artist import Artist
+from matplotlib.backend_bases import Event
+from matplotlib.figure import Figure
+
+
+class BlitManager:
+    """
+    マウスの移動に合わせて動くグラフだけを再描画するクラス.\n
+    動かないグラフを描画した背景を保存しておき，背景の上に登録されたグラフだけを描画して画面に転送する．
+    バックエンドが blit に対応していない場合は，図全体を再描画する．
+    """
+
+    def __init__(self, fig: Figure) -> None:
+        """
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            描画対象のFigureオブジェクト.
+        """
+        self._fig = fig
+        self._artists: List[Artist] = []
+        self._background: Optional[object] = None
+
+        # 初期化済みかどうかのフラグ.
+        self._alreadly_init = False
+        # 画像の保存中は背景を保存しないためのフラグ.
+        self._suspended = False
+
+    @property
+    def supports_blit(self) -> bool:
+        """
+        バックエンドが blit に対応しているかどうか.
+        """
+        return bool(getattr(self._fig.canvas, "supports_blit", False))
+
+    def add_artist(self, artist: Artist) -> None:
+        """
+        マウスの移動に合わせて動くグラフを登録する．
+        グラフは axes に追加済みであること．
+
+        Parameters
+        ----------
+        artist : matplotlib.artist.Artist
+            登録するグラフ.
+        """
+
+        # blit に対応していない場合，通常の描画で描かれるよう animated にはしない．
+        if self.supports_blit:
+            artist.set_animated(True)
+
+        self._artists.append(artist)
+
+    def render(self, *, redraw_on_motion: bool = True) -> None:
+        """
+        再描画のイベントをセットする（2回目以降は無視）．\n
+        マウス移動時の再描画は，他のクラスがグラフを更新した後に1度だけ行いたいので，
+        全てのクラスの render を呼び出した後に呼び出すこと．
+
+        Parameters
+        ----------
+        redraw_on_motion : bool
+            Trueの場合，マウス移動時に再描画する．
+            MouseEventDispatcher が再描画する場合はFalseにする．
+        """
+
+        if self._alreadly_init:
+            print(f"{__name__}: Already initialized.")
+            return
+
+        print(f"{__name__}: {self.supports_blit = }")
+
+        # 図全体が描画されたときに背景を保存する関数を登録.
+        self._fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+        # マウス移動時に登録されたグラフを再描画する関数を登録.
+        if redraw_on_motion:
+            self._fig.canvas.mpl_connect("motion_notify_event", self._on_move)
+
+        self._alreadly_init = True
+
+    def update(self) -> None:
+        """
+        登録されたグラフを再描画する．
+        背景がまだ保存されていない場合や，blit に対応していない場合は図全体を再描画する．
+        """
+
+        canvas = self._fig.canvas
+
+        if self._background is None or not self.supports_blit:
+            canvas.draw_idle()
+            return
+
+        canvas.restore_region(self._background)  # type: ignore
+        self._draw_animated()
+        canvas.blit(self._fig.bbox)
+        canvas.flush_events()
+
+    @contextmanager
+    def suspend(self) -> Iterator[None]:
+        """
+        画像を保存する間，登録されたグラフを通常のグラフに戻す．\n
+        animated なグラフは savefig で描画されないため，保存する処理はこの中で行うこと．
+        """
+
+        self._suspended = True
+        animated = [artist.get_animated() for artist in self._artists]
+
+        for artist in self._artists:
+            artist.set_animated(False)
+
+        try:
+            yield
+        finally:
+            for artist, value in zip(self._artists, animated):
+                artist.set_animated(value)
+            self._suspended = False
+
+            # 保存後に背景を取り直す．
+            self._background = None
+            self._fig.canvas.draw_idle()
+
+    def _on_draw(self, event: Optional[Event]) -> None:
+        """図全体が描画されたときに呼び出される関数．"""
+
+        canvas = self._fig.canvas
+
+        if self._suspended or not self.supports_blit:
+            return
+
+        if event is not None and event.canvas is not canvas:
+            return
+
+        self._background = canvas.copy_from_bbox(self._fig.bbox)  # type: ignore
+        self._draw_animated()
+
+    def _on_move(self, _: Event) -> None:
+        """マウスが動いたときに呼び出される関数．"""
+        self.update()
+
+    def _draw_animated(self) -> None:
+        for artist in self._artists:
+            self._fig.draw_artist(artist)
@@ -35,6 +35,13 @@ class CircleRenderer:
         """
         self._ax.add_artist(self._circle)
 
+    @property
+    def artist(self) -> Circle:
+        """
+        描画する円.
+        """
+        return self._circle
+
     def update_center(self, center: tuple[float, float]) -> None:
         """
         円の中心座標を更新するメソッド.
@@ -22,3 +22,5 @@ class ColorParam:
     leg_circle_alpha: float = 0.1
     leg_wedge_color: str = "blue"
     leg_wedge_alpha: float = 1.0
+    distance_field_cmap: str = "coolwarm"
+    distance_field_alpha: float = 0.6
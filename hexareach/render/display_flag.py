@@ -16,6 +16,10 @@ class DisplayFlag:
     leg_wedge_displayed: bool = True
     display_table: bool = True
     display_leg_power: bool = False
+    leg_power_in_background: bool = True
+    leg_power_follow_view: bool = False
     display_approximated_graph: bool = False
     display_mouse_grid: bool = True
     display_ground_line: bool = False
+    display_distance_field: bool = False
+    use_blit: bool = True
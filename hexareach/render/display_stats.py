@@ -0,0 +1,155 @@
+"""
+display_stats.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import bisect
+from contextlib import contextmanager, nullcontext
+import logging
+import time
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Sequence
+
+_logger = logging.getLogger("hexareach.stats")
+
+# 無効な場合に stage が返す，何もしないコンテキストマネージャ．
+_NULL_CONTEXT: ContextManager[None] = nullcontext()
+
+# フレーム時間のヒストグラムの区切り [ms]．最後の区間は上限なし．
+DEFAULT_FRAME_BIN_EDGES: Sequence[float] = (4.0, 8.0, 16.7, 33.3, 50.0, 100.0)
+
+
+class DisplayStats:
+    """
+    グラフの描画にかかった時間と，処理の回数を記録するクラス.\n
+    描画の段階ごとの時間，逆運動学の計算や再描画の回数，マウス操作時のフレーム時間のヒストグラムを記録する．
+    記録した値は logging (ロガー名 hexareach.stats) の DEBUG レベルで出力し，callback にも渡す．
+    無効な場合は何も記録せず，ほとんど処理時間がかからない．
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        callback: Optional[Callable[[str, float], None]] = None,
+        frame_bin_edges: Sequence[float] = DEFAULT_FRAME_BIN_EDGES,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        enabled : bool
+            Falseの場合は何も記録しない．
+        callback : Optional[Callable[[str, float], None]]
+            段階の名前と時間 [s]，またはフレームを表す "frame" と時間 [s] を受け取る関数．
+        frame_bin_edges : Sequence[float]
+            フレーム時間のヒストグラムの区切り [ms]．昇順であること．
+        """
+        self.enabled = enabled
+        self._callback = callback
+        self._frame_bin_edges = list(frame_bin_edges)
+
+        # 段階ごとの時間 [s]．同じ名前の段階が複数回あれば合計する．
+        self.stage_times: Dict[str, float] = {}
+        # 処理ごとの回数．
+        self.counters: Dict[str, int] = {}
+        # フレーム時間のヒストグラム．要素数は len(frame_bin_edges) + 1．
+        self.frame_histogram: List[int] = [0] * (len(self._frame_bin_edges) + 1)
+        self.frame_count = 0
+        self.frame_time_max = 0.0  # [s]
+        self._frame_time_total = 0.0  # [s]
+
+    @property
+    def frame_bin_edges(self) -> List[float]:
+        """フレーム時間のヒストグラムの区切り [ms]"""
+        return list(self._frame_bin_edges)
+
+    @property
+    def frame_time_mean(self) -> float:
+        """フレーム時間の平均 [s]．記録がない場合は0．"""
+        return self._frame_time_total / self.frame_count if self.frame_count else 0.0
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """
+        with 文の中の処理にかかった時間を，段階 name の時間として記録する．
+
+        Parameters
+        ----------
+        name : str
+            段階の名前．
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed_stage(name)
+
+    def count(self, name: str, num: int = 1) -> None:
+        """
+        処理 name の回数を num だけ増やす．
+        """
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + num
+
+    def record_frame(self, seconds: float) -> None:
+        """
+        マウス操作時の1フレームの時間を記録する．
+
+        Parameters
+        ----------
+        seconds : float
+            フレームの計算と再描画にかかった時間 [s]
+        """
+        if not self.enabled:
+            return
+
+        index = bisect.bisect_right(self._frame_bin_edges, seconds * 1000.0)
+        self.frame_histogram[index] += 1
+        self.frame_count += 1
+        self.frame_time_max = max(self.frame_time_max, seconds)
+        self._frame_time_total += seconds
+
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug("frame: %.2f [ms]", seconds * 1000.0)
+        if self._callback is not None:
+            self._callback("frame", seconds)
+
+    def summary(self) -> str:
+        """
+        記録した値をまとめた文字列を返す．
+        """
+
+        lines = [f"{name}: {seconds * 1000.0:.1f} [ms]" for name, seconds in self.stage_times.items()]
+        lines.extend(f"{name}: {num}" for name, num in self.counters.items())
+
+        if self.frame_count > 0:
+            lines.append(
+                f"frames: {self.frame_count}, mean {self.frame_time_mean * 1000.0:.2f} [ms], "
+                f"max {self.frame_time_max * 1000.0:.2f} [ms]"
+            )
+            lower = [0.0] + self._frame_bin_edges
+            for i, num in enumerate(self.frame_histogram):
+                upper = f"{self._frame_bin_edges[i]:g}" if i < len(self._frame_bin_edges) else "inf"
+                lines.append(f"  {lower[i]:g} - {upper} [ms]: {num}")
+
+        return "\n".join(lines)
+
+    @contextmanager
+    def _timed_stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + seconds
+
+            _logger.debug("%s: %.1f [ms]", name, seconds * 1000.0)
+            if self._callback is not None:
+                self._callback(name, seconds)
+
+
+def make_default_display_stats() -> DisplayStats:
+    """
+    ロガー hexareach.stats の DEBUG レベルが有効な場合だけ記録する DisplayStats を作成する．
+    """
+    return DisplayStats(enabled=_logger.isEnabledFor(logging.DEBUG))
@@ -7,17 +7,33 @@ hexapod_leg_power.py
 # https://opensource.org/licenses/mit-license.php
 
 import copy
-from typing import Tuple
+import queue
+import threading
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 from matplotlib import cm
 from matplotlib.axes import Axes
+from matplotlib.backend_bases import Event, TimerBase
+from matplotlib.colorbar import Colorbar
+from matplotlib.contour import QuadContourSet
 from matplotlib.figure import Figure
 import numpy as np
 import numpy.typing as npt
 
+from ..calc.adaptive_leg_power import AdaptiveLegPowerMap, AdaptiveLegPowerSampler
+from ..calc.disk_cache import DiskCache
 from ..calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
 from ..calc.hexapod_param_protocol import HexapodParamProtocol
-from ..calc.leg_power_calculator import LegPowerCalculator
+from ..calc.leg_power_calculator import (
+    LegPowerCalculator,
+    make_leg_power_cache_items,
+    make_leg_power_ranges,
+)
+from ..calc.tiled_leg_power_calculator import TiledLegPowerCalculator
+
+class _Cancelled(Exception):
+    """バックグラウンドの計算が中止されたことを表す例外．"""
+
 
 class HexapodLegPower:
     """
@@ -33,6 +49,9 @@ class HexapodLegPower:
         *,
         step: float = 1.0,
         rect: Tuple[float, float, float, float] = (-100.0, 300.0, -200.0, 200.0),
+        workers: int = 1,
+        cache: Optional[DiskCache] = None,
+        adaptive_step: Optional[float] = None,
     ) -> None:
         """
         Parameters
@@ -55,6 +74,14 @@ class HexapodLegPower:
             z軸の最小値
         z_max : float
             z軸の最大値
+        workers : int
+            力の分布を計算するプロセスの数．2以上の場合はタイルに分割して並列に計算する．
+        cache : Optional[DiskCache]
+            計算した力の分布を保存するキャッシュ．同じ条件で再び描画する場合は計算を省略する．
+        adaptive_step : Optional[float]
+            指定すると，力の分布を AdaptiveLegPowerSampler で四分木に分割して計算し，
+            step の格子に補間して描画する．値は分割する最も細かいセルの1辺の長さ [mm]．
+            この場合，workers と cache は使わない．
         """
         self._figure = figure
         self._ax = ax
@@ -63,12 +90,41 @@ class HexapodLegPower:
         self._z_min = rect[2]
         self._z_max = rect[3]
         self._step = step
+        self._workers = workers
         self._param = hexapod_param
-        self._calc = LegPowerCalculator(hexapod_leg_range_calc, hexapod_param)
+        self._calc: Union[LegPowerCalculator, TiledLegPowerCalculator]
+        if workers == 1:
+            self._calc = LegPowerCalculator(
+                hexapod_leg_range_calc, hexapod_param, cache=cache
+            )
+        else:
+            self._calc = TiledLegPowerCalculator(
+                hexapod_param, workers=workers, cache=cache
+            )
+
+        # バックグラウンドで行の束ごとに計算するときは，束ごとにキャッシュしないよう，
+        # キャッシュを使わない計算機で計算し，まとめてから保存する．
+        self._cache = cache
+        self._band_calc: Union[LegPowerCalculator, TiledLegPowerCalculator]
+        if workers == 1:
+            self._band_calc = LegPowerCalculator(hexapod_leg_range_calc, hexapod_param)
+        else:
+            self._band_calc = TiledLegPowerCalculator(hexapod_param, workers=workers)
 
-        if self._step < 1:
+        self._sampler: Optional[AdaptiveLegPowerSampler] = None
+        self._power_map: Optional[AdaptiveLegPowerMap] = None
+        if adaptive_step is not None:
+            # 最も粗いセルから4回分割する．
+            self._sampler = AdaptiveLegPowerSampler(
+                hexapod_param,
+                hexapod_leg_range_calc=hexapod_leg_range_calc,
+                base_step=16.0 * adaptive_step,
+                min_step=adaptive_step,
+            )
+
+        if self._step <= 0:
             raise ValueError(
-                f"{__name__}: step is less than or equal to 1"
+                f"{__name__}: step is less than or equal to 0"
             )
 
         if self._x_min >= self._x_max:
@@ -77,6 +133,19 @@ class HexapodLegPower:
         if self._z_min >= self._z_max:
             raise ValueError(f"{__name__}: z_min >= z_max")
 
+        self._contourf: Optional[QuadContourSet] = None
+        self._colorbar: Optional[Colorbar] = None
+
+        # バックグラウンドで計算する場合に使う．
+        self._results: "queue.Queue[Tuple[npt.NDArray[np.float64], ...]]" = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer: Optional[TimerBase] = None
+        self._error: Optional[BaseException] = None
+
+        # 描画した力の分布の格子の間隔 [mm]．まだ描画していない場合は None．
+        self.drawn_step: Optional[float] = None
+
     def render(self) -> None:
         """
         x_min < x < x_max , z_min < z < z_max の範囲でグラフを描画する．\n
@@ -95,20 +164,252 @@ class HexapodLegPower:
 
         # x_min < x < x_max , z_min < z < z_max の範囲でグラフを描画するため，
         # min から max まで self.__step づつ増やした数値を格納した配列を作成する．
-        x_range: npt.NDArray[np.float_] = np.arange(self._x_min, self._x_max + 1, self._step)
-        z_range: npt.NDArray[np.float_] = np.arange(self._z_min, self._z_max + 1, self._step)
+        x_range, z_range = self._make_ranges(self._step)
 
         # x*zの要素数を持つ2次元配列power_arrayを作成する(xが列，zが行)
-        power_array = self._calc.calculate(x_range, z_range)
+        power_array = self._calculate(x_range, z_range)
+
+        self._draw(x_range, z_range, power_array, self._step)
+
+    def render_in_background(
+        self,
+        *,
+        coarse_steps: Optional[Sequence[float]] = None,
+        band_rows: Optional[int] = None,
+        interval: int = 100,
+    ) -> None:
+        """
+        力の分布をバックグラウンドのスレッドで計算し，計算が終わった順に描画する．\n
+        粗い間隔の分布から計算するため，まず大まかな分布が表示され，その後細かい分布に置き換わる．
+        adaptive_step を指定した場合は，四分木の分割が十分に速いため，step の分布だけを計算する．\n
+        計算の結果は figure のタイマーで受け取って描画するため，ウィンドウの操作は止まらない．
+        ウィンドウを閉じると計算を中止する．cancel でも中止できる．
+
+        Parameters
+        ----------
+        coarse_steps : Optional[Sequence[float]]
+            最後の step の前に計算する粗い間隔 [mm]．Noneの場合は step の8倍，4倍，2倍とする．
+        band_rows : Optional[int]
+            何行ずつに分けて計算するか．中止の要求は行の束の間で確認する．
+            Noneの場合は，1プロセスで計算するときは32行ずつ，
+            複数のプロセスで計算するときは分けずに計算する．
+        interval : int
+            計算の結果を確認する間隔 [ms]
+        """
+
+        if self._thread is not None:
+            raise ValueError(f"{__name__}: render_in_background is already called")
+
+        if coarse_steps is None:
+            coarse_steps = (8.0 * self._step, 4.0 * self._step, 2.0 * self._step)
+        if self._sampler is not None:
+            coarse_steps = ()
+        steps = sorted(
+            {float(step) for step in coarse_steps if step > self._step}, reverse=True
+        ) + [self._step]
+
+        if band_rows is None:
+            band_rows = 32 if self._workers == 1 else 0
+        if band_rows < 0:
+            raise ValueError(f"{__name__}: band_rows is less than 0")
+
+        print(
+            f"{__name__}: Draws the distribution of forces in the background. "
+            f"{steps = }[mm]"
+        )
+
+        self._thread = threading.Thread(
+            target=self._calculate_levels, args=(steps, band_rows), daemon=True
+        )
+        self._thread.start()
+
+        self._figure.canvas.mpl_connect("close_event", self._on_close)
+        self._timer = self._figure.canvas.new_timer(interval=interval)
+        self._timer.add_callback(self.poll)
+        self._timer.start()
+
+    @property
+    def done(self) -> bool:
+        """バックグラウンドの計算が終わり，全ての結果を描画したか．中止した場合も True．"""
+        return (
+            self._thread is not None
+            and not self._thread.is_alive()
+            and self._results.empty()
+        )
+
+    def cancel(self) -> None:
+        """バックグラウンドの計算を中止する．計算中の行の束が終わった時点で止まる．"""
+        self._cancel_event.set()
+        if self._timer is not None:
+            self._timer.stop()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        バックグラウンドの計算が終わるまで待つ．結果の描画は poll で行う．
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll(self) -> bool:
+        """
+        バックグラウンドで計算が終わった分布のうち，最も細かいものを描画する．\n
+        タイマーから呼ばれるが，タイマーのないバックエンドでは直接呼んでもよい．
+
+        Returns
+        -------
+        drawn : bool
+            新しく描画した場合は True．
+        """
+
+        latest: Optional[Tuple[npt.NDArray[np.float64], ...]] = None
+        while True:
+            try:
+                latest = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            self.cancel()
+            raise error
+
+        if self.done and self._timer is not None:
+            self._timer.stop()
+
+        if latest is None or self._cancel_event.is_set():
+            return False
+
+        x_range, z_range, power_array, step = latest
+        self._draw(x_range, z_range, power_array, float(step))
+        self._figure.canvas.draw_idle()
+        return True
+
+    def _calculate_levels(self, steps: List[float], band_rows: int) -> None:
+        """
+        バックグラウンドのスレッドで，粗い間隔から順に力の分布を計算する．
+        """
+
+        try:
+            for step in steps:
+                x_range, z_range = self._make_ranges(step)
+
+                if self._sampler is not None:
+                    power_array = self._calculate_adaptive(x_range, z_range)
+                elif step == self._step and self._cache is not None:
+                    # 最後の分布だけを，render と同じキーで1つにまとめてキャッシュする．
+                    power_array = self._cache.load_or_compute(
+                        "leg_power",
+                        self._param,
+                        make_leg_power_cache_items(
+                            x_range, z_range, 0.0, 1.0, False, self._calc.max_power
+                        ),
+                        lambda: self._calculate_bands(x_range, z_range, band_rows),
+                    )
+                else:
+                    power_array = self._calculate_bands(x_range, z_range, band_rows)
+
+                self._results.put((x_range, z_range, power_array, np.float64(step)))
+        except _Cancelled:
+            return
+        except BaseException as error:  # pylint: disable=broad-except
+            # 例外は描画する側のスレッドで送出する．
+            self._error = error
+
+    def _calculate_bands(
+        self,
+        x_range: npt.NDArray[np.float64],
+        z_range: npt.NDArray[np.float64],
+        band_rows: int,
+    ) -> npt.NDArray[np.float64]:
+        """
+        band_rows 行ずつ力の分布を計算する．中止の要求があれば _Cancelled を送出する．
+        """
+        rows = band_rows if band_rows > 0 else len(z_range)
+        power_array = np.empty((len(z_range), len(x_range)), dtype=np.float64)
+        for z0 in range(0, len(z_range), rows):
+            if self._cancel_event.is_set():
+                raise _Cancelled()
+            power_array[z0:z0 + rows] = self._band_calc.calculate(
+                x_range, z_range[z0:z0 + rows]
+            )
+        return power_array
+
+    def _calculate_adaptive(
+        self, x_range: npt.NDArray[np.float64], z_range: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """
+        四分木で分割した力の分布を補間する．中止の要求があれば _Cancelled を送出する．
+        """
+        assert self._sampler is not None
+        if self._power_map is None:
+            self._power_map = self._sampler.sample(
+                (self._x_min, self._x_max + 1, self._z_min, self._z_max + 1),
+                should_stop=self._cancel_event.is_set,
+            )
+            if self._power_map is None:
+                raise _Cancelled()
+        return self._power_map.resample(x_range, z_range)
+
+    def _calculate(
+        self, x_range: npt.NDArray[np.float64], z_range: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """
+        x*zの要素数を持つ2次元配列で力の分布を求める(xが列，zが行)．
+        """
+        if self._sampler is None:
+            return self._calc.calculate(x_range, z_range)
+
+        # 四分木の分割は1度だけ行い，どの間隔の格子にも補間して使う．
+        if self._power_map is None:
+            self._power_map = self._sampler.sample(
+                (self._x_min, self._x_max + 1, self._z_min, self._z_max + 1)
+            )
+        assert self._power_map is not None
+        return self._power_map.resample(x_range, z_range)
+
+    def _on_close(self, _: Event) -> None:
+        self.cancel()
+
+    def _make_ranges(
+        self, step: float
+    ) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        step ごとの x と z の座標の配列を作成する．
+        """
+        return make_leg_power_ranges(
+            (self._x_min, self._x_max, self._z_min, self._z_max), step
+        )
+
+    def _draw(
+        self,
+        x_range: npt.NDArray[np.float64],
+        z_range: npt.NDArray[np.float64],
+        power_array: npt.NDArray[np.float64],
+        step: float,
+    ) -> None:
+        """
+        力の分布を等高線で描画する．既に描画している場合は置き換える．
+        """
+
+        if self._contourf is not None:
+            self._contourf.remove()
 
         # power_arrayを等高線で描画する
         cmap = copy.copy(cm.get_cmap("jet"))
         cmap.set_under("silver")
         cmap.set_over("silver")
-        power_contourf = self._ax.contourf(  # type: ignore
-            x_range, z_range, power_array, cmap=cmap, levels=20, vmin=4.0, vmax=20.0
+        # バックグラウンドで後から描画しても他のグラフの下になるように，zorder を下げる．
+        self._contourf = self._ax.contourf(  # type: ignore
+            x_range, z_range, power_array, cmap=cmap, levels=20, vmin=4.0, vmax=20.0,
+            zorder=0.5,
         )
+        self.drawn_step = step
 
         # カラーバーを表示する
-        cbar = self._figure.colorbar(power_contourf)  # type: ignore
-        cbar.set_label("[N]", fontsize=20)  # type: ignore
+        contourf: Any = self._contourf
+        if self._colorbar is None:
+            self._colorbar = self._figure.colorbar(contourf)  # type: ignore
+            self._colorbar.set_label("[N]", fontsize=20)  # type: ignore
+        else:
+            self._colorbar.update_normal(contourf)
+            contourf.colorbar = self._colorbar
@@ -14,12 +14,14 @@ from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from matplotlib.backend_bases import Event, MouseEvent
 
+from .blit_manager import BlitManager
 from .color_param import ColorParam
 from .display_flag import DisplayFlag
 from .circle_rednerer import CircleRenderer
 from .leg_param_table import LegParamTable
+from .mouse_event_dispatcher import LegState, MouseEventDispatcher, calc_leg_state
 from .wedge_rednerer import WedgeRenderer
-from ..calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from ..calc.calculator_registry import get_leg_range_calculator
 from ..calc.hexapod_param_protocol import HexapodParamProtocol
 
 class HexapodLegRenderer:
@@ -35,11 +37,35 @@ class HexapodLegRenderer:
         ax_table: Optional[Axes],
         *,
         color_param: ColorParam = ColorParam(),
-        display_flag: DisplayFlag = DisplayFlag()
+        display_flag: DisplayFlag = DisplayFlag(),
+        blit_manager: Optional[BlitManager] = None,
+        dispatcher: Optional[MouseEventDispatcher] = None,
     ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        fig : matplotlib.figure.Figure
+            描画対象のFigureオブジェクト.
+        ax : matplotlib.axes.Axes
+            描画対象のAxesオブジェクト.
+        ax_table : Optional[matplotlib.axes.Axes]
+            表を描画するAxesオブジェクト．Noneの場合は表を表示しない．
+        color_param : ColorParam, optional
+            グラフの色や透明度のパラメータ.
+        display_flag : DisplayFlag, optional
+            描画オプションのフラグ.
+        blit_manager : Optional[BlitManager]
+            マウスの移動に合わせて動くグラフだけを再描画するためのインスタンス．
+            Noneの場合はマウスが動くたびに図全体を再描画する．
+        dispatcher : Optional[MouseEventDispatcher]
+            マウスの移動イベントをまとめて処理するインスタンス．
+            指定した場合は逆運動学を自身では計算せず，計算結果を受け取って描画する．
+        """
         self._fig_name = "result/img.png"
 
-        self._calc = HexapodLegRangeCalculator(hexapod_param)
+        self._calc = get_leg_range_calculator(hexapod_param)
         self._param = hexapod_param
 
         self._fig = fig
@@ -47,6 +73,8 @@ class HexapodLegRenderer:
         self._table = LegParamTable(ax_table)  # type: ignore
         self._color_param = color_param
         self._display_flag = display_flag
+        self._blit_manager = blit_manager
+        self._dispatcher = dispatcher
 
         self._wedge_r = 20.0  # 扇形の半径．
 
@@ -143,8 +171,15 @@ class HexapodLegRenderer:
         self._error_joint.set_markersize(12)  # 点の大きさを変える．
         self._error_joint.set_color("red")  # 色を変える．
 
+        # マウスの移動に合わせて動くグラフを登録．
+        if self._blit_manager is not None:
+            self._register_blit_artists(self._blit_manager)
+
         # マウスが動いたときに呼び出す関数を設定．
-        self._fig.canvas.mpl_connect("motion_notify_event", self._on_update)
+        if self._dispatcher is None:
+            self._fig.canvas.mpl_connect("motion_notify_event", self._on_update)
+        else:
+            self._dispatcher.subscribe(self._on_leg_state)
 
         # マウスが左クリックされたときに呼び出す関数を設定．
         self._fig.canvas.mpl_connect("button_press_event", self._on_click)
@@ -166,9 +201,18 @@ class HexapodLegRenderer:
             return
 
         # 脚の角度を計算．
-        res, self._joint_pos, angle = self._calc.calc_inverse_kinematics_xz(
-            mouse_x, mouse_z, self._reverse
-        )
+        self._on_leg_state(calc_leg_state(self._calc, mouse_x, mouse_z, self._reverse))
+
+        # グラフを再描画．blit する場合は BlitManager がまとめて再描画する．
+        if self._blit_manager is None:
+            plt.draw()
+
+    def _on_leg_state(self, state: LegState) -> None:
+        """逆運動学の計算結果から，脚のグラフと表を更新する．"""
+
+        self._joint_pos = state.joint_pos
+        angle = state.angle
+
         self._leg_graph.set_data(self._joint_pos)
         self._leg_graph.set_visible(True)
 
@@ -193,21 +237,19 @@ class HexapodLegRenderer:
             )
 
         # 失敗しているならば色を変える．
-        if res:
+        if state.success:
             self._leg_graph.set_color("blue")
 
             # 可動範囲外ならばそのプロットの色を変える．
-            if not self._calc.is_theta2_in_range(
-                angle[1]
-            ) or not self._calc.is_theta3_in_range(angle[2]):
+            if not state.theta2_in_range or not state.theta3_in_range:
 
                 error_point: List[List[float]] = [[], []]
 
-                if not self._calc.is_theta2_in_range(angle[1]):
+                if not state.theta2_in_range:
                     error_point[0].append(self._joint_pos[0][1])
                     error_point[1].append(self._joint_pos[1][1])
 
-                if not self._calc.is_theta3_in_range(angle[2]):
+                if not state.theta3_in_range:
                     error_point[0].append(self._joint_pos[0][2])
                     error_point[1].append(self._joint_pos[1][2])
 
@@ -220,21 +262,13 @@ class HexapodLegRenderer:
             self._leg_graph.set_color("red")
 
         # 表を更新．
-        _, ar_s, ar_ls, ar_rs = self._calc.calc_inverse_kinematics_xz_arduino(
-            mouse_x, -mouse_z
-        )
-
         self._table.on_update(
             angle,
-            ar_s,
-            ar_ls,
-            ar_rs
+            state.servo,
+            state.left_servo,
+            state.right_servo
         )
 
-        # グラフを再描画．
-        plt.draw()
-        return
-
     def _on_click(self, event: Event):
         if not isinstance(event, MouseEvent):
             # マウスイベントでない場合は何もしない．
@@ -250,17 +284,57 @@ class HexapodLegRenderer:
 
         # 中クリックされた場合は反転．
         elif event.button == middle_click_index:
-            self._reverse = not self._reverse
-            self._on_update(event)
+            if self._dispatcher is None:
+                self._reverse = not self._reverse
+                self._on_update(event)
+            else:
+                self._dispatcher.toggle_reverse()
 
         # 左クリックされた場合は表示を更新．
         elif event.button == left_click_index:
-            self._fig.savefig(self._fig_name, transparent=True)  #type: ignore
+            self._save_fig()
             self._leg_graph_click.set_visible(True)
             self._joint_pos_click = self._joint_pos
             self._leg_graph_click.set_data(self._joint_pos_click)
 
-        plt.draw()
+        if self._blit_manager is None:
+            plt.draw()
+        else:
+            self._blit_manager.update()
+
+    def _save_fig(self) -> None:
+        """
+        図を画像として保存する．
+        """
+
+        if self._blit_manager is None:
+            self._fig.savefig(self._fig_name, transparent=True)  #type: ignore
+            return
+
+        # animated なグラフは保存されないため，一時的に通常のグラフに戻す．
+        with self._blit_manager.suspend():
+            self._fig.savefig(self._fig_name, transparent=True)  #type: ignore
+
+    def _register_blit_artists(self, blit_manager: BlitManager) -> None:
+        """
+        マウスの移動に合わせて動くグラフを BlitManager に登録する．
+        """
+
+        if self._display_flag.leg_circle_displayed:
+            blit_manager.add_artist(self._femur_circle.artist)
+            blit_manager.add_artist(self._tibia_circle.artist)
+
+        if self._display_flag.leg_wedge_displayed:
+            blit_manager.add_artist(self._femur_wedge.artist)
+            blit_manager.add_artist(self._tibia_wedge.artist)
+
+        blit_manager.add_artist(self._leg_graph)
+        blit_manager.add_artist(self._leg_graph_click)
+        blit_manager.add_artist(self._error_joint)
+
+        # 表全体の描画は重いため，値が変わるセルだけを登録する．
+        for cell in self._table.value_cells:
+            blit_manager.add_artist(cell)
 
     def set_img_file_name(self, file_name: str) -> None:
         """
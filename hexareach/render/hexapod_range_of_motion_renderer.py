@@ -6,7 +6,7 @@ hexapod_range_of_motion_renderer.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Tuple
 
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
@@ -14,7 +14,7 @@ from matplotlib.lines import Line2D
 import numpy as np
 from numpy.typing import NDArray
 
-from ..calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from ..calc.calculator_registry import get_calculator_registry
 from ..calc.hexapod_param_protocol import HexapodParamProtocol
 from .color_param import ColorParam
 
@@ -31,6 +31,7 @@ class HexapodRangeOfMotionRenderer:
         ax: Axes,
         *,
         color_param: ColorParam = ColorParam(),
+        adaptive_tolerance: Optional[float] = None,
     ) -> None:
         """
         Parameters
@@ -47,13 +48,16 @@ class HexapodRangeOfMotionRenderer:
             上向きの可動範囲の透明度．
         lowwer_alpha : float
             下向きの可動範囲の透明度．
+        adaptive_tolerance : Optional[float]
+            可動範囲の線を折れ線で近似したときに許す誤差 [mm]．
+            指定すると，線の曲率に応じて点の数を減らす．Noneの場合は一定の角度刻みで描画する．
         """
-        self._calc = HexapodLegRangeCalculator(hexapod_param)
         self._param = hexapod_param
         self._fig = fig
         self._ax = ax
         self._color_param = color_param
         self._step = 0.001
+        self._adaptive_tolerance = adaptive_tolerance
 
         self._upper_leg: Optional[List[Line2D]] = None
         self._lower_leg: Optional[List[Line2D]] = None
@@ -163,21 +167,27 @@ class HexapodRangeOfMotionRenderer:
             透明度．
         """
 
-        # minからmaxまでstep刻みで配列を作成.
-        femur_range = np.arange(theta2_min, theta2_max, self._step)
-        tibia_range = np.arange(theta3_min, theta3_max, self._step)
+        # 境界線はパラメータの値ごとに共有されるので，同じロボットなら1度だけ計算する．
+        bounds = (theta2_min, theta2_max, theta3_min, theta3_max)
+        boundary = get_calculator_registry().get_table(
+            self._param,
+            f"range_of_motion_boundary:{bounds}:{self._step}:{self._adaptive_tolerance}",
+            lambda calc: calc.calc_range_of_motion_boundary(
+                *bounds, step=self._step, tolerance=self._adaptive_tolerance
+            ),
+        )
 
         # femur joint (min ~ max) , tibia joint (min).
-        _1 = self._make_leg_line(femur_range, np.array([theta3_min]), color_value, alpha_vaule)
+        _1 = self._make_leg_line(boundary[0], color_value, alpha_vaule)
 
         # femur joint (min ~ max) , tibia joint (max).
-        _2 = self._make_leg_line(femur_range, np.array([theta3_max]), color_value, alpha_vaule)
+        _2 = self._make_leg_line(boundary[1], color_value, alpha_vaule)
 
         # femur joint (min) , tibia joint (min ~ max).
-        _3 = self._make_leg_line(np.array([theta2_min]), tibia_range, color_value, alpha_vaule)
+        _3 = self._make_leg_line(boundary[2], color_value, alpha_vaule)
 
         # femur joint (max) , tibia joint (min ~ max).
-        _4 = self._make_leg_line(np.array([theta2_max]), tibia_range, color_value, alpha_vaule)
+        _4 = self._make_leg_line(boundary[3], color_value, alpha_vaule)
 
         # 1 ~ 4の結果をリストに追加する.
         if is_upper:
@@ -197,35 +207,21 @@ class HexapodRangeOfMotionRenderer:
 
     def _make_leg_line(
         self,
-        theta2: NDArray[np.float64],
-        theta3: NDArray[np.float64],
+        line: Tuple[NDArray[np.float64], NDArray[np.float64]],
         color_value: str,
         alpha_vaule: float,
     ) -> List[Line2D]:
         """
-        間接を回しながら，脚先の座標をプロットしていく．
+        計算済みの脚先の座標をプロットする．
 
         Parameters
         ----------
-        theta2 : np.ndarray or list[float]
-            theta2の配列．
-        theta3 : np.ndarray or list[float]
-            theta3の配列．
+        line : Tuple[NDArray[np.float64], NDArray[np.float64]]
+            脚先のx座標とz座標の配列．
         color_value : str
             色．
         alpha_vaule : float
             透明度．
         """
 
-        line_x: List[float] = []
-        line_z: List[float] = []
-
-        for _, t2 in enumerate(theta2):
-            for _, t3 in enumerate(theta3):
-                res, x, z = self._calc.get_leg_position_xz(t2, t3)
-
-                if res:
-                    line_x.append(x)
-                    line_z.append(z)
-
-        return self._ax.plot(line_x, line_z, color=color_value, alpha=alpha_vaule)  # type: ignore
+        return self._ax.plot(line[0], line[1], color=color_value, alpha=alpha_vaule)  # type: ignore
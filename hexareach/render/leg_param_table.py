@@ -61,6 +61,17 @@ class LegParamTable:
         self._show = True
 
 
+    @property
+    def value_cells(self) -> List[Cell]:
+        """
+        on_update で値が更新されるセル．表示しない場合は空のリスト.
+        """
+        if not self._show:
+            return []
+        return [
+            cell for (i, j), cell in sorted(self._cell_info.items()) if i >= 1 and j == 1
+        ]
+
     def on_update(
             self,
             joint_angles: List[float],
@@ -0,0 +1,194 @@
+"""
+leg_power_tile_renderer.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import copy
+from typing import Any, List, Optional, Tuple
+
+from matplotlib import cm
+from matplotlib.axes import Axes
+from matplotlib.backend_bases import TimerBase
+from matplotlib.colorbar import Colorbar
+from matplotlib.contour import QuadContourSet
+from matplotlib.figure import Figure
+import numpy as np
+
+from ..calc.calculator_registry import get_leg_range_calculator
+from ..calc.hexapod_param_protocol import HexapodParamProtocol
+from ..calc.leg_power_tile_cache import LegPowerTileCache, TileKey
+
+
+class LegPowerTileRenderer:
+    """
+    脚の力の分布を，表示している範囲に合わせて描画するクラス．\n
+    軸の範囲が変わると，拡大率に合った段階のタイルのうち足りないものだけを計算し，
+    タイルを並べ直して描画する．計算したタイルは LegPowerTileCache に保持する．
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        figure: Figure,
+        ax: Axes,
+        *,
+        tile_cache: Optional[LegPowerTileCache] = None,
+        samples: int = 200,
+        min_step: float = 0.25,
+        delay: int = 50,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        figure : plt.Figure
+            matplotlibのfigureオブジェクト
+        ax : matplotlib.axes.Axes
+            matplotlibのaxesオブジェクト
+        tile_cache : Optional[LegPowerTileCache]
+            タイルを保持するキャッシュ．Noneの場合は作成する．
+        samples : int
+            表示している範囲の長い方の辺に並べる格子点の数の目安．
+        min_step : float
+            これより細かい格子では計算しない [mm]．
+        delay : int
+            軸の範囲が変わってから描画し直すまでの時間 [ms]．
+            拡大・移動の操作が続く間は描画し直さない．
+        """
+        if samples < 1:
+            raise ValueError(f"{__name__}: samples must be 1 or more")
+
+        if min_step <= 0.0:
+            raise ValueError(f"{__name__}: min_step must be greater than 0")
+
+        if tile_cache is None:
+            tile_cache = LegPowerTileCache(
+                hexapod_param, hexapod_leg_range_calc=get_leg_range_calculator(hexapod_param)
+            )
+
+        self._figure = figure
+        self._ax = ax
+        self._tile_cache = tile_cache
+        self._samples = samples
+        self._max_level = int(np.floor(np.log2(tile_cache.step(0) / min_step)))
+        self._delay = delay
+
+        self._contourf: Optional[QuadContourSet] = None
+        self._colorbar: Optional[Colorbar] = None
+        self._timer: Optional[TimerBase] = None
+        self._drawn_keys: Optional[List[TileKey]] = None
+        self._drawing = False
+
+    @property
+    def tile_cache(self) -> LegPowerTileCache:
+        """タイルを保持するキャッシュ"""
+        return self._tile_cache
+
+    @property
+    def level(self) -> Optional[int]:
+        """描画しているタイルの段階．まだ描画していない場合は None．"""
+        return None if not self._drawn_keys else self._drawn_keys[0][0]
+
+    def render(self) -> None:
+        """
+        表示している範囲の力の分布を描画し，軸の範囲が変わったときに描画し直すよう登録する．\n
+        軸の範囲を設定した後に呼ぶこと．
+        """
+
+        print(f"{__name__}: Draws the distribution of forces for the visible range.")
+        print(f"{__name__}: {self._samples = }, {self._tile_cache.tile_size = }")
+
+        self.update()
+
+        self._ax.callbacks.connect("xlim_changed", self._on_lim_changed)
+        self._ax.callbacks.connect("ylim_changed", self._on_lim_changed)
+
+    def update(self) -> bool:
+        """
+        表示している範囲に必要なタイルが変わっていれば，描画し直す．\n
+        タイマーから呼ばれるが，タイマーのないバックエンドでは直接呼んでもよい．
+
+        Returns
+        -------
+        drawn : bool
+            描画し直した場合は True．
+        """
+
+        rect = self._get_view_rect()
+        level = self._tile_cache.choose_level(
+            max(rect[1] - rect[0], rect[3] - rect[2]), self._samples,
+            max_level=self._max_level,
+        )
+        keys = self._tile_cache.tile_keys(level, rect)
+        if keys == self._drawn_keys:
+            return False
+
+        x_range, z_range, power_array = self._tile_cache.compose(level, rect)
+        self._draw(x_range, z_range, power_array)
+        self._drawn_keys = keys
+        return True
+
+    def _get_view_rect(self) -> Tuple[float, float, float, float]:
+        x_min, x_max = sorted(self._ax.get_xlim())
+        z_min, z_max = sorted(self._ax.get_ylim())
+        return (x_min, x_max, z_min, z_max)
+
+    def _on_lim_changed(self, _: Axes) -> None:
+        if self._drawing:
+            return
+
+        # x と y の範囲は続けて変わるため，少し待ってから1度だけ描画し直す．
+        if self._timer is None:
+            self._timer = self._figure.canvas.new_timer(interval=self._delay)
+            self._timer.single_shot = True
+            self._timer.add_callback(self._on_timer)
+        self._timer.stop()
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        if self.update():
+            self._figure.canvas.draw_idle()
+
+    def _draw(
+        self,
+        x_range: Any,
+        z_range: Any,
+        power_array: Any,
+    ) -> None:
+        """
+        力の分布を等高線で描画する．既に描画している場合は置き換える．
+        """
+
+        # 等高線の描画で軸の範囲が自動で広がらないよう，描画後に元に戻す．
+        xlim = self._ax.get_xlim()
+        ylim = self._ax.get_ylim()
+        self._drawing = True
+        try:
+            if self._contourf is not None:
+                self._contourf.remove()
+
+            # タイルを並べ直しても色が変わらないよう，等高線の値は固定する．
+            cmap = copy.copy(cm.get_cmap("jet"))
+            cmap.set_under("silver")
+            cmap.set_over("silver")
+            self._contourf = self._ax.contourf(  # type: ignore
+                x_range, z_range, power_array, cmap=cmap,
+                levels=np.linspace(0.0, 20.0, 21), vmin=4.0, vmax=20.0, zorder=0.5,
+            )
+
+            contourf: Any = self._contourf
+            if self._colorbar is None:
+                self._colorbar = self._figure.colorbar(contourf)  # type: ignore
+                self._colorbar.set_label("[N]", fontsize=20)  # type: ignore
+            else:
+                self._colorbar.update_normal(contourf)
+                contourf.colorbar = self._colorbar
+
+            self._ax.set_xlim(xlim, emit=False)
+            self._ax.set_ylim(ylim, emit=False)
+        finally:
+            self._drawing = False
@@ -0,0 +1,246 @@
+"""
+mouse_event_dispatcher.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+
+from matplotlib.backend_bases import Event, MouseEvent
+from matplotlib.figure import Figure
+
+from .blit_manager import BlitManager
+from .display_stats import DisplayStats
+from ..calc.calculator_registry import get_leg_range_calculator
+from ..calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from ..calc.hexapod_param_protocol import HexapodParamProtocol
+
+
+class LegState(NamedTuple):
+    """
+    マウス位置に脚先を置いたときの，逆運動学の計算結果．
+    """
+
+    # 脚先のx座標 [mm]
+    x: float
+    # 脚先のz座標 [mm]
+    z: float
+    # 脚がとどかず計算できなければFalse．
+    success: bool
+    # 脚の関節の座標，coxa(付け根),femur,tibia,脚先の順 x[mm],z[mm]
+    joint_pos: List[List[float]]
+    # 脚の関節の角度，coxa,femur,tibiaの順 [rad]
+    angle: List[float]
+    # femur 関節が可動範囲内かどうか．
+    theta2_in_range: bool
+    # tibia 関節が可動範囲内かどうか．
+    theta3_in_range: bool
+    # Arduinoのプログラムで計算したサーボ角，coxa,femur,tibiaの順 [0~1023]
+    servo: List[int]
+    # 左足のサーボ角，coxa,femur,tibiaの順 [0~1023]
+    left_servo: List[int]
+    # 右足のサーボ角，coxa,femur,tibiaの順 [0~1023]
+    right_servo: List[int]
+    # 2つある逆運動学解のうち，脚先が上を向く方を選んだかどうか．
+    reverse: bool
+
+
+def calc_leg_state(
+    calc: HexapodLegRangeCalculator, x: float, z: float, reverse: bool
+) -> LegState:
+    """
+    脚先の座標から，描画に必要な逆運動学の計算結果をまとめて求める．
+
+    Parameters
+    ----------
+    calc : HexapodLegRangeCalculator
+        脚の可動範囲を計算するためのインスタンス．
+    x : float
+        脚先のx座標 [mm]
+    z : float
+        脚先のz座標 [mm]
+    reverse : bool
+        逆運動学解のどちらを選択するかを決めるフラグ.
+
+    Returns
+    -------
+    state : LegState
+        計算結果．
+    """
+
+    success, joint_pos, angle = calc.calc_inverse_kinematics_xz(x, z, reverse)
+    _, servo, left_servo, right_servo = calc.calc_inverse_kinematics_xz_arduino(x, -z)
+
+    return LegState(
+        x=x,
+        z=z,
+        success=success,
+        joint_pos=joint_pos,
+        angle=angle,
+        theta2_in_range=calc.is_theta2_in_range(angle[1]),
+        theta3_in_range=calc.is_theta3_in_range(angle[2]),
+        servo=servo,
+        left_servo=left_servo,
+        right_servo=right_servo,
+        reverse=reverse,
+    )
+
+
+class MouseEventDispatcher:
+    """
+    マウスの移動イベントをまとめて処理するクラス.\n
+    最後のイベントだけを残して max_update_rate 以下の頻度で逆運動学を1度だけ計算し，
+    結果を登録された全ての関数に渡した後，1度だけ再描画する．
+    """
+
+    def __init__(
+        self,
+        fig: Figure,
+        hexapod_param: HexapodParamProtocol,
+        *,
+        max_update_rate: Optional[float] = 60.0,
+        blit_manager: Optional[BlitManager] = None,
+        stats: Optional[DisplayStats] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        fig : matplotlib.figure.Figure
+            描画対象のFigureオブジェクト.
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        max_update_rate : Optional[float]
+            1秒あたりの最大の更新回数 [Hz]．Noneの場合は全てのイベントを処理する．
+        blit_manager : Optional[BlitManager]
+            再描画に使用するインスタンス．Noneの場合は図全体を再描画する．
+        stats : Optional[DisplayStats]
+            逆運動学の計算と再描画の回数，フレーム時間を記録するインスタンス．
+        """
+        if max_update_rate is not None and max_update_rate <= 0:
+            raise ValueError(f"{__name__}: max_update_rate must be positive")
+
+        self._fig = fig
+        self._calc = get_leg_range_calculator(hexapod_param)
+        self._blit_manager = blit_manager
+        self._stats = stats if stats is not None else DisplayStats(enabled=False)
+        self._interval = 0.0 if max_update_rate is None else 1.0 / max_update_rate
+
+        self._subscribers: List[Callable[[LegState], None]] = []
+
+        # 反転フラグ，逆運動学解の解が2つあるため，どちらを選ぶかを決める．
+        self._reverse = False
+
+        # まだ処理していない最新のマウス位置と，最後に処理したマウス位置．
+        self._pending: Optional[Tuple[float, float]] = None
+        self._last: Optional[Tuple[float, float]] = None
+        self._last_update_time = -float("inf")
+
+        self._timer: Any = None
+        self._alreadly_init = False
+
+    @property
+    def reverse(self) -> bool:
+        """
+        2つある逆運動学解のうち，脚先が上を向く方を選ぶかどうか．
+        """
+        return self._reverse
+
+    def subscribe(self, callback: Callable[[LegState], None]) -> None:
+        """
+        逆運動学の計算結果を受け取る関数を登録する．
+
+        Parameters
+        ----------
+        callback : Callable[[LegState], None]
+            マウス位置が更新されるたびに呼び出される関数．
+        """
+        self._subscribers.append(callback)
+
+    def render(self) -> None:
+        """
+        マウス移動時のイベントをセットする（2回目以降は無視）．
+        """
+
+        if self._alreadly_init:
+            print(f"{__name__}: Already initialized.")
+            return
+
+        print(f"{__name__}: update interval = {self._interval * 1000.0:.1f} [ms]")
+
+        self._fig.canvas.mpl_connect("motion_notify_event", self._on_move)
+
+        self._alreadly_init = True
+
+    def toggle_reverse(self) -> None:
+        """
+        逆運動学解の選び方を切り替え，最後のマウス位置で計算し直す．
+        """
+
+        self._reverse = not self._reverse
+
+        if self._pending is None:
+            self._pending = self._last
+
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        まだ処理していないマウス位置があれば，すぐに計算して再描画する．
+        """
+
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+        if self._pending is None:
+            return
+
+        x, z = self._pending
+        self._pending = None
+        self._last = (x, z)
+        self._last_update_time = time.perf_counter()
+
+        state = calc_leg_state(self._calc, x, z, self._reverse)
+        self._stats.count("ik_calls")
+
+        for callback in self._subscribers:
+            callback(state)
+
+        # 全ての関数が更新を終えた後に1度だけ再描画する．
+        if self._blit_manager is None:
+            self._fig.canvas.draw_idle()
+        else:
+            self._blit_manager.update()
+
+        # draw_idle の場合，実際の描画は後で行われるためフレーム時間には含まれない．
+        self._stats.count("redraws")
+        if self._stats.enabled:
+            self._stats.record_frame(time.perf_counter() - self._last_update_time)
+
+    def _on_move(self, event: Event) -> None:
+        """マウスが動いたときに呼び出される関数．"""
+        if not isinstance(event, MouseEvent):
+            return
+
+        if event.xdata is None or event.ydata is None:
+            return
+
+        self._stats.count("motion_events")
+
+        # 古いイベントは捨て，最新のマウス位置だけを残す．
+        self._pending = (float(event.xdata), float(event.ydata))
+
+        wait = self._last_update_time + self._interval - time.perf_counter()
+        if wait <= 0:
+            self.flush()
+            return
+
+        # 次に更新できる時刻にタイマーで処理する．
+        if self._timer is None:
+            self._timer = self._fig.canvas.new_timer(interval=max(int(wait * 1000.0), 1))
+            self._timer.single_shot = True
+            self._timer.add_callback(self.flush)
+            self._timer.start()
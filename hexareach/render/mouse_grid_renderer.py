@@ -6,12 +6,16 @@ mouse_grid_renderer.py
 # Released under the MIT license
 # https://opensource.org/licenses/mit-license.php
 
+from typing import Optional
+
 from matplotlib.axes import Axes
 from matplotlib.lines import Line2D
 from matplotlib.figure import Figure
 from matplotlib.backend_bases import Event, MouseEvent
 
+from .blit_manager import BlitManager
 from .color_param import ColorParam
+from .mouse_event_dispatcher import LegState, MouseEventDispatcher
 
 class MouseGridRenderer:
     """
@@ -24,6 +28,8 @@ class MouseGridRenderer:
         ax: Axes,
         *,
         color_param: ColorParam = ColorParam(),
+        blit_manager: Optional[BlitManager] = None,
+        dispatcher: Optional[MouseEventDispatcher] = None,
     ) -> None:
         """
         Parameters
@@ -34,6 +40,10 @@ class MouseGridRenderer:
             描画対象のAxesオブジェクト.
         color_param : ColorParam, optional
             グリッド線の色や透明度のパラメータ.
+        blit_manager : Optional[BlitManager]
+            マウスの移動に合わせて動くグラフだけを再描画するためのインスタンス．
+        dispatcher : Optional[MouseEventDispatcher]
+            マウスの移動イベントをまとめて処理するインスタンス．
         """
         # 初期化済みかどうかのフラグ.
         self._alreadly_init: bool = False
@@ -48,6 +58,8 @@ class MouseGridRenderer:
         self._y_axis.set_linestyle("--")
 
         self._color_param = color_param
+        self._blit_manager = blit_manager
+        self._dispatcher = dispatcher
 
     def render(self) -> None:
         """
@@ -73,8 +85,16 @@ class MouseGridRenderer:
         self._y_axis.set_color(self._color_param.mouse_grid_color)
         self._x_axis.set_color(self._color_param.mouse_grid_color)
 
+        # マウスの移動に合わせて動くグラフとして登録.
+        if self._blit_manager is not None:
+            self._blit_manager.add_artist(self._x_axis)
+            self._blit_manager.add_artist(self._y_axis)
+
         # マウス移動時に線を更新する関数を登録.
-        self._fig.canvas.mpl_connect("motion_notify_event", self._on_move)
+        if self._dispatcher is None:
+            self._fig.canvas.mpl_connect("motion_notify_event", self._on_move)
+        else:
+            self._dispatcher.subscribe(self._on_leg_state)
 
         self._alreadly_init = True
 
@@ -89,3 +109,8 @@ class MouseGridRenderer:
         # マウス位置にグリッド線を移動.
         self._y_axis.set_xdata([float(x)])
         self._x_axis.set_ydata([float(y)])
+
+    def _on_leg_state(self, state: LegState) -> None:
+        # マウス位置にグリッド線を移動.
+        self._y_axis.set_xdata([state.x])
+        self._x_axis.set_ydata([state.z])
@@ -35,6 +35,13 @@ class WedgeRenderer:
         """
         self._ax.add_patch(self._wedge)
 
+    @property
+    def artist(self) -> patch.Wedge:
+        """
+        描画する扇形.
+        """
+        return self._wedge
+
     def update(self, center: tuple[float, float], theta1: float, theta2: float) -> None:
         """
         円の中心座標を更新するメソッド.
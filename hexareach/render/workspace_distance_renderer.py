@@ -0,0 +1,110 @@
+"""
+workspace_distance_renderer.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+from typing import Optional, Sequence, Tuple
+
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+import numpy as np
+
+from ..calc.calculator_registry import get_leg_range_calculator
+from ..calc.hexapod_param_protocol import HexapodParamProtocol
+from ..calc.workspace_distance_field import WorkspaceDistanceField
+from .color_param import ColorParam
+
+
+class WorkspaceDistanceRenderer:
+    """
+    脚の可動範囲の境界までの符号付き距離を，等高線で描画するクラス．
+    """
+
+    def __init__(
+        self,
+        hexapod_param: HexapodParamProtocol,
+        fig: Figure,
+        ax: Axes,
+        *,
+        color_param: ColorParam = ColorParam(),
+        rect: Tuple[float, float, float, float] = (-100.0, 300.0, -200.0, 200.0),
+        resolution: float = 1.0,
+        levels: Sequence[float] = (-40.0, -30.0, -20.0, -10.0, 0.0, 10.0, 20.0, 30.0, 40.0),
+    ) -> None:
+        """
+        Parameters
+        ----------
+        hexapod_param : HexapodParamProtocol
+            パラメータを格納するためのインスタンス．
+        fig : matplotlib.figure.Figure
+            matplotlibのfigureオブジェクト．
+        ax : matplotlib.axes.Axes
+            matplotlibのaxesオブジェクト．
+        color_param : ColorParam
+            グラフの色に関するパラメータ．
+        rect : Tuple[float, float, float, float]
+            描画する範囲 (x_min, x_max, z_min, z_max) [mm]
+        resolution : float
+            距離を求める格子の1辺の長さ [mm]
+        levels : Sequence[float]
+            等高線を引く距離 [mm]．0 の等高線は可動範囲の境界として太く描画する．
+        """
+        self._param = hexapod_param
+        self._fig = fig
+        self._ax = ax
+        self._color_param = color_param
+        self._rect = rect
+        self._resolution = resolution
+        self._levels = tuple(sorted(float(level) for level in levels))
+
+        self.field: Optional[WorkspaceDistanceField] = None
+
+        if self._rect[0] >= self._rect[1]:
+            raise ValueError(f"{__name__}: x_min >= x_max")
+
+        if self._rect[2] >= self._rect[3]:
+            raise ValueError(f"{__name__}: z_min >= z_max")
+
+        if len(self._levels) < 2:
+            raise ValueError(f"{__name__}: levels must have at least 2 values")
+
+    def render(self) -> None:
+        """可動範囲の境界までの距離を描画する．"""
+
+        print(f"{__name__}: Draw the signed distance to the range of motion")
+        print(f"{__name__}: {self._rect = }, {self._resolution = }")
+        print(f"{__name__}: {self._color_param.distance_field_cmap = }")
+
+        self.field = WorkspaceDistanceField.build(
+            self._param,
+            rect=self._rect,
+            resolution=self._resolution,
+            hexapod_leg_range_calc=get_leg_range_calculator(self._param),
+        )
+
+        x_range = self.field.x_range
+        z_range = self.field.z_range
+        distance = self.field.distance
+
+        # 内側(負)と外側(正)で色が分かれるように，0 を中心に色を割り当てる．
+        limit = max(abs(self._levels[0]), abs(self._levels[-1]))
+        self._ax.contour(  # type: ignore
+            x_range, z_range, distance,
+            levels=[level for level in self._levels if level != 0.0],
+            cmap=self._color_param.distance_field_cmap,
+            vmin=-limit, vmax=limit,
+            alpha=self._color_param.distance_field_alpha,
+            linewidths=0.8,
+        )
+
+        if np.min(distance) < 0.0 < np.max(distance):
+            self._ax.contour(  # type: ignore
+                x_range, z_range, distance,
+                levels=[0.0],
+                colors=self._color_param.leg_range_color,
+                alpha=self._color_param.distance_field_alpha,
+                linewidths=1.5,
+            )
@@ -0,0 +1,30 @@
+"""
+sample_main5.py
+ディスプレイのない環境で，複数のグラフを画像として書き出すサンプル.
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import hexareach as hxr
+
+
+if __name__ == "__main__":
+    flag = hxr.DisplayFlag()
+    flag.display_leg_power = True
+
+    # 書き出すグラフの設定を並べる.
+    jobs = [
+        hxr.ExportJob(
+            hxr.PhantomxMk2Param(),
+            f"result/sample_main5_step{step:.0f}.png",
+            display_flag=flag,
+            leg_power_step=step,
+        )
+        for step in (2.0, 5.0)
+    ]
+
+    # workers を2以上にすると, 複数のプロセスで並列に書き出す.
+    exporter = hxr.HeadlessExporter(workers=2)
+    print(exporter.export(jobs))
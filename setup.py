@@ -20,7 +20,6 @@ setup(
         "numpy",
         "matplotlib",
         "scipy",
-        "tqdm",
     ],  # 依存するパッケージのリスト.
     entry_points={
         "console_scripts": [
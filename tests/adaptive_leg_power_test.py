@@ -0,0 +1,116 @@
+"""
+adaptive_leg_power_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import unittest
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+
+from hexareach.calc.adaptive_leg_power import AdaptiveLegPowerSampler
+from hexareach.calc.calculator_registry import get_leg_range_calculator
+from hexareach.calc.leg_power_calculator import LegPowerCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.xr_r1_param import XrR1Param
+from hexareach.render.hexapod_leg_power import HexapodLegPower
+
+
+class TestAdaptiveLegPowerSampler(unittest.TestCase):
+    """
+    Test cases for the AdaptiveLegPowerSampler class.
+    """
+
+    def test_matches_dense_grid(self):
+        """
+        Test if the resampled map keeps the reachability boundary and stays within tolerance.
+        """
+
+        rect = (-100.0, 300.0, -200.0, 200.0)
+        x_range = np.arange(rect[0], rect[1] + 0.01, 0.25)
+        z_range = np.arange(rect[2], rect[3] + 0.01, 0.25)
+
+        for param in (PhantomxMk2Param(), XrR1Param()):
+            sampler = AdaptiveLegPowerSampler(param, base_step=4.0, min_step=0.25, tolerance=0.5)
+            power_map = sampler.sample(rect)
+
+            actual = power_map.resample(x_range, z_range)
+            expected = LegPowerCalculator(None, param).calculate(x_range, z_range)
+
+            self.assertEqual(actual.shape, expected.shape)
+            self.assertEqual(power_map.depth, 4)
+            self.assertEqual(power_map.min_step, 0.25)
+            self.assertLess(power_map.sample_count, 0.1 * power_map.dense_sample_count)
+            np.testing.assert_array_equal(actual > 0.0, expected > 0.0)
+            self.assertLess(np.abs(actual - expected).max(), 0.5)
+
+    def test_leaf_corners_are_exact(self):
+        """
+        Test if resampling at the corners of the base cells returns the exact values.
+        """
+
+        param = PhantomxMk2Param()
+        rect = (0.0, 200.0, -150.0, 50.0)
+        power_map = AdaptiveLegPowerSampler(param, base_step=8.0, min_step=1.0).sample(rect)
+
+        x_range = np.arange(0.0, 200.1, 8.0)
+        z_range = np.arange(-150.0, 50.1, 8.0)
+        np.testing.assert_allclose(
+            power_map.resample(x_range, z_range),
+            LegPowerCalculator(None, param).calculate(x_range, z_range),
+        )
+        self.assertEqual(power_map.leaf_count(), sum(
+            power_map.leaf_count(level) for level in range(power_map.depth + 1)
+        ))
+        self.assertTrue(np.isnan(power_map.resample_points(-10.0, 0.0)))
+
+    def test_should_stop(self):
+        """
+        Test if the sampling stops between levels when requested.
+        """
+
+        calls = []
+
+        def should_stop():
+            calls.append(None)
+            return len(calls) > 2
+
+        sampler = AdaptiveLegPowerSampler(PhantomxMk2Param(), base_step=4.0, min_step=0.25)
+        self.assertIsNone(sampler.sample((0.0, 200.0, -150.0, 50.0), should_stop=should_stop))
+        self.assertEqual(len(calls), 3)
+
+    def test_invalid_steps(self):
+        """
+        Test if steps that are not related by a power of two are rejected.
+        """
+
+        with self.assertRaises(ValueError):
+            AdaptiveLegPowerSampler(PhantomxMk2Param(), base_step=3.0, min_step=1.0)
+        with self.assertRaises(ValueError):
+            AdaptiveLegPowerSampler(PhantomxMk2Param(), base_step=1.0, min_step=2.0)
+
+    def test_leg_power_renderer(self):
+        """
+        Test if HexapodLegPower draws the adaptive map on a uniform grid.
+        """
+
+        param = PhantomxMk2Param()
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        leg_power = HexapodLegPower(
+            get_leg_range_calculator(param), param, fig, ax,
+            rect=(0.0, 200.0, -150.0, 50.0), step=1.0, adaptive_step=0.5,
+        )
+        leg_power.render()
+
+        self.assertEqual(leg_power.drawn_step, 1.0)
+        self.assertEqual(len(ax.collections), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+blit_manager_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import unittest
+
+import numpy as np
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from hexareach.render.blit_manager import BlitManager
+
+
+class TestBlitManager(unittest.TestCase):
+    """
+    Test cases for the BlitManager class.
+    """
+
+    def test_blit_matches_full_draw(self):
+        """
+        Test if blitting the animated line gives the same image as a full redraw.
+        """
+
+        images = []
+
+        for use_blit in (True, False):
+            fig = Figure()
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(1, 1, 1)
+            ax.plot([0.0, 1.0], [0.0, 1.0])
+            (line,) = ax.plot([0.0, 1.0], [1.0, 0.0])
+
+            if use_blit:
+                blit_manager = BlitManager(fig)
+                blit_manager.add_artist(line)
+                blit_manager.render()
+
+            fig.canvas.draw()
+            line.set_data([0.0, 1.0], [0.5, 0.2])
+
+            if use_blit:
+                blit_manager.update()
+            else:
+                fig.canvas.draw()
+
+            images.append(np.asarray(fig.canvas.buffer_rgba()).copy())
+
+        np.testing.assert_array_equal(images[0], images[1])
+
+    def test_savefig_includes_animated_artists(self):
+        """
+        Test if the animated artists are drawn while suspended.
+        """
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        (line,) = ax.plot([0.0, 1.0], [1.0, 0.0])
+
+        blit_manager = BlitManager(fig)
+        blit_manager.add_artist(line)
+        self.assertTrue(line.get_animated())
+
+        with blit_manager.suspend():
+            self.assertFalse(line.get_animated())
+
+        self.assertTrue(line.get_animated())
+
+    def test_fallback_without_blit(self):
+        """
+        Test if the artists stay normal when the canvas does not support blitting.
+        """
+
+        fig = Figure()
+        FigureCanvasBase(fig)
+        (line,) = fig.add_subplot(1, 1, 1).plot([0.0, 1.0], [1.0, 0.0])
+
+        blit_manager = BlitManager(fig)
+        blit_manager.add_artist(line)
+
+        self.assertFalse(blit_manager.supports_blit)
+        self.assertFalse(line.get_animated())
+        blit_manager.update()
+
+
+if __name__ == "__main__":
+    unittest.main()
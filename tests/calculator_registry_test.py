@@ -0,0 +1,72 @@
+"""
+calculator_registry_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import unittest
+
+from hexareach.calc.calculator_registry import CalculatorRegistry
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.xr_r1_param import XrR1Param
+
+
+class TestCalculatorRegistry(unittest.TestCase):
+    """
+    Test cases for the CalculatorRegistry class.
+    """
+
+    def test_shared_by_value(self):
+        """
+        Test if the parameters with the same values share one calculator.
+        """
+
+        registry = CalculatorRegistry()
+        calc = registry.get(PhantomxMk2Param())
+
+        self.assertIs(registry.get(PhantomxMk2Param()), calc)
+        self.assertIsNot(registry.get(XrR1Param()), calc)
+
+        changed = PhantomxMk2Param()
+        changed.femur_length = 70.0
+        self.assertIsNot(registry.get(changed), calc)
+        self.assertEqual(len(registry), 3)
+
+    def test_lru_eviction(self):
+        """
+        Test if the least recently used calculator is evicted.
+        """
+
+        registry = CalculatorRegistry(max_size=2)
+        mk2 = registry.get(PhantomxMk2Param())
+        registry.get(XrR1Param())
+        registry.get(PhantomxMk2Param())  # mk2 becomes the most recently used.
+
+        changed = PhantomxMk2Param()
+        changed.tibia_length = 120.0
+        registry.get(changed)
+
+        self.assertEqual(len(registry), 2)
+        self.assertIs(registry.get(PhantomxMk2Param()), mk2)
+
+    def test_table_computed_once(self):
+        """
+        Test if the derived table is computed only once per parameter values.
+        """
+
+        registry = CalculatorRegistry()
+        calls = []
+
+        def factory(calc):
+            calls.append(calc)
+            return len(calls)
+
+        self.assertEqual(registry.get_table(PhantomxMk2Param(), "table", factory), 1)
+        self.assertEqual(registry.get_table(PhantomxMk2Param(), "table", factory), 1)
+        self.assertEqual(calls, [registry.get(PhantomxMk2Param())])
+
+
+if __name__ == "__main__":
+    unittest.main()
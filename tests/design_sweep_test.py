@@ -0,0 +1,118 @@
+"""
+design_sweep_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from hexareach.calc.design_sweep import METRIC_NAMES, DesignSweep
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.leg_power_calculator import LegPowerCalculator, make_leg_power_ranges
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+
+
+class TestDesignSweep(unittest.TestCase):
+    """
+    Test cases for the DesignSweep class.
+    """
+
+    def setUp(self):
+        self.ranges = {
+            "femur_length": [56.0, 66.0, 76.0],
+            "tibia_length": [110.0, 130.0],
+        }
+
+    def test_variants(self):
+        """
+        Test if every combination is generated and invalid joint limits are skipped.
+        """
+
+        sweep = DesignSweep(PhantomxMk2Param(), workers=1)
+
+        self.assertEqual(len(sweep.make_variants(self.ranges)), 6)
+
+        variants = sweep.make_variants(
+            {"theta2_min": [math.radians(-100.0), math.radians(120.0)]}
+        )
+        self.assertEqual(len(variants), 1)
+
+        with self.assertRaises(ValueError):
+            sweep.make_variants({"unknown_length": [1.0]})
+
+    def test_metrics(self):
+        """
+        Test if the metrics of the base parameter are sensible and grow with the leg length.
+        """
+
+        param = PhantomxMk2Param()
+        sweep = DesignSweep(param, workers=1)
+        result = sweep.run(self.ranges)
+
+        for name in METRIC_NAMES:
+            self.assertEqual(result[name].shape, (6,))
+
+        self.assertTrue((result["reachable_area"] > 0.0).all())
+        self.assertTrue((result["power_min"] > 0.0).all())
+        self.assertTrue((result["power_min"] <= result["power_mean"]).all())
+        np.testing.assert_array_equal(result["radius_min"], param.approx_min_radius)
+        np.testing.assert_array_equal(
+            result["radius_band"], result["radius_max"] - result["radius_min"]
+        )
+
+        # Longer tibias reach further.
+        area = result["reachable_area"].reshape(3, 2)
+        self.assertTrue((area[:, 1] > area[:, 0]).all())
+
+    def test_metrics_match_power_map(self):
+        """
+        Test if the sweep samples the same grid as the power map, including x_max and z_max.
+        """
+
+        param = PhantomxMk2Param()
+        rect = (100.0, 250.0, -150.0, 0.0)
+        sweep = DesignSweep(param, rect=rect, resolution=10.0, workers=1)
+        result = sweep.run({"femur_length": [param.femur_length]})
+
+        calc = HexapodLegRangeCalculator(param)
+        x_range, z_range = make_leg_power_ranges(rect, 10.0)
+        self.assertEqual((x_range[-1], z_range[-1]), (250.0, 0.0))
+        reachable, _ = calc.calc_reachable_inverse_kinematics_xz_batch(
+            x_range[np.newaxis, :], z_range[:, np.newaxis]
+        )
+        power = LegPowerCalculator(calc, param).calculate(x_range, z_range)
+
+        self.assertAlmostEqual(result["reachable_area"][0], np.count_nonzero(reachable) * 100.0)
+        self.assertAlmostEqual(result["power_mean"][0], float(power[reachable].mean()))
+        self.assertAlmostEqual(result["power_min"][0], float(power[reachable].min()))
+
+    def test_process_pool_matches_serial(self):
+        """
+        Test if the process pool gives the same result as the serial evaluation and writes a file.
+        """
+
+        serial = DesignSweep(PhantomxMk2Param(), workers=1, resolution=4.0).run(self.ranges)
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "sweep.npz")
+            pooled = DesignSweep(
+                PhantomxMk2Param(), workers=2, chunk_size=2, resolution=4.0
+            ).run(self.ranges, file_name)
+
+            with np.load(file_name) as saved:
+                np.testing.assert_array_equal(saved["tibia_length"], pooled["tibia_length"])
+                np.testing.assert_array_equal(saved["power_mean"], pooled["power_mean"])
+
+        for name, values in serial.items():
+            np.testing.assert_array_equal(pooled[name], values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+disk_cache_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from hexareach.calc import disk_cache
+from hexareach.calc.disk_cache import DiskCache
+from hexareach.calc.leg_power_calculator import LegPowerCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.xr_r1_param import XrR1Param
+
+
+class TestDiskCache(unittest.TestCase):
+    """
+    Test cases for the DiskCache class.
+    """
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cache = DiskCache(self._tmp_dir.name)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_load_or_compute(self):
+        """
+        Test if a computed array is stored once and loaded as a memory map afterwards.
+        """
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return np.arange(6.0).reshape(2, 3)
+
+        first = self.cache.load_or_compute("test", PhantomxMk2Param(), {"step": 1.0}, compute)
+        second = self.cache.load_or_compute("test", PhantomxMk2Param(), {"step": 1.0}, compute)
+
+        self.assertEqual(len(calls), 1)
+        self.assertIsInstance(second, np.memmap)
+        np.testing.assert_array_equal(first, second)
+
+        # パラメータや条件が変われば別のキーになる.
+        self.cache.load_or_compute("test", XrR1Param(), {"step": 1.0}, compute)
+        self.cache.load_or_compute("test", PhantomxMk2Param(), {"step": 2.0}, compute)
+        self.assertEqual(len(calls), 3)
+
+    def test_format_version(self):
+        """
+        Test if bumping the cache format version invalidates stored entries.
+        """
+
+        param = PhantomxMk2Param()
+        key = self.cache.make_key("test", param, {"step": 1.0})
+        self.cache.save(key, np.zeros(3))
+
+        version = disk_cache.CACHE_FORMAT_VERSION + 1
+        with mock.patch.object(disk_cache, "CACHE_FORMAT_VERSION", version):
+            bumped = self.cache.make_key("test", param, {"step": 1.0})
+        self.assertNotEqual(key, bumped)
+        self.assertIsNone(self.cache.load(bumped))
+
+    def test_eviction(self):
+        """
+        Test if the least recently used entries are removed when the size limit is exceeded.
+        """
+
+        cache = DiskCache(self._tmp_dir.name, max_bytes=2500)
+        param = PhantomxMk2Param()
+        key_a, key_b, key_c = (cache.make_key("test", param, {"i": i}) for i in range(3))
+        cache.save(key_a, np.zeros(100))
+        cache.save(key_b, np.zeros(100))
+        os.utime(os.path.join(self._tmp_dir.name, f"{key_a}.npy"), (0, 0))
+        cache.save(key_c, np.zeros(100))
+
+        self.assertIsNone(cache.load(key_a))
+        self.assertIsNotNone(cache.load(key_b))
+        self.assertIsNotNone(cache.load(key_c))
+        self.assertLessEqual(cache.total_bytes(), 2500)
+
+        with self.assertRaises(ValueError):
+            cache.save("my_results", np.zeros(3))
+        with self.assertRaises(ValueError):
+            cache.make_key("../test", param, {})
+
+    def test_unrelated_files_are_kept(self):
+        """
+        Test if clear() and eviction leave files that are not cache entries.
+        """
+
+        user_file = os.path.join(self._tmp_dir.name, "my_results.npy")
+        np.save(user_file, np.zeros(1000))
+        os.utime(user_file, (0, 0))
+
+        cache = DiskCache(self._tmp_dir.name, max_bytes=1000)
+        param = PhantomxMk2Param()
+        for i in range(3):
+            cache.save(cache.make_key("test", param, {"i": i}), np.zeros(100))
+        self.assertTrue(os.path.exists(user_file))
+        self.assertLessEqual(cache.total_bytes(), 1000)
+
+        cache.clear()
+        self.assertTrue(os.path.exists(user_file))
+        self.assertEqual(cache.total_bytes(), 0)
+
+    def test_leg_power_cache(self):
+        """
+        Test if the cached leg power equals the computed one.
+        """
+
+        x_range = np.arange(-100.0, 301.0, 20.0)
+        z_range = np.arange(-200.0, 201.0, 20.0)
+        calc = LegPowerCalculator(None, PhantomxMk2Param(), cache=self.cache)
+
+        computed = calc.calculate(x_range, z_range)
+        loaded = calc.calculate(x_range, z_range)
+
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(computed, loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+display_stats_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import logging
+import unittest
+
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.graph_dispalyer import GraphDisplayer
+from hexareach.render.display_flag import DisplayFlag
+from hexareach.render.display_stats import DisplayStats
+from hexareach.render.mouse_event_dispatcher import MouseEventDispatcher
+
+
+class TestDisplayStats(unittest.TestCase):
+    """
+    Test cases for the DisplayStats class.
+    """
+
+    def test_disabled_records_nothing(self):
+        """
+        Test if a disabled instance records nothing and shares one no-op context.
+        """
+
+        stats = DisplayStats(enabled=False)
+
+        with stats.stage("a"):
+            pass
+        stats.count("b")
+        stats.record_frame(0.01)
+
+        self.assertIs(stats.stage("a"), stats.stage("c"))
+        self.assertEqual(stats.stage_times, {})
+        self.assertEqual(stats.counters, {})
+        self.assertEqual(stats.frame_count, 0)
+
+    def test_stages_counters_and_frames(self):
+        """
+        Test if stages, counters and the frame histogram are recorded and reported.
+        """
+
+        events = []
+        stats = DisplayStats(
+            callback=lambda name, value: events.append(name), frame_bin_edges=(10.0, 20.0)
+        )
+
+        with stats.stage("a"):
+            pass
+        with stats.stage("a"):
+            pass
+        stats.count("b")
+        stats.count("b", 2)
+        for seconds in (0.005, 0.015, 0.016, 0.5):
+            stats.record_frame(seconds)
+
+        self.assertIn("a", stats.stage_times)
+        self.assertEqual(stats.counters, {"b": 3})
+        self.assertEqual(stats.frame_histogram, [1, 2, 1])
+        self.assertAlmostEqual(stats.frame_time_max, 0.5)
+        self.assertAlmostEqual(stats.frame_time_mean, 0.134)
+        self.assertEqual(events, ["a", "a", "frame", "frame", "frame", "frame"])
+        self.assertIn("frames: 4", stats.summary())
+
+    def test_dispatcher_counts(self):
+        """
+        Test if the dispatcher counts events, IK calls, redraws and frames.
+        """
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        ax.set_xlim(-100.0, 300.0)
+        ax.set_ylim(-200.0, 200.0)
+
+        stats = DisplayStats()
+        dispatcher = MouseEventDispatcher(
+            fig, PhantomxMk2Param(), max_update_rate=None, stats=stats
+        )
+        dispatcher.render()
+
+        for i in range(3):
+            pos = ax.transData.transform((100.0 + i, -50.0))
+            MouseEvent("motion_notify_event", fig.canvas, pos[0], pos[1])._process()
+
+        self.assertEqual(stats.counters, {"motion_events": 3, "ik_calls": 3, "redraws": 3})
+        self.assertEqual(stats.frame_count, 3)
+
+    def test_display_logs_stages(self):
+        """
+        Test if display records its stages when the stats logger is at DEBUG level.
+        """
+
+        flag = DisplayFlag()
+        flag.display_approximated_graph = True
+
+        with self.assertLogs("hexareach.stats", logging.DEBUG) as logs:
+            stats = GraphDisplayer().display(
+                PhantomxMk2Param(), display_flag=flag, do_not_show=True
+            )
+
+        self.assertTrue(stats.enabled)
+        for name in ("approximated_graph", "leg_renderer", "range_of_motion"):
+            self.assertIn(name, stats.stage_times)
+            self.assertTrue(any(name in line for line in logs.output))
+
+        self.assertFalse(GraphDisplayer().display(PhantomxMk2Param(), do_not_show=True).enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
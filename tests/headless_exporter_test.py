@@ -0,0 +1,55 @@
+"""
+headless_exporter_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+import tempfile
+import unittest
+
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.xr_r1_param import XrR1Param
+from hexareach.headless_exporter import ExportJob, HeadlessExporter
+
+
+class TestHeadlessExporter(unittest.TestCase):
+    """
+    Test cases for the HeadlessExporter class.
+    """
+
+    def test_export_reuses_figure(self):
+        """
+        Test if every job is written to its file and the figure is reused.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = [
+                ExportJob(PhantomxMk2Param(), os.path.join(directory, "mk2.png")),
+                ExportJob(XrR1Param(), os.path.join(directory, "xr", "xr.png")),
+            ]
+            exporter = HeadlessExporter()
+
+            self.assertEqual(exporter.export(jobs[:1]), [jobs[0].image_file_name])
+            figure = exporter._figure  # pylint: disable=protected-access
+            self.assertEqual(
+                exporter.export(jobs), [job.image_file_name for job in jobs]
+            )
+            self.assertIs(exporter._figure, figure)  # pylint: disable=protected-access
+
+            for job in jobs:
+                self.assertGreater(os.path.getsize(job.image_file_name), 0)
+
+    def test_invalid_workers(self):
+        """
+        Test if the number of workers is checked.
+        """
+
+        with self.assertRaises(ValueError):
+            HeadlessExporter(workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+hexapod_body_ik_solver_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import math
+import unittest
+
+import numpy as np
+
+from hexareach.calc.hexapod_body_ik_solver import HexapodBodyIkSolver
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.math.rotation import rotation_matrix_rpy
+
+
+class BodyParam(PhantomxMk2Param):
+    """
+    PhantomX MK2 legs mounted on a symmetric hexagonal body, for testing.
+    """
+    leg_mount_position = tuple(
+        (100.0 * math.cos(math.radians(a)), 100.0 * math.sin(math.radians(a)), 0.0)
+        for a in (60.0, 0.0, -60.0, -120.0, 180.0, 120.0)
+    )
+    leg_mount_angle = tuple(math.radians(a) for a in (60.0, 0.0, -60.0, -120.0, 180.0, 120.0))
+
+
+class TestHexapodBodyIkSolver(unittest.TestCase):
+    """
+    Test cases for the HexapodBodyIkSolver class.
+    """
+
+    def setUp(self):
+        self.param = BodyParam()
+        self.calc = HexapodLegRangeCalculator(self.param)
+        self.solver = HexapodBodyIkSolver(self.param, hexapod_leg_range_calc=self.calc)
+
+        # Feet 150 mm out from each mount, 80 mm below the body.
+        mount = np.asarray(self.param.leg_mount_position)
+        direction = np.stack(
+            [np.cos(self.param.leg_mount_angle), np.sin(self.param.leg_mount_angle)], axis=-1
+        )
+        self.foot = np.concatenate([mount[:, :2] + 150.0 * direction, np.full((6, 1), -80.0)], 1)
+
+    def test_neutral_pose_matches_planar_ik(self):
+        """
+        Test if the neutral pose gives zero coxa yaw and the planar IK for every leg.
+        """
+
+        res = self.solver.solve([0.0, 0.0, 0.0], [0.0, 0.0, 0.0], self.foot)
+        _, _, expected = self.calc.calc_inverse_kinematics_xz_batch(150.0, -80.0)
+
+        self.assertEqual(res.angle.shape, (6, 3))
+        self.assertTrue(res.success.all())
+        self.assertTrue(res.in_range.all())
+        np.testing.assert_allclose(res.angle[:, 0], 0.0, atol=1e-12)
+        np.testing.assert_allclose(res.angle, np.tile(expected, (6, 1)), atol=1e-12)
+
+    def test_body_yaw_turns_coxa(self):
+        """
+        Test if yawing the body over fixed feet turns every coxa the opposite way.
+        """
+
+        res = self.solver.solve([0.0, 0.0, 0.0], [0.0, 0.0, 0.2], self.foot)
+
+        self.assertTrue(res.success.all())
+        self.assertTrue((res.angle[:, 0] < -0.1).all())
+
+    def test_forward_kinematics_round_trip(self):
+        """
+        Test if the joint angles put the feet back where they were asked to be.
+        """
+
+        rng = np.random.default_rng(0)
+        translation = rng.normal(0.0, 10.0, (50, 3))
+        rotation = rng.normal(0.0, 0.1, (50, 3))
+
+        res = self.solver.solve(translation, rotation, self.foot)
+        self.assertEqual(res.angle.shape, (50, 6, 3))
+        self.assertTrue(res.success.all())
+
+        theta1, theta2, theta3 = np.moveaxis(res.angle, -1, 0)
+        planar_x = (
+            self.param.coxa_length
+            + self.param.femur_length * np.cos(theta2)
+            + self.param.tibia_length * np.cos(theta2 + theta3)
+        )
+        planar_z = self.param.femur_length * np.sin(theta2) + self.param.tibia_length * np.sin(
+            theta2 + theta3
+        )
+
+        yaw = theta1 + np.asarray(self.param.leg_mount_angle)
+        body = np.stack(
+            [planar_x * np.cos(yaw), planar_x * np.sin(yaw), planar_z], axis=-1
+        ) + np.asarray(self.param.leg_mount_position)
+        matrix = rotation_matrix_rpy(rotation[:, 0], rotation[:, 1], rotation[:, 2])
+        world = np.einsum("pij,plj->pli", matrix, body) + translation[:, np.newaxis, :]
+
+        np.testing.assert_allclose(world, np.broadcast_to(self.foot, world.shape), atol=1e-9)
+
+    def test_batch_matches_single_pose(self):
+        """
+        Test if solving many poses at once matches solving them one by one.
+        """
+
+        rng = np.random.default_rng(1)
+        translation = rng.normal(0.0, 20.0, (4, 5, 3))
+        rotation = rng.normal(0.0, 0.2, (4, 5, 3))
+
+        res = self.solver.solve(translation, rotation, self.foot, True)
+
+        for idx in np.ndindex(4, 5):
+            single = self.solver.solve(translation[idx], rotation[idx], self.foot, True)
+            np.testing.assert_array_equal(res.success[idx], single.success)
+            np.testing.assert_array_equal(res.in_range[idx], single.in_range)
+            np.testing.assert_allclose(res.angle[idx], single.angle, atol=1e-12)
+
+    def test_missing_mounts(self):
+        """
+        Test if a param without six mounts is rejected.
+        """
+
+        with self.assertRaises(AttributeError):
+            HexapodBodyIkSolver(PhantomxMk2Param())  # type: ignore
+
+
+if __name__ == "__main__":
+    unittest.main()
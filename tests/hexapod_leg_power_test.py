@@ -0,0 +1,169 @@
+"""
+hexapod_leg_power_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from matplotlib.backend_bases import CloseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+
+from hexareach.calc.calculator_registry import get_leg_range_calculator
+from hexareach.calc.disk_cache import DiskCache
+from hexareach.calc.leg_power_calculator import LegPowerCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.render.hexapod_leg_power import HexapodLegPower
+
+
+def make_leg_power(**kwargs):
+    """
+    Make a HexapodLegPower drawing on a new Agg figure.
+    """
+
+    param = PhantomxMk2Param()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    leg_power = HexapodLegPower(get_leg_range_calculator(param), param, fig, ax, **kwargs)
+    return fig, ax, leg_power
+
+
+class TestHexapodLegPower(unittest.TestCase):
+    """
+    Test cases for the HexapodLegPower class.
+    """
+
+    def test_background_matches_render(self):
+        """
+        Test if the background computation ends with the same map as render.
+        """
+
+        rect = (0.0, 200.0, -150.0, 50.0)
+        _, ax, leg_power = make_leg_power(rect=rect, step=4.0)
+        leg_power.render()
+        expected = ax.collections[0]
+
+        _, ax, background = make_leg_power(rect=rect, step=4.0)
+        background.render_in_background(coarse_steps=(16.0, 8.0), band_rows=8)
+        background.join(timeout=30.0)
+
+        self.assertTrue(background.poll())
+        self.assertTrue(background.done)
+        self.assertFalse(background.poll())
+        self.assertEqual(background.drawn_step, 4.0)
+        self.assertEqual(len(ax.collections), 1)
+
+        actual = ax.collections[0]
+        np.testing.assert_array_equal(actual.levels, expected.levels)
+        for actual_segs, expected_segs in zip(actual.allsegs, expected.allsegs):
+            self.assertEqual(len(actual_segs), len(expected_segs))
+            for actual_seg, expected_seg in zip(actual_segs, expected_segs):
+                np.testing.assert_array_equal(actual_seg, expected_seg)
+
+    def test_coarse_levels_are_replaced(self):
+        """
+        Test if a drawn coarse level is replaced by the fine one without duplicating artists.
+        """
+
+        fig, ax, leg_power = make_leg_power(rect=(0.0, 200.0, -150.0, 50.0), step=4.0)
+        fine_nx = len(np.arange(0.0, 201.0, 4.0))
+
+        # 細かい分布の計算は，粗い分布を描画するまで止めておく．
+        gate = threading.Event()
+        calculate_points = LegPowerCalculator.calculate_points
+
+        def gated(calc, x, z, **kwargs):
+            if np.shape(x)[-1] == fine_nx:
+                gate.wait(timeout=30.0)
+            return calculate_points(calc, x, z, **kwargs)
+
+        with mock.patch.object(LegPowerCalculator, "calculate_points", gated):
+            leg_power.render_in_background(coarse_steps=(16.0,), band_rows=8)
+
+            deadline = time.monotonic() + 30.0
+            while not leg_power.poll() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(leg_power.drawn_step, 16.0)
+            self.assertFalse(leg_power.done)
+            coarse = ax.collections[0]
+            colorbar_ax = fig.axes[1]
+
+            gate.set()
+            leg_power.join(timeout=30.0)
+
+        self.assertTrue(leg_power.poll())
+        self.assertEqual(leg_power.drawn_step, 4.0)
+        self.assertEqual(len(ax.collections), 1)
+        self.assertIsNot(ax.collections[0], coarse)
+        self.assertEqual(len(fig.axes), 2)
+        self.assertIs(fig.axes[1], colorbar_ax)
+        self.assertIs(ax.collections[0].colorbar.mappable, ax.collections[0])
+
+        with self.assertRaises(ValueError):
+            leg_power.render_in_background()
+
+    def test_background_cache_entry(self):
+        """
+        Test if the background computation stores one cache entry that render reuses.
+        """
+
+        rect = (0.0, 200.0, -150.0, 50.0)
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskCache(directory)
+            _, _, background = make_leg_power(rect=rect, step=2.0, cache=cache)
+            background.render_in_background(band_rows=8)
+            background.join(timeout=30.0)
+            background.poll()
+
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            _, _, leg_power = make_leg_power(rect=rect, step=2.0, cache=cache)
+            with mock.patch.object(LegPowerCalculator, "calculate_points") as calculate_points:
+                leg_power.render()
+            calculate_points.assert_not_called()
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_adaptive_single_level(self):
+        """
+        Test if the adaptive map is drawn once instead of resampled coarse levels.
+        """
+
+        _, ax, leg_power = make_leg_power(
+            rect=(0.0, 200.0, -150.0, 50.0), step=1.0, adaptive_step=0.5
+        )
+        leg_power.render_in_background()
+        leg_power.join(timeout=30.0)
+
+        self.assertTrue(leg_power.poll())
+        self.assertEqual(leg_power.drawn_step, 1.0)
+        self.assertEqual(len(ax.collections), 1)
+
+    def test_close_cancels(self):
+        """
+        Test if closing the window stops the background computation.
+        """
+
+        fig, ax, leg_power = make_leg_power(rect=(-300.0, 600.0, -400.0, 400.0), step=0.5)
+        leg_power.render_in_background(coarse_steps=(), band_rows=1)
+        fig.canvas.callbacks.process("close_event", CloseEvent("close_event", fig.canvas))
+        leg_power.join(timeout=30.0)
+
+        self.assertTrue(leg_power.done)
+        self.assertFalse(leg_power.poll())
+        self.assertIsNone(leg_power.drawn_step)
+        self.assertEqual(len(ax.collections), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+"""
+hexapod_leg_range_calculator_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import math
+import types
+import unittest
+
+import numpy as np
+
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.servo_packet import pack_servo_ticks, unpack_servo_ticks
+from hexareach.calc.xr_r1_param import XrR1Param
+
+
+class TestHexapodLegRangeCalculator(unittest.TestCase):
+    """
+    Test cases for the HexapodLegRangeCalculator class.
+    """
+
+    def setUp(self):
+        self.calcs = [
+            HexapodLegRangeCalculator(PhantomxMk2Param()),
+            HexapodLegRangeCalculator(XrR1Param()),
+        ]
+        self.params = [PhantomxMk2Param(), XrR1Param()]
+
+    def test_batch_inverse_kinematics_matches_scalar(self):
+        """
+        Test if the batch IK gives the same result as the scalar IK,
+        including the fallback for unreachable points.
+        """
+
+        x, z = np.meshgrid(np.arange(-300.0, 300.0, 13.3), np.arange(-300.0, 300.0, 11.9))
+
+        for calc in self.calcs:
+            for reverse in (False, True):
+                ok, joint_pos, angle = calc.calc_inverse_kinematics_xz_batch(x, z, reverse)
+
+                self.assertEqual(ok.shape, x.shape)
+                self.assertEqual(joint_pos.shape, (2, 4) + x.shape)
+                self.assertEqual(angle.shape, (3,) + x.shape)
+                self.assertTrue(ok.any())
+                self.assertFalse(ok.all())
+
+                for idx in np.ndindex(x.shape):
+                    res, expected_pos, expected_angle = calc.calc_inverse_kinematics_xz(
+                        float(x[idx]), float(z[idx]), reverse
+                    )
+                    self.assertEqual(res, ok[idx])
+                    np.testing.assert_allclose(
+                        joint_pos[(slice(None), slice(None)) + idx], expected_pos, atol=1e-9
+                    )
+                    np.testing.assert_allclose(
+                        angle[(slice(None),) + idx], expected_angle, atol=1e-9
+                    )
+
+    def test_approximate_max_leg_raudus_matches_brute_force(self):
+        """
+        Test if the approximated max radius table is identical to the brute-force search.
+        """
+
+        odd_param = types.SimpleNamespace(**vars(PhantomxMk2Param))
+        odd_param.coxa_length = 52.5
+        odd_param.femur_length = 100.0
+        odd_param.tibia_length = 100.0
+
+        for param in (PhantomxMk2Param(), XrR1Param(), odd_param):
+            for resolution in (1.0, 0.5, 0.25):
+                calc = HexapodLegRangeCalculator(param, approx_resolution=resolution)
+                self.assertEqual(
+                    list(calc._approximate_max_leg_raudus),  # pylint: disable=protected-access
+                    self._brute_force_max_leg_raudus(param, resolution),
+                )
+
+    def test_approximate_max_leg_raudus_out_of_table(self):
+        """
+        Test if the z values outside the table return the min radius.
+        """
+
+        calc = self.calcs[0]
+        param = PhantomxMk2Param()
+        reach = param.femur_length + param.tibia_length
+
+        self.assertEqual(calc.get_approximate_max_leg_raudus(10.0), param.approx_min_radius)
+        self.assertEqual(calc.get_approximate_max_leg_raudus(-reach), param.approx_min_radius)
+        self.assertEqual(calc.get_approximate_max_leg_raudus(-50.0), 240.0)
+
+    def test_approximate_max_leg_raudus_batch_matches_scalar(self):
+        """
+        Test if the batch lookup of the max radius matches the scalar lookup.
+        """
+
+        z = np.arange(-300.0, 300.0, 0.01)
+
+        for calc in self.calcs:
+            expected = [calc.get_approximate_max_leg_raudus(z_value) for z_value in z]
+            np.testing.assert_array_equal(
+                calc.get_approximate_max_leg_raudus_batch(z), expected
+            )
+
+    def test_arduino_batch_matches_scalar(self):
+        """
+        Test if the batch servo mapping gives exactly the same ticks as the scalar one.
+        """
+
+        x, z = np.meshgrid(np.arange(-300.0, 300.0, 7.3), np.arange(-300.0, 300.0, 6.1))
+
+        for calc in self.calcs:
+            angle, servo, left, right = calc.calc_inverse_kinematics_xz_arduino_batch(x, z)
+
+            for arr in (servo, left, right):
+                self.assertEqual(arr.dtype, np.int16)
+                self.assertEqual(arr.shape, (3,) + x.shape)
+
+            for idx in np.ndindex(x.shape):
+                expected = calc.calc_inverse_kinematics_xz_arduino(float(x[idx]), float(z[idx]))
+                col = (slice(None),) + idx
+                np.testing.assert_allclose(angle[col], expected[0], atol=1e-12)
+                self.assertEqual(servo[col].tolist(), expected[1])
+                self.assertEqual(left[col].tolist(), expected[2])
+                self.assertEqual(right[col].tolist(), expected[3])
+
+    def test_pack_servo_ticks_round_trip(self):
+        """
+        Test if the packed ticks are little-endian int16 in sample order and can be unpacked.
+        """
+
+        x = np.array([100.0, 150.0, 200.0, 120.0])
+        z = np.array([-50.0, -80.0, 0.0, 30.0])
+        _, _, left, right = self.calcs[0].calc_inverse_kinematics_xz_arduino_batch(x, z)
+
+        data = pack_servo_ticks(left, right)
+
+        self.assertEqual(len(data), 2 * 3 * len(x) * 2)
+        self.assertEqual(int.from_bytes(data[0:2], "little", signed=True), left[0, 0])
+        self.assertEqual(int.from_bytes(data[6:8], "little", signed=True), right[0, 0])
+        self.assertEqual(int.from_bytes(data[12:14], "little", signed=True), left[0, 1])
+
+        left_back, right_back = unpack_servo_ticks(data, channels=2)
+        np.testing.assert_array_equal(left_back, left)
+        np.testing.assert_array_equal(right_back, right)
+
+        with self.assertRaises(ValueError):
+            pack_servo_ticks(np.full((3, 1), 40000))
+
+    def test_batch_inverse_kinematics_scalar_input(self):
+        """
+        Test if the batch IK accepts scalars and returns 0-d results.
+        """
+
+        ok, joint_pos, angle = self.calcs[0].calc_inverse_kinematics_xz_batch(150.0, -50.0)
+
+        self.assertEqual(ok.shape, ())
+        self.assertEqual(joint_pos.shape, (2, 4))
+        self.assertEqual(angle.shape, (3,))
+
+    def test_range_of_motion_boundary_matches_scalar(self):
+        """
+        Test if the batch boundary matches the scalar forward kinematics loop.
+        """
+
+        for calc, param in zip(self.calcs, self.params):
+            bounds = (
+                param.theta2_min, param.theta2_max, param.theta3_min, param.theta3_max
+            )
+            lines = calc.calc_range_of_motion_boundary(*bounds, step=0.01)
+            self.assertEqual(len(lines), 4)
+
+            theta2 = np.arange(bounds[0], bounds[1], 0.01)
+            expected = [
+                calc.get_leg_position_xz(t2, bounds[2]) for t2 in theta2
+            ]
+            expected = [(x, z) for ok, x, z in expected if ok]
+            np.testing.assert_allclose(lines[0][0], [x for x, _ in expected])
+            np.testing.assert_allclose(lines[0][1], [z for _, z in expected])
+
+    def test_range_of_motion_boundary_adaptive(self):
+        """
+        Test if the adaptive sampling keeps the end points with fewer vertices.
+        """
+
+        calc, param = self.calcs[0], self.params[0]
+        bounds = (param.theta2_min, param.theta2_max, param.theta3_min, param.theta3_max)
+        dense = calc.calc_range_of_motion_boundary(*bounds)
+        coarse = calc.calc_range_of_motion_boundary(*bounds, tolerance=0.05)
+
+        for (dense_x, dense_z), (x, z) in zip(dense, coarse):
+            self.assertLess(len(x), len(dense_x))
+            self.assertAlmostEqual(x[0], dense_x[0])
+            self.assertAlmostEqual(z[0], dense_z[0])
+
+        for tolerance in (0.0, -0.05):
+            with self.assertRaises(ValueError):
+                calc.calc_range_of_motion_boundary(*bounds, tolerance=tolerance)
+        with self.assertRaises(ValueError):
+            calc.calc_range_of_motion_boundary(*bounds, step=0.0)
+
+    @staticmethod
+    def _brute_force_max_leg_raudus(param, resolution):
+        """
+        The original nested-loop search of the max radius table.
+        """
+
+        z_num = int((param.femur_length + param.tibia_length) / resolution)
+        x_index_min = int(param.coxa_length / resolution)
+        x_index_max = int(
+            (param.coxa_length + param.femur_length + param.tibia_length) / resolution
+        )
+        table = [0.0] * z_num
+
+        for z_index in range(z_num):
+            z = z_index * resolution
+            for x_index in range(x_index_min, x_index_max):
+                x = x_index * resolution
+                ik_true_x = math.sqrt(math.pow(x, 2.0)) - param.coxa_length
+                im = math.sqrt(math.pow(ik_true_x, 2.0) + math.pow(z, 2.0))
+                if im == 0:
+                    im += 0.0000001
+                q2_theta = (
+                    math.pow(param.femur_length, 2.0)
+                    + math.pow(im, 2.0)
+                    - math.pow(param.tibia_length, 2.0)
+                ) / (2.0 * param.femur_length * im)
+                if -1.0 <= q2_theta <= 1.0:
+                    table[z_index] = x - 1.0
+
+        return table
+
+
+if __name__ == "__main__":
+    unittest.main()
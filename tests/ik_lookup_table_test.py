@@ -0,0 +1,219 @@
+"""
+ik_lookup_table_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.ik_lookup_table import IkLookupTable
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.math.clamp_angle import clamp_angle_array
+
+
+class TestIkLookupTable(unittest.TestCase):
+    """
+    Test cases for the IkLookupTable class.
+    """
+
+    def setUp(self):
+        self.param = PhantomxMk2Param()
+        self.calc = HexapodLegRangeCalculator(self.param)
+        self.table = IkLookupTable.build(
+            self.calc, rect=(-100.0, 300.0, -200.0, 200.0), resolution=1.0
+        )
+
+    def test_grid_points_match_exact(self):
+        """
+        Test if the table gives the exact IK on the grid points.
+        """
+
+        x, z = np.meshgrid(np.arange(-100.0, 300.0, 7.0), np.arange(-200.0, 200.0, 9.0))
+
+        for reverse in (False, True):
+            success, angle = self.table.query(x, z, reverse)
+            ok, _, exact = self.calc.calc_inverse_kinematics_xz_batch(x, z, reverse)
+
+            self.assertEqual(angle.shape, (3,) + x.shape)
+            self.assertTrue(np.all(ok[success]))
+            np.testing.assert_allclose(angle[:, success], exact[:, success], atol=1e-9)
+
+    def test_interpolation_error(self):
+        """
+        Test if the interpolated angles are close to the exact IK away from the reach boundary.
+        """
+
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-100.0, 300.0, 20000)
+        z = rng.uniform(-200.0, 200.0, 20000)
+
+        reach = np.hypot(x - self.param.coxa_length, z)
+        inner = self.param.tibia_length - self.param.femur_length
+        outer = self.param.tibia_length + self.param.femur_length
+        interior = (reach > inner + 5.0) & (reach < outer - 5.0)
+
+        # 関節の可動範囲によっては，片方の解ではとどく点がない．
+        valid_count = 0
+        for reverse in (False, True):
+            success, angle = self.table.query(x, z, reverse)
+            ok, _, exact = self.calc.calc_inverse_kinematics_xz_batch(x, z, reverse)
+            valid = success & ok & interior
+
+            valid_count += int(valid.sum())
+            error = np.abs(clamp_angle_array(angle[1:] - exact[1:]))[:, valid]
+            self.assertLess(error.max(initial=0.0), 1e-3)
+
+        self.assertGreater(valid_count, 0)
+
+    def test_estimated_max_error(self):
+        """
+        Test if the estimated maximum error is not below the error of random queries.
+        """
+
+        rng = np.random.default_rng(1)
+        x = rng.uniform(-100.0, 300.0, 500000)
+        z = rng.uniform(-200.0, 200.0, 500000)
+
+        sampled = 0.0
+        for reverse in (False, True):
+            success, angle = self.table.query(x, z, reverse)
+            ok, _, exact = self.calc.calc_inverse_kinematics_xz_batch(x, z, reverse)
+            valid = success & ok
+            error = np.abs(clamp_angle_array(angle[1:] - exact[1:]))[:, valid]
+            sampled = max(sampled, float(error.max()))
+
+        max_error = self.table.estimate_max_error()
+        self.assertGreaterEqual(max_error, sampled)
+        self.assertLess(max_error, 0.1)
+
+        # 別のインスタンスで計算した値は保存しない．
+        coarse = self.table.estimate_max_error(
+            HexapodLegRangeCalculator(self.param), samples_per_cell=2
+        )
+        self.assertLessEqual(coarse, max_error)
+        self.assertEqual(self.table.estimate_max_error(), max_error)
+
+    def test_joint_limits(self):
+        """
+        Test if the table only succeeds where the joints stay within their limits.
+        """
+
+        rng = np.random.default_rng(2)
+        x = rng.uniform(-100.0, 300.0, 200000)
+        z = rng.uniform(-200.0, 200.0, 200000)
+        reachable, _ = self.calc.calc_reachable_inverse_kinematics_xz_batch(x, z)
+
+        for reverse in (False, True):
+            success, angle = self.table.query(x, z, reverse)
+
+            self.assertTrue(np.all(self.calc.is_theta2_in_range_batch(angle[1][success])))
+            self.assertTrue(np.all(self.calc.is_theta3_in_range_batch(angle[2][success])))
+            self.assertTrue(np.all(reachable[success]))
+
+    def test_out_of_table(self):
+        """
+        Test if points outside the table are reported as failures.
+        """
+
+        success, angle = self.table.query([-150.0, 350.0, 100.0], [0.0, 0.0, -250.0])
+
+        self.assertFalse(success.any())
+        np.testing.assert_array_equal(angle, 0.0)
+
+    def test_save_and_load(self):
+        """
+        Test if a saved table gives the same results after loading.
+        """
+
+        x = np.array([100.0, 150.5, 200.25])
+        z = np.array([-50.0, -80.75, 10.5])
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "table.npz")
+            self.table.save(file_name)
+            loaded = IkLookupTable.load(file_name)
+
+        self.assertEqual(loaded.shape, self.table.shape)
+        self.assertEqual(loaded.rect, self.table.rect)
+
+        for reverse in (False, True):
+            expected = self.table.query(x, z, reverse)
+            actual = loaded.query(x, z, reverse)
+            np.testing.assert_array_equal(actual[0], expected[0])
+            np.testing.assert_array_equal(actual[1], expected[1])
+
+        with self.assertRaises(ValueError):
+            loaded.estimate_max_error()
+
+    def test_c_header(self):
+        """
+        Test if the C header declares arrays of the table size with valid float literals.
+        """
+
+        table = IkLookupTable.build(
+            self.calc, rect=(-100.0, 300.0, -200.0, 200.0), resolution=20.0
+        )
+        header = table.to_c_header("leg_ik")
+
+        self.assertEqual(table.shape, (21, 21))
+        self.assertIn("#define LEG_IK_NX 21", header)
+        self.assertIn("#define LEG_IK_X_MIN (-100.0f)", header)
+        self.assertIn("static const float leg_ik_angle[2][2][LEG_IK_NZ][LEG_IK_NX]", header)
+        self.assertIn("static const uint8_t leg_ik_success[2][LEG_IK_NZ][LEG_IK_NX]", header)
+
+        # 脚がとどかない格子点の 0.0 を含め，すべて float のリテラルであること．
+        body = header[header.index("leg_ik_angle") : header.index("leg_ik_success")]
+        literals = re.findall(r"[-+0-9.eE]+f?(?=[,}])", body)
+        self.assertEqual(len(literals), 2 * 2 * 21 * 21)
+        float_literal = re.compile(
+            r"-?(\d+\.\d*|\.\d+|\d+(\.\d*)?[eE][-+]?\d+)([eE][-+]?\d+)?f"
+        )
+        for literal in literals:
+            self.assertRegex(literal, float_literal)
+        self.assertIn("0.0f", literals)
+
+        with self.assertRaises(ValueError):
+            table.to_c_header("not a name")
+
+    @unittest.skipIf(shutil.which("cc") is None, "C compiler is not available")
+    def test_c_header_compiles(self):
+        """
+        Test if a C compiler accepts the header.
+        """
+
+        table = IkLookupTable.build(
+            self.calc, rect=(-100.0, 300.0, -200.0, 200.0), resolution=20.0
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            table.save_c_header(os.path.join(directory, "leg_ik.h"), "leg_ik")
+            source = os.path.join(directory, "main.c")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(
+                    '#include "leg_ik.h"\n'
+                    "int main(void) {\n"
+                    "  return (int)(leg_ik_angle[0][0][0][0] + LEG_IK_X_MIN + LEG_IK_RESOLUTION)"
+                    " + leg_ik_success[0][0][0];\n"
+                    "}\n"
+                )
+            result = subprocess.run(
+                [
+                    "cc", "-std=c99", "-Wall", "-Werror", "-c", source,
+                    "-o", os.path.join(directory, "main.o"),
+                ],
+                capture_output=True, text=True, check=False,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
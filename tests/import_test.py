@@ -0,0 +1,85 @@
+"""
+import_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import json
+import subprocess
+import sys
+import unittest
+
+# Upper limit of the time to import the calculation core after NumPy [s]
+IMPORT_TIME_BUDGET = 0.15
+
+_SCRIPT = """
+import json
+import sys
+import time
+
+import numpy
+
+start = time.perf_counter()
+import hexareach
+import hexareach.calc
+import hexareach.math
+elapsed = time.perf_counter() - start
+
+print(json.dumps({
+    "elapsed": elapsed,
+    "modules": [
+        name for name in ("matplotlib", "scipy", "tqdm") if name in sys.modules
+    ],
+}))
+"""
+
+
+def _run_import_script() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+class TestImport(unittest.TestCase):
+    """
+    Test cases for the import cost of the calculation core.
+    """
+
+    def test_calc_without_plotting_modules(self):
+        """
+        Test if the calc and math subpackages do not import plotting modules.
+        """
+
+        self.assertEqual(_run_import_script()["modules"], [])
+
+    def test_import_time_budget(self):
+        """
+        Test if importing the calculation core stays within the time budget.
+        """
+
+        # The first run may be slowed down by a cold file cache, so take the fastest.
+        elapsed = min(_run_import_script()["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_TIME_BUDGET)
+
+    def test_lazy_attributes(self):
+        """
+        Test if the rendering symbols are still available from the package.
+        """
+
+        import hexareach  # pylint: disable=import-outside-toplevel
+
+        self.assertIn("GraphDisplayer", dir(hexareach))
+        self.assertEqual(hexareach.DisplayFlag.__name__, "DisplayFlag")
+
+        with self.assertRaises(AttributeError):
+            getattr(hexareach, "NotExists")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+leg_power_calculator_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import math
+import unittest
+
+import numpy as np
+
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.leg_power_calculator import LegPowerCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.tiled_leg_power_calculator import TiledLegPowerCalculator
+from hexareach.calc.xr_r1_param import XrR1Param
+
+
+class TestLegPowerCalculator(unittest.TestCase):
+    """
+    Test cases for the LegPowerCalculator class.
+    """
+
+    def setUp(self):
+        self.x_range = np.arange(-100.0, 301.0, 10.0)
+        self.z_range = np.arange(-200.0, 201.0, 10.0)
+
+    def test_quantized_matches_step_search(self):
+        """
+        Test if the quantized result reproduces the legacy step search.
+        Points exactly on a step boundary may differ by floating point rounding.
+        """
+
+        for param in (PhantomxMk2Param(), XrR1Param()):
+            calc = HexapodLegRangeCalculator(param)
+            power = LegPowerCalculator(calc, param).calculate(
+                self.x_range, self.z_range, quantize=True
+            )
+
+            self.assertEqual(power.shape, (len(self.z_range), len(self.x_range)))
+
+            expected = np.array(
+                [[self._step_search(calc, param, x, z) for x in self.x_range]
+                 for z in self.z_range]
+            )
+            self.assertGreater(np.mean(power == expected), 0.998)
+
+    def test_continuous_bounds_quantized(self):
+        """
+        Test if the continuous result lies between the quantized step and the next step.
+        """
+
+        param = PhantomxMk2Param()
+        calc = LegPowerCalculator(None, param)
+
+        power = calc.calculate(self.x_range, self.z_range)
+        quantized = calc.calculate(self.x_range, self.z_range, quantize=True)
+
+        self.assertTrue(np.array_equal(power > 0, quantized > 0))
+        self.assertTrue(np.all(power >= quantized - 1e-9))
+        self.assertTrue(np.all(power <= np.minimum(quantized + 1, 19.0) + 1e-9))
+
+    def test_tiled_matches_serial(self):
+        """
+        Test if the tiled computation in a process pool is bit-for-bit equal to the serial one.
+        """
+
+        param = PhantomxMk2Param()
+        expected = LegPowerCalculator(None, param).calculate(self.x_range, self.z_range)
+
+        for use_shared_memory in (False, True):
+            power = TiledLegPowerCalculator(
+                param, tile_size=7, workers=2, use_shared_memory=use_shared_memory
+            ).calculate(self.x_range, self.z_range)
+            self.assertTrue(np.array_equal(power, expected))
+
+    @staticmethod
+    def _step_search(calc, param, x, z):
+        """
+        The original per-point search of the max power multiplier.
+        """
+
+        for reverse in (False, True):
+            res, _, angle = calc.calc_inverse_kinematics_xz(x, z, reverse)
+            if res and calc.is_theta2_in_range(angle[1]) and calc.is_theta3_in_range(angle[2]):
+                break
+        else:
+            return 0.0
+
+        femur = param.femur_length
+        tibia = param.tibia_length
+        ans = 0
+        for p in range(1, 20):
+            femur_tauqe = math.fabs(
+                p * (femur * math.cos(angle[1]) + tibia * math.cos(angle[1] + angle[2]))
+            )
+            tibia_tauqe = math.fabs(p * tibia * math.cos(angle[1] + angle[2]))
+            if femur_tauqe < param.torque_max and tibia_tauqe < param.torque_max:
+                ans = p
+            else:
+                break
+
+        return float(ans)
+
+
+if __name__ == "__main__":
+    unittest.main()
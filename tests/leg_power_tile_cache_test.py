@@ -0,0 +1,151 @@
+"""
+leg_power_tile_cache_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import unittest
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+
+from hexareach.calc.leg_power_calculator import LegPowerCalculator
+from hexareach.calc.leg_power_tile_cache import LegPowerTileCache
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.graph_dispalyer import GraphDisplayer
+from hexareach.render.display_flag import DisplayFlag
+from hexareach.render.display_stats import DisplayStats
+from hexareach.render.leg_power_tile_renderer import LegPowerTileRenderer
+
+
+class TestLegPowerTileCache(unittest.TestCase):
+    """
+    Test cases for the LegPowerTileCache class.
+    """
+
+    def setUp(self):
+        self.param = PhantomxMk2Param()
+
+    def test_compose_matches_calculator(self):
+        """
+        Test if the composed tiles equal the power computed on the same grid.
+        """
+
+        cache = LegPowerTileCache(self.param, tile_size=32)
+        for level in (-1, 0, 2):
+            x_range, z_range, power_array = cache.compose(level, (-30.0, 210.0, -170.0, 40.0))
+
+            self.assertLessEqual(x_range[0], -30.0)
+            self.assertGreaterEqual(x_range[-1] + cache.step(level), 210.0)
+            np.testing.assert_allclose(np.diff(x_range), cache.step(level))
+            np.testing.assert_array_equal(
+                power_array, LegPowerCalculator(None, self.param).calculate(x_range, z_range)
+            )
+
+    def test_lru(self):
+        """
+        Test if reused tiles are not computed again and the oldest tiles are evicted.
+        """
+
+        cache = LegPowerTileCache(self.param, tile_size=8, max_tiles=4)
+        keys = [(0, 0, ix) for ix in range(4)]
+
+        cache.get_tiles(keys)
+        cache.get_tiles(keys[:1])
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+        cache.get_tiles([(0, 1, 0), (0, 1, 1)])
+        self.assertEqual(len(cache), 4)
+
+        # 最後に使った (0, 0, 0) は残り，最も古い (0, 0, 1) と (0, 0, 2) は削除される．
+        cache.get_tiles([(0, 0, 0), (0, 0, 3)])
+        self.assertEqual((cache.hits, cache.misses), (3, 6))
+        cache.get_tiles([(0, 0, 1)])
+        self.assertEqual(cache.misses, 7)
+
+    def test_choose_level(self):
+        """
+        Test if the level gives at least the requested number of samples.
+        """
+
+        cache = LegPowerTileCache(self.param, base_step=1.0)
+
+        self.assertEqual(cache.choose_level(400.0, 200), -1)
+        self.assertEqual(cache.choose_level(20.0, 200), 4)
+        self.assertEqual(cache.choose_level(20.0, 200, max_level=2), 2)
+        for width in (7.0, 50.0, 333.0, 2000.0):
+            level = cache.choose_level(width, 100)
+            self.assertGreaterEqual(width / cache.step(level), 100)
+            self.assertLess(width / cache.step(level - 1), 100)
+
+    def test_renderer_follows_view(self):
+        """
+        Test if zooming and panning only compute the newly needed tiles.
+        """
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        ax.set_xlim(-100.0, 300.0)
+        ax.set_ylim(-200.0, 200.0)
+
+        renderer = LegPowerTileRenderer(self.param, fig, ax)
+        renderer.render()
+        cache = renderer.tile_cache
+        level = renderer.level
+        misses = cache.misses
+
+        self.assertEqual(ax.get_xlim(), (-100.0, 300.0))
+        self.assertEqual(len(ax.collections), 1)
+        self.assertFalse(renderer.update())
+
+        # 拡大すると，細かい段階のタイルを計算する．
+        ax.set_xlim(100.0, 120.0)
+        ax.set_ylim(-60.0, -40.0)
+        self.assertTrue(renderer.update())
+        self.assertGreater(renderer.level, level)
+        self.assertGreater(cache.misses, misses)
+        self.assertEqual(len(ax.collections), 1)
+
+        # 元の範囲に戻すと，保持しているタイルだけで描画する．
+        misses = cache.misses
+        ax.set_xlim(-100.0, 300.0)
+        ax.set_ylim(-200.0, 200.0)
+        self.assertTrue(renderer.update())
+        self.assertEqual(renderer.level, level)
+        self.assertEqual(cache.misses, misses)
+
+        # 細かすぎる段階は使わない．
+        ax.set_xlim(100.0, 100.5)
+        ax.set_ylim(-50.0, -49.5)
+        renderer.update()
+        self.assertEqual(cache.step(renderer.level), 0.25)
+
+    def test_graph_displayer(self):
+        """
+        Test if GraphDisplayer uses the tile renderer when the flag is set.
+        """
+
+        flag = DisplayFlag()
+        flag.display_table = False
+        flag.display_leg_power = True
+        flag.leg_power_follow_view = True
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+
+        stats = GraphDisplayer().display(
+            self.param, display_flag=flag, do_not_show=True,
+            figure=fig, axes=ax, stats=DisplayStats(),
+        )
+
+        self.assertIn("leg_power", stats.stage_times)
+        self.assertEqual(ax.get_xlim(), (-100.0, 300.0))
+        self.assertEqual(len(fig.axes), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
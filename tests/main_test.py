@@ -0,0 +1,198 @@
+"""
+main_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from hexareach.__main__ import main
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.leg_power_calculator import LegPowerCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.tiled_leg_power_calculator import TiledLegPowerCalculator
+
+
+class TestMain(unittest.TestCase):
+    """
+    Test cases for the command-line interface.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def _run(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return main(list(argv))
+
+    def test_banner(self):
+        """
+        Test if running without a subcommand prints the banner.
+        """
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(main([]), 0)
+        self.assertIn("Hexareach", out.getvalue())
+
+    def test_power(self):
+        """
+        Test if the power map matches LegPowerCalculator in every format.
+        """
+
+        param = PhantomxMk2Param()
+        # 描画する場合と同じく，x_max, z_max も含む．
+        x_range = np.arange(-100.0, 301.0, 10.0)
+        z_range = np.arange(-200.0, 201.0, 10.0)
+        expected = LegPowerCalculator(HexapodLegRangeCalculator(param), param).calculate(
+            x_range, z_range
+        )
+
+        self._run("power", "--step", "10", "--tile-size", "16", "-o", self._path("p.npz"))
+        self._run("power", "--step", "10", "-o", self._path("p.npy"))
+        self._run("power", "--step", "10", "-o", self._path("p.csv"))
+
+        with np.load(self._path("p.npz")) as data:
+            np.testing.assert_array_equal(data["power"], expected)
+            np.testing.assert_array_equal(data["x_range"], x_range)
+        np.testing.assert_array_equal(np.load(self._path("p.npy")), expected)
+
+        csv = np.loadtxt(self._path("p.csv"), delimiter=",", skiprows=1)
+        np.testing.assert_allclose(csv[:, 2], expected.ravel())
+
+    def test_power_workers_split_tiles(self):
+        """
+        Test if power with --workers computes the default grid in more than one tile.
+        """
+
+        tile_counts = []
+        make_tiles = TiledLegPowerCalculator._make_tiles  # pylint: disable=protected-access
+
+        def counting_make_tiles(calc, shape):
+            tiles = make_tiles(calc, shape)
+            tile_counts.append(len(tiles))
+            return tiles
+
+        with mock.patch.object(TiledLegPowerCalculator, "_make_tiles", counting_make_tiles):
+            self._run("power", "--workers", "2", "-o", self._path("p.npy"))
+
+        self.assertEqual(np.load(self._path("p.npy")).shape, (201, 201))
+        self.assertGreater(tile_counts[0], 1)
+
+    def test_approx_table_and_boundary(self):
+        """
+        Test if the radius table and the boundary are written.
+        """
+
+        self._run("approx-table", "--robot", "XrR1Param", "-o", self._path("a.csv"))
+        self._run("boundary", "--tolerance", "0.5", "-o", self._path("b.npz"))
+
+        table = np.loadtxt(self._path("a.csv"), delimiter=",", skiprows=1)
+        self.assertEqual(table.shape[1], 2)
+        self.assertEqual(table[0, 0], 0.0)
+
+        with np.load(self._path("b.npz")) as data:
+            self.assertEqual(set(data["line"]), {0.0, 1.0, 2.0, 3.0})
+            self.assertEqual(data["x"].shape, data["z"].shape)
+
+    def test_ik_with_param_file(self):
+        """
+        Test if batch IK from a CSV with a param file matches the calculator, also with workers.
+        """
+
+        with open(self._path("param.json"), "w", encoding="utf-8") as f:
+            json.dump({"base": "PhantomxMk2Param", "femur_length": 70.0}, f)
+
+        targets = np.random.default_rng(0).uniform([-100.0, -200.0], [300.0, 200.0], (500, 2))
+        np.savetxt(self._path("t.csv"), targets, delimiter=",", header="x,z", comments="")
+
+        self._run(
+            "ik", self._path("t.csv"), "--param-file", self._path("param.json"),
+            "--workers", "2", "--chunk-size", "200", "-o", self._path("ik.npz"),
+        )
+
+        param = PhantomxMk2Param()
+        param.femur_length = 70.0
+        calc = HexapodLegRangeCalculator(param)
+        success, _, angle = calc.calc_inverse_kinematics_xz_batch(targets[:, 0], targets[:, 1])
+
+        with np.load(self._path("ik.npz")) as data:
+            np.testing.assert_allclose(data["theta2"], angle[1], atol=1e-9)
+            np.testing.assert_array_equal(data["reachable"] > 0, success & (
+                calc.is_theta2_in_range_batch(angle[1]) & calc.is_theta3_in_range_batch(angle[2])
+            ))
+
+    def test_errors(self):
+        """
+        Test if bad arguments exit with an error.
+        """
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                self._run("approx-table", "-o", self._path("a.txt"))
+            with self.assertRaises(SystemExit):
+                self._run("power", "--robot", "Unknown", "-o", self._path("p.npy"))
+
+            for argv in (
+                ("power", "--step", "0"),
+                ("power", "--step", "-1"),
+                ("power", "--tile-size", "0"),
+                ("boundary", "--step", "0"),
+                ("boundary", "--tolerance", "0"),
+                ("approx-table", "--resolution", "0"),
+            ):
+                with self.assertRaises(SystemExit) as cm:
+                    self._run(*argv, "-o", self._path("bad.npy"))
+                self.assertEqual(cm.exception.code, 2)
+            self.assertFalse(os.path.exists(self._path("bad.npy")))
+
+            for value in ("abc", True, [1.0]):
+                with open(self._path("bad.json"), "w", encoding="utf-8") as f:
+                    json.dump({"femur_length": value}, f)
+                with self.assertRaises(SystemExit) as cm:
+                    self._run(
+                        "approx-table", "--param-file", self._path("bad.json"),
+                        "-o", self._path("a.npy"),
+                    )
+                self.assertEqual(cm.exception.code, 2)
+
+    def test_module_exit_code(self):
+        """
+        Test if python -m hexareach exits with the return code of main.
+        """
+
+        result = subprocess.run(
+            [
+                sys.executable, "-m", "hexareach", "approx-table",
+                "--robot", "Unknown", "-o", self._path("a.npy"),
+            ],
+            capture_output=True, check=False,
+        )
+        self.assertEqual(result.returncode, 2)
+
+        result = subprocess.run(
+            [sys.executable, "-m", "hexareach"], capture_output=True, check=False,
+        )
+        self.assertEqual(result.returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
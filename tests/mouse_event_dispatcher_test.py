@@ -0,0 +1,93 @@
+"""
+mouse_event_dispatcher_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import unittest
+
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.render.mouse_event_dispatcher import MouseEventDispatcher
+
+
+class TestMouseEventDispatcher(unittest.TestCase):
+    """
+    Test cases for the MouseEventDispatcher class.
+    """
+
+    def setUp(self):
+        self.fig = Figure()
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot(1, 1, 1)
+        self.ax.set_xlim(-100.0, 300.0)
+        self.ax.set_ylim(-200.0, 200.0)
+        self.states = []
+
+    def _move(self, x, z):
+        pos = self.ax.transData.transform((x, z))
+        MouseEvent("motion_notify_event", self.fig.canvas, pos[0], pos[1])._process()
+
+    def _make_dispatcher(self, max_update_rate):
+        dispatcher = MouseEventDispatcher(
+            self.fig, PhantomxMk2Param(), max_update_rate=max_update_rate
+        )
+        dispatcher.subscribe(self.states.append)
+        dispatcher.render()
+        return dispatcher
+
+    def test_stale_events_are_dropped(self):
+        """
+        Test if only the latest of the throttled events is computed.
+        """
+
+        dispatcher = self._make_dispatcher(1.0)
+
+        for i in range(10):
+            self._move(100.0 + i, -50.0)
+
+        # The first event is handled at once, the rest are waiting for the timer.
+        self.assertEqual(len(self.states), 1)
+
+        dispatcher.flush()
+
+        self.assertEqual(len(self.states), 2)
+        self.assertAlmostEqual(self.states[-1].x, 109.0)
+        self.assertAlmostEqual(self.states[-1].z, -50.0)
+
+    def test_every_event_without_limit(self):
+        """
+        Test if every event is handled when the update rate is not limited.
+        """
+
+        # The canvas only keeps a weak reference to the dispatcher.
+        dispatcher = self._make_dispatcher(None)
+
+        for i in range(5):
+            self._move(100.0 + i, -50.0)
+
+        self.assertEqual(len(self.states), 5)
+        self.assertFalse(dispatcher.reverse)
+
+    def test_toggle_reverse(self):
+        """
+        Test if toggling the reverse flag recomputes the last position.
+        """
+
+        dispatcher = self._make_dispatcher(None)
+        self._move(150.0, -50.0)
+        dispatcher.toggle_reverse()
+
+        self.assertEqual(len(self.states), 2)
+        self.assertFalse(self.states[0].reverse)
+        self.assertTrue(self.states[1].reverse)
+        self.assertNotEqual(self.states[0].angle, self.states[1].angle)
+
+
+if __name__ == "__main__":
+    unittest.main()
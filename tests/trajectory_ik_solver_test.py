@@ -0,0 +1,120 @@
+"""
+trajectory_ik_solver_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import unittest
+
+import numpy as np
+
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.trajectory_ik_solver import TrajectoryIkSolver
+from hexareach.math.clamp_angle import clamp_angle
+
+
+class TestTrajectoryIkSolver(unittest.TestCase):
+    """
+    Test cases for the TrajectoryIkSolver class.
+    """
+
+    def setUp(self):
+        self.calc = HexapodLegRangeCalculator(PhantomxMk2Param())
+        rng = np.random.default_rng(0)
+        self.targets = np.cumsum(rng.normal(0.0, 4.0, (3000, 2)), axis=0) + [150.0, -50.0]
+
+    def test_matches_sequential_nearest_branch(self):
+        """
+        Test if the chosen branches match a sample-by-sample nearest branch search.
+        """
+
+        solver = TrajectoryIkSolver(self.calc, chunk_size=257)
+        chunks = list(solver.solve(self.targets))
+
+        self.assertEqual(len(chunks), 12)
+        self.assertTrue(all(len(chunk.reverse) <= 257 for chunk in chunks))
+
+        reverse = np.concatenate([chunk.reverse for chunk in chunks])
+        angle = np.concatenate([chunk.angle for chunk in chunks], axis=1)
+        expected_reverse, expected_angle = self._solve_sequential(self.targets)
+
+        np.testing.assert_array_equal(reverse, expected_reverse)
+        np.testing.assert_allclose(angle, expected_angle, atol=1e-12)
+        self.assertTrue(reverse.any())
+
+    def test_point_stream_matches_array(self):
+        """
+        Test if streaming single points gives the same result as whole arrays.
+        """
+
+        solver = TrajectoryIkSolver(self.calc, chunk_size=100)
+        from_array = np.concatenate([c.reverse for c in solver.solve(self.targets)])
+
+        solver.reset()
+        half = len(self.targets) // 2
+        from_points = np.concatenate(
+            [c.reverse for c in solver.solve(map(tuple, self.targets[:half]))]
+            + [c.reverse for c in solver.solve([self.targets[half:]])]
+        )
+
+        np.testing.assert_array_equal(from_points, from_array)
+
+    def test_joint_range_masks(self):
+        """
+        Test if the joint range masks agree with the scalar range checks.
+        """
+
+        solver = TrajectoryIkSolver(self.calc)
+        chunk = next(solver.solve(self.targets))
+
+        for i in range(0, len(chunk.reverse), 97):
+            self.assertEqual(
+                chunk.theta2_in_range[i], self.calc.is_theta2_in_range(chunk.angle[1][i])
+            )
+            self.assertEqual(
+                chunk.theta3_in_range[i], self.calc.is_theta3_in_range(chunk.angle[2][i])
+            )
+
+    def test_invalid_target_shape(self):
+        """
+        Test if targets of a wrong shape are rejected.
+        """
+
+        solver = TrajectoryIkSolver(self.calc)
+
+        with self.assertRaises(ValueError):
+            list(solver.solve([np.zeros((4, 3))]))
+
+    def _solve_sequential(self, targets):
+        """
+        Choose the branch nearest to the previous solution one sample at a time.
+        """
+
+        reverse = False
+        prev = None
+        reverse_list = []
+        angle_list = []
+
+        for x, z in targets:
+            candidates = [
+                self.calc.calc_inverse_kinematics_xz(x, z, flag)[2] for flag in (False, True)
+            ]
+            if prev is not None:
+                distance = [
+                    sum(clamp_angle(c[j] - prev[j]) ** 2 for j in (1, 2))
+                    for c in candidates
+                ]
+                if distance[1 - int(reverse)] < distance[int(reverse)]:
+                    reverse = not reverse
+            prev = candidates[int(reverse)]
+            reverse_list.append(reverse)
+            angle_list.append(prev)
+
+        return np.array(reverse_list), np.array(angle_list).T
+
+
+if __name__ == "__main__":
+    unittest.main()
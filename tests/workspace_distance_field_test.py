@@ -0,0 +1,181 @@
+"""
+workspace_distance_field_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+import tempfile
+import unittest
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+from scipy.spatial import cKDTree
+
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.workspace_distance_field import WorkspaceDistanceField
+from hexareach.graph_dispalyer import GraphDisplayer
+from hexareach.render.display_flag import DisplayFlag
+from hexareach.render.display_stats import DisplayStats
+from hexareach.render.workspace_distance_renderer import WorkspaceDistanceRenderer
+
+
+class TestWorkspaceDistanceField(unittest.TestCase):
+    """
+    Test cases for the WorkspaceDistanceField class.
+    """
+
+    def setUp(self):
+        self.param = PhantomxMk2Param()
+        self.field = WorkspaceDistanceField.build(self.param, resolution=1.0)
+
+    def test_sign_matches_reachability(self):
+        """
+        Test if the distance is negative inside and positive outside the range of motion.
+        """
+
+        calc = HexapodLegRangeCalculator(self.param)
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-150.0, 300.0, 20000)
+        z = rng.uniform(-250.0, 250.0, 20000)
+
+        distance, _ = self.field.query(x, z)
+        exact, _ = calc.calc_reachable_inverse_kinematics_xz_batch(x, z)
+
+        # 境界の近くは格子の大きさ程度の誤差があるため除く．
+        far = np.abs(distance) > 1.0
+        self.assertGreater(far.mean(), 0.9)
+        np.testing.assert_array_equal(distance[far] < 0.0, exact[far])
+        self.assertEqual(self.field.distance.dtype, np.float32)
+
+    def test_distance_to_outer_circle(self):
+        """
+        Test if the distance matches the fully extended leg circle along the x axis.
+        """
+
+        reach = self.param.coxa_length + self.param.femur_length + self.param.tibia_length
+        x = np.linspace(reach - 20.0, reach + 20.0, 81)
+
+        distance, gradient = self.field.query(x, np.zeros_like(x))
+
+        np.testing.assert_allclose(distance, x - reach, atol=0.1)
+        np.testing.assert_allclose(gradient[0], 1.0, atol=0.05)
+        np.testing.assert_allclose(gradient[1], 0.0, atol=0.05)
+
+    def test_distance_near_thin_region(self):
+        """
+        Test if the distance near a region thinner than a cell matches a brute-force reference.
+        """
+
+        # (-37, 170) 付近は，格子の中央の間を通る細い領域がある．
+        calc = HexapodLegRangeCalculator(self.param)
+        step = 0.05
+        grid_x, grid_z = np.meshgrid(
+            np.arange(-47.0, -27.0 + 0.5 * step, step), np.arange(160.0, 180.0 + 0.5 * step, step)
+        )
+        grid_inside, _ = calc.calc_reachable_inverse_kinematics_xz_batch(grid_x, grid_z)
+        grid = np.stack([grid_x.ravel(), grid_z.ravel()], axis=-1)
+        grid_inside = grid_inside.ravel()
+        self.assertTrue(grid_inside.any())
+
+        rng = np.random.default_rng(3)
+        x = rng.uniform(-42.0, -32.0, 500)
+        z = rng.uniform(165.0, 175.0, 500)
+        inside, _ = calc.calc_reachable_inverse_kinematics_xz_batch(x, z)
+        points = np.stack([x, z], axis=-1)
+        expected = np.where(
+            inside,
+            -cKDTree(grid[~grid_inside]).query(points)[0],
+            cKDTree(grid[grid_inside]).query(points)[0],
+        )
+
+        distance, _ = self.field.query(x, z)
+        np.testing.assert_allclose(distance, expected, atol=0.35)
+
+    def test_gradient_matches_finite_difference(self):
+        """
+        Test if the gradient is the derivative of the interpolated distance.
+        """
+
+        rng = np.random.default_rng(1)
+        x = rng.uniform(-100.0, 250.0, (10, 20))
+        z = rng.uniform(-200.0, 200.0, (10, 20))
+        step = 1e-4
+
+        distance, gradient = self.field.query(x, z)
+        distance_x, _ = self.field.query(x + step, z)
+        distance_z, _ = self.field.query(x, z + step)
+
+        self.assertEqual(distance.shape, (10, 20))
+        self.assertEqual(gradient.shape, (2, 10, 20))
+        # 格子の境目をまたいだ点は片側の傾きになるため，ほとんどの点で一致すればよい．
+        close_x = np.isclose((distance_x - distance) / step, gradient[0], atol=1e-3)
+        close_z = np.isclose((distance_z - distance) / step, gradient[1], atol=1e-3)
+        self.assertGreater(close_x.mean(), 0.95)
+        self.assertGreater(close_z.mean(), 0.95)
+
+    def test_outside_grid(self):
+        """
+        Test if points outside the grid get the distance from the grid edge added.
+        """
+
+        field = WorkspaceDistanceField.build(
+            self.param, rect=(0.0, 100.0, -100.0, 0.0), resolution=2.0
+        )
+        edge, _ = field.query(field.x_range[-1], -50.0)
+        distance, gradient = field.query(field.x_range[-1] + 30.0, -50.0)
+
+        self.assertAlmostEqual(float(distance), float(edge) + 30.0, places=4)
+        np.testing.assert_allclose(gradient, [1.0, 0.0])
+
+    def test_save_and_load(self):
+        """
+        Test if a loaded field answers the same queries.
+        """
+
+        rng = np.random.default_rng(2)
+        x = rng.uniform(-150.0, 300.0, 1000)
+        z = rng.uniform(-250.0, 250.0, 1000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "field.npz")
+            self.field.save(file_name)
+            loaded = WorkspaceDistanceField.load(file_name)
+
+        self.assertEqual(loaded.distance.dtype, np.float32)
+        for actual, expected in zip(loaded.query(x, z), self.field.query(x, z)):
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_renderer(self):
+        """
+        Test if the overlay draws contours and is wired into GraphDisplayer.
+        """
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        renderer = WorkspaceDistanceRenderer(self.param, fig, ax, resolution=2.0)
+        renderer.render()
+
+        self.assertIsNotNone(renderer.field)
+        self.assertGreater(len(ax.collections), 0)
+
+        flag = DisplayFlag()
+        flag.display_table = False
+        flag.display_distance_field = True
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        stats = GraphDisplayer().display(
+            self.param, display_flag=flag, do_not_show=True,
+            figure=fig, axes=ax, stats=DisplayStats(),
+        )
+        self.assertIn("distance_field", stats.stage_times)
+
+
+if __name__ == "__main__":
+    unittest.main()
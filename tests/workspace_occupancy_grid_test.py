@@ -0,0 +1,99 @@
+"""
+workspace_occupancy_grid_test.py
+"""
+
+# Copyright (c) 2023-2025 Taisei Hasegawa
+# Released under the MIT license
+# https://opensource.org/licenses/mit-license.php
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from hexareach.calc.hexapod_leg_range_calculator import HexapodLegRangeCalculator
+from hexareach.calc.phatomx_mk2_param import PhantomxMk2Param
+from hexareach.calc.workspace_occupancy_grid import WorkspaceOccupancyGrid
+from hexareach.calc.xr_r1_param import XrR1Param
+
+
+class TestWorkspaceOccupancyGrid(unittest.TestCase):
+    """
+    Test cases for the WorkspaceOccupancyGrid class.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.uniform(-250.0, 450.0, 200000)
+        self.z = rng.uniform(-250.0, 250.0, 200000)
+
+    def test_matches_exact_outside_band(self):
+        """
+        Test if every point outside the boundary band matches the exact check.
+        """
+
+        for param in (PhantomxMk2Param(), XrR1Param()):
+            calc = HexapodLegRangeCalculator(param)
+            grid = WorkspaceOccupancyGrid.build(
+                param, resolution=2.0, hexapod_leg_range_calc=calc
+            )
+            exact, _ = calc.calc_reachable_inverse_kinematics_xz_batch(self.x, self.z)
+
+            reachable, band = grid.query(self.x, self.z)
+
+            self.assertTrue(reachable.any())
+            self.assertLess(band.mean(), 0.2)
+            np.testing.assert_array_equal(reachable[~band], exact[~band])
+            np.testing.assert_array_equal(grid.is_reachable(self.x, self.z), exact)
+
+    def test_bit_packed_storage(self):
+        """
+        Test if the grid stores one bit per cell for each mask.
+        """
+
+        grid = WorkspaceOccupancyGrid.build(PhantomxMk2Param(), resolution=1.0)
+        nz, nx = grid.shape
+
+        self.assertEqual(grid.nbytes, 2 * nz * ((nx + 7) // 8))
+
+    def test_partial_rect(self):
+        """
+        Test if points outside a grid that does not cover the workspace need a recheck.
+        """
+
+        param = PhantomxMk2Param()
+        grid = WorkspaceOccupancyGrid.build(param, rect=(0.0, 100.0, -100.0, 0.0))
+
+        reachable, band = grid.query([150.0, -300.0], [-50.0, 0.0])
+
+        np.testing.assert_array_equal(reachable, [False, False])
+        np.testing.assert_array_equal(band, [True, True])
+        self.assertTrue(grid.is_reachable(150.0, -50.0))
+
+    def test_save_and_load(self):
+        """
+        Test if a loaded grid answers the same queries.
+        """
+
+        param = PhantomxMk2Param()
+        grid = WorkspaceOccupancyGrid.build(param, resolution=2.0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid.npz")
+            grid.save(file_name)
+            loaded = WorkspaceOccupancyGrid.load(file_name)
+
+        for actual, expected in zip(loaded.query(self.x, self.z), grid.query(self.x, self.z)):
+            np.testing.assert_array_equal(actual, expected)
+
+        with self.assertRaises(ValueError):
+            loaded.is_reachable(self.x, self.z)
+        np.testing.assert_array_equal(
+            loaded.is_reachable(self.x, self.z, HexapodLegRangeCalculator(param)),
+            grid.is_reachable(self.x, self.z),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()